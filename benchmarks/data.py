@@ -0,0 +1,116 @@
+"""
+Synthetic, reproducible ExampleModel tables for the benchmarks.
+
+The same size and seed always give the same rows. Generated databases are kept in a data directory
+and reused by later runs, generating 10M rows takes a few minutes.
+
+Usage:
+    python -m benchmarks.data --sizes 10k 1M [--data-dir .benchmark_data] [--seed 42]
+"""
+import argparse
+import os
+import random
+from typing import Dict, Iterator, List
+
+from sqlalchemy import func, insert, select
+from sqlmodel import Session, SQLModel, create_engine
+
+from src.infrastructure.DataVersion import install_data_versions
+from src.infrastructure.FullTextSearch import install_full_text_search
+from src.infrastructure.Indexes import install_indexes
+from src.infrastructure.SQLiteProfile import apply_sqlite_pragmas
+from src.model.example_model import ExampleModel
+
+SIZES = {"10k": 10_000, "1M": 1_000_000, "10M": 10_000_000}
+DEFAULT_DATA_DIR = ".benchmark_data"
+MAX_VALUE = 1_000_000
+_WORDS = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliett",
+          "kilo", "lima", "mike", "november", "oscar", "papa", "quebec", "romeo", "sierra", "tango"]
+# Loading only: the file is rebuilt from the seed if anything goes wrong
+_LOAD_PRAGMAS = {"journal_mode": "OFF", "synchronous": "OFF", "temp_store": "MEMORY", "cache_size": -262144}
+
+
+def parse_size(size: str) -> int:
+    """Number of rows of a size such as 10k, 1M, 10M or 2500."""
+    if size in SIZES:
+        return SIZES[size]
+    suffixes = {"k": 1_000, "M": 1_000_000}
+    if size[-1:] in suffixes:
+        return int(float(size[:-1]) * suffixes[size[-1]])
+    return int(size)
+
+
+def generate_rows(count: int, seed: int = 42, start: int = 0) -> Iterator[Dict]:
+    """Column values of count ExampleModel rows, the same for the same seed and start."""
+    generator = random.Random(f"{seed}:{start}")
+    for index in range(start, start + count):
+        yield {
+            "name": f"{generator.choice(_WORDS)} {generator.choice(_WORDS)} {index}",
+            "value": generator.randrange(MAX_VALUE),
+            "description": " ".join(generator.choices(_WORDS, k=generator.randint(3, 12))),
+        }
+
+
+def database_path(rows: int, seed: int = 42, data_dir: str = DEFAULT_DATA_DIR) -> str:
+    return os.path.join(data_dir, f"example_model_{rows}_{seed}.db")
+
+
+def ensure_database(rows: int, seed: int = 42, data_dir: str = DEFAULT_DATA_DIR, chunk_size: int = 50_000) -> str:
+    """Path of a database holding exactly rows generated ExampleModel rows, generating it if needed."""
+    path = database_path(rows, seed, data_dir)
+    if os.path.exists(path) and _row_count(path) == rows:
+        _install_indexes(path)
+        return path
+    os.makedirs(data_dir, exist_ok=True)
+    if os.path.exists(path):
+        os.remove(path)
+    engine = create_engine(f"sqlite:///{path}")
+    apply_sqlite_pragmas(engine, _LOAD_PRAGMAS)
+    SQLModel.metadata.create_all(engine)
+    try:
+        with Session(engine) as session:
+            for start in range(0, rows, chunk_size):
+                batch: List[Dict] = list(generate_rows(min(chunk_size, rows - start), seed, start))
+                # Core insert, rows are plain dictionaries and need no ORM bookkeeping
+                session.execute(insert(ExampleModel.__table__), batch)
+                session.commit()
+    finally:
+        engine.dispose()
+    # Indexed after the load: building an index once is much faster than maintaining it on every insert
+    _install_indexes(path)
+    return path
+
+
+def _install_indexes(path: str) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        install_indexes(engine, [ExampleModel])
+        install_full_text_search(engine, [ExampleModel])
+        install_data_versions(engine, [ExampleModel])
+    finally:
+        engine.dispose()
+
+
+def _row_count(path: str) -> int:
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        with engine.connect() as connection:
+            return connection.execute(select(func.count()).select_from(ExampleModel.__table__)).scalar_one()
+    except Exception:
+        return -1
+    finally:
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", default=["10k"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    args = parser.parse_args()
+    for size in args.sizes:
+        print(ensure_database(parse_size(size), args.seed, args.data_dir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Concurrent read/write throughput of SQLite with the default settings and with the profile of db_config.yml.
+
+Usage:
+    python -m benchmarks.sqlite_profile [--seconds 5] [--readers 8] [--writers 2] [--rows 50000]
+
+Readers page through the table with keyset pagination and fetch rows by id, writers insert and update
+single rows, all through SQLModelRepository with one session per operation, like the application does.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+import yaml
+from sqlmodel import SQLModel, create_engine
+
+from src.infrastructure.Exceptions.RepositoryExceptions import RepositoryError
+from src.infrastructure.SessionManager import SessionManager
+from src.infrastructure.SQLiteProfile import apply_sqlite_pragmas, pool_options
+from src.infrastructure.SQLModelRepository import SQLModelRepository
+from src.model.example_model import ExampleModel
+
+
+def build_repository(path, pragmas=None, pool=None):
+    engine = create_engine(f"sqlite:///{path}", **pool_options(pool))
+    apply_sqlite_pragmas(engine, pragmas)
+    SQLModel.metadata.create_all(engine)
+    return engine, SQLModelRepository(ExampleModel, session_manager=SessionManager(engine), batch_size=10000)
+
+
+def run(name, pragmas, pool, args):
+    with tempfile.TemporaryDirectory() as directory:
+        engine, repository = build_repository(os.path.join(directory, "benchmark.db"), pragmas, pool)
+        repository.add_many({"name": f"Name {i}", "value": i, "description": "seed"} for i in range(args.rows))
+
+        stop = threading.Event()
+        counters = {"reads": 0, "writes": 0, "errors": 0}
+        lock = threading.Lock()
+
+        def count(key):
+            with lock:
+                counters[key] += 1
+
+        def reader():
+            cursor = None
+            while not stop.is_set():
+                try:
+                    page = repository.get_page_by_cursor(cursor, 50)
+                    cursor = page.next_cursor
+                    repository.get_by_id(random.randint(1, args.rows))
+                    count("reads")
+                except RepositoryError:
+                    count("errors")
+
+        def writer():
+            while not stop.is_set():
+                try:
+                    repository.add(ExampleModel(name="written", value=0, description="benchmark"))
+                    repository.update_by_id(random.randint(1, args.rows), {"value": random.randint(0, 100)})
+                    count("writes")
+                except RepositoryError:
+                    count("errors")
+
+        threads = [threading.Thread(target=reader) for _ in range(args.readers)]
+        threads += [threading.Thread(target=writer) for _ in range(args.writers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+
+    return {
+        "profile": name,
+        "reads_per_second": round(counters["reads"] / args.seconds, 1),
+        "writes_per_second": round(counters["writes"] / args.seconds, 1),
+        "errors": counters["errors"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--config", default="db_config.yml")
+    args = parser.parse_args()
+
+    with open(args.config) as config_file:
+        sqlite_config = yaml.safe_load(config_file)["sqllite"]
+
+    results = [
+        run("default", None, None, args),
+        run("tuned", sqlite_config.get("pragmas"), sqlite_config.get("pool"), args),
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
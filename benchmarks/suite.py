@@ -0,0 +1,248 @@
+"""
+Benchmark suite of the repository, the service and the CRUD page on generated ExampleModel tables.
+
+Usage:
+    python -m benchmarks.suite [--sizes 10k 1M 10M] [--repeat 20] [--output results.json]
+    python -m benchmarks.suite --baseline baseline.json [--threshold 0.2]
+
+Every case runs once to warm up and then --repeat times; the JSON output has the min, median, p95 and
+mean time of each case in milliseconds, per table size. With --baseline the medians are compared with
+a previous output: cases slower than the baseline by more than --threshold are reported and the exit
+status is 1, so a CI job fails before the regression is deployed.
+
+The page cases render BaseCRUDPage headless with Streamlit's AppTest. The service runs without the
+query cache, every call reaches the database.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+import sqlalchemy
+import streamlit
+import yaml
+from sqlmodel import create_engine
+
+from benchmarks.data import DEFAULT_DATA_DIR, MAX_VALUE, ensure_database, generate_rows, parse_size
+from src.infrastructure.Columnar import RowFormat
+from src.infrastructure.Pagination import NEXT, encode_cursor
+from src.infrastructure.QuerySpec import FieldFilter, FilterOperator, QuerySpec, SortOrder
+from src.infrastructure.SessionManager import SessionManager
+from src.infrastructure.SQLiteProfile import apply_sqlite_pragmas, pool_options
+from src.infrastructure.SQLModelRepository import SQLModelRepository
+from src.model.example_model import ExampleModel
+from src.services.CRUDService import CRUDService
+
+PAGE_SIZE = 50
+
+
+def measure(function: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Time function once to warm up, then repeat times; statistics in milliseconds."""
+    function()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "min_ms": round(samples[0], 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "runs": repeat,
+    }
+
+
+def service_cases(service: CRUDService[ExampleModel], rows: int, seed: int) -> Dict[str, Callable[[], Any]]:
+    generator = random.Random(seed)
+    ids = [generator.randint(1, rows) for _ in range(1000)]
+    middle = rows // 2
+    low = MAX_VALUE // 2
+    filtered = QuerySpec(filters=(FieldFilter("value", FilterOperator.BETWEEN, (low, low + 1000)),),
+                         order_by=(SortOrder("value"),), limit=PAGE_SIZE)
+    return {
+        "get_items_first_page": lambda: service.get_items(0, PAGE_SIZE),
+        "get_items_middle_page": lambda: service.get_items(middle, PAGE_SIZE),
+        "get_items_last_page": lambda: service.get_items(max(rows - PAGE_SIZE, 0), PAGE_SIZE),
+        "get_items_by_cursor_middle_page": lambda: service.get_items_by_cursor(encode_cursor("id", middle, middle, NEXT), PAGE_SIZE),
+        "get_columns_by_cursor_middle_page": lambda: service.get_columns_by_cursor(encode_cursor("id", middle, middle, NEXT), PAGE_SIZE),
+        "query_columns_filtered_arrow": lambda: service.query_columns(filtered, RowFormat.ARROW),
+        "get_by_id": lambda: service.get_item(ids[generator.randrange(len(ids))]),
+        "query_filtered": lambda: service.query_items(filtered),
+        "count_filtered": lambda: service.count_items(QuerySpec(filters=filtered.filters)),
+        "count_all": lambda: service.count_items(),
+        "search_two_words": lambda: service.search_items("bravo cha", PAGE_SIZE, RowFormat.DATAFRAME),
+        "summarize_filtered": lambda: service.summarize_items(QuerySpec(filters=filtered.filters)),
+        "summarize_all": lambda: service.summarize_items(),
+        "data_version": lambda: service.data_version(),
+        "changes_since_last_page": lambda: service.changes_since(max((service.data_version() or 0) - PAGE_SIZE, 0), row_format=RowFormat.DATAFRAME),
+    }
+
+
+def bulk_cases(service: CRUDService[ExampleModel], bulk_rows: int, seed: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Insert, update and delete bulk_rows rows; the table is left as it was."""
+    timings: Dict[str, List[float]] = {"bulk_insert": [], "bulk_update": [], "bulk_delete": []}
+    for run in range(repeat + 1):
+        items = [ExampleModel(**row) for row in generate_rows(bulk_rows, seed, start=10 ** 9 + run * bulk_rows)]
+        start = time.perf_counter()
+        service.create_items(items, return_ids=True)
+        inserted = time.perf_counter()
+        service.update_items({"id": item.id, "value": item.value + 1} for item in items)
+        updated = time.perf_counter()
+        service.delete_items(item.id for item in items)
+        deleted = time.perf_counter()
+        if run == 0:
+            continue  # warm up
+        timings["bulk_insert"].append((inserted - start) * 1000)
+        timings["bulk_update"].append((updated - inserted) * 1000)
+        timings["bulk_delete"].append((deleted - updated) * 1000)
+    results = {}
+    for name, samples in timings.items():
+        samples.sort()
+        results[name] = {
+            "min_ms": round(samples[0], 3),
+            "median_ms": round(statistics.median(samples), 3),
+            "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+            "mean_ms": round(statistics.fmean(samples), 3),
+            "runs": repeat,
+            "rows": bulk_rows,
+        }
+    return results
+
+
+def crud_page_app(path, pragmas, pool, page_size):
+    """AppTest script: the CRUD page of ExampleModel on the benchmark database.
+    AppTest runs the source of this function alone, so it imports everything it uses."""
+    import streamlit as st
+    from sqlmodel import create_engine
+    from src.containers.GenericCRUDPageContainer import GenericCRUDPageContainer
+    from src.infrastructure.SessionManager import SessionManager
+    from src.infrastructure.SQLiteProfile import apply_sqlite_pragmas, pool_options
+    from src.infrastructure.SQLModelRepository import SQLModelRepository
+    from src.model.example_model import ExampleModel
+    from src.services.CRUDService import CRUDService
+    from src.view.GenericCRUDPage.BaseCRUDPage import BaseCRUDPage
+    from src.view.GenericCRUDPage.BaseStreamLitForm import BaseStreamLitForm
+
+    @st.cache_resource
+    def build_page(path):
+        # The form gets its field dispatcher from the container, as in src.bootstrap
+        GenericCRUDPageContainer().wire()
+        engine = create_engine(f"sqlite:///{path}", **pool_options(pool))
+        apply_sqlite_pragmas(engine, pragmas)
+        repository = SQLModelRepository(ExampleModel, session_manager=SessionManager(engine))
+        return BaseCRUDPage(CRUDService[ExampleModel](repository), ExampleModel, BaseStreamLitForm[ExampleModel](ExampleModel), page_size=page_size)
+
+    build_page(path).render()
+
+
+def page_cases(path: str, pragmas: Dict[str, Any], pool: Dict[str, Any], repeat: int) -> Dict[str, Dict[str, float]]:
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_function(crud_page_app, args=(path, pragmas, pool, PAGE_SIZE), default_timeout=120)
+
+    def render():
+        app.run()
+        if app.exception:
+            raise RuntimeError(f"BaseCRUDPage.render failed: {app.exception[0].value}")
+
+    def next_page():
+        next(button for button in app.button if button.label == "Next").click()
+        render()
+
+    return {"page_render": measure(render, repeat), "page_render_next": measure(next_page, repeat)}
+
+
+def run_size(size: str, args: argparse.Namespace, sqlite_config: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    rows = parse_size(size)
+    path = ensure_database(rows, args.seed, args.data_dir)
+    pragmas, pool = sqlite_config.get("pragmas"), sqlite_config.get("pool")
+    engine = create_engine(f"sqlite:///{path}", **pool_options(pool))
+    apply_sqlite_pragmas(engine, pragmas)
+    service = CRUDService[ExampleModel](SQLModelRepository(ExampleModel, session_manager=SessionManager(engine)))
+    try:
+        results = {name: measure(case, args.repeat) for name, case in service_cases(service, rows, args.seed).items()}
+        results.update(bulk_cases(service, args.bulk_rows, args.seed, args.repeat))
+    finally:
+        engine.dispose()
+    if not args.skip_page:
+        results.update(page_cases(path, pragmas, pool, args.repeat))
+    return results
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Median of every case present in both runs, with the ratio to the baseline and a regression flag."""
+    rows = []
+    for size, cases in current["results"].items():
+        for name, stats in cases.items():
+            reference = baseline.get("results", {}).get(size, {}).get(name)
+            if reference is None or not reference.get("median_ms"):
+                continue
+            ratio = stats["median_ms"] / reference["median_ms"]
+            rows.append({"size": size, "case": name, "baseline_ms": reference["median_ms"], "current_ms": stats["median_ms"],
+                         "ratio": round(ratio, 3), "regression": ratio > 1 + threshold})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", default=["10k"], help="table sizes, e.g. 10k 1M 10M")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--bulk-rows", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--config", default="db_config.yml")
+    parser.add_argument("--skip-page", action="store_true", help="skip the AppTest cases")
+    parser.add_argument("--output", help="also write the results to this file")
+    parser.add_argument("--baseline", help="compare with a previous output")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown of the median, 0.2 is 20%%")
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be positive")
+
+    with open(args.config) as config_file:
+        sqlite_config = yaml.safe_load(config_file)["sqllite"]
+
+    output = {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "streamlit": streamlit.__version__,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "page_size": PAGE_SIZE,
+        },
+        "results": {size: run_size(size, args, sqlite_config) for size in args.sizes},
+    }
+
+    exit_status = 0
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            comparison = compare(output, json.load(baseline_file), args.threshold)
+        output["comparison"] = comparison
+        regressions = [row for row in comparison if row["regression"]]
+        for row in regressions:
+            print(f"REGRESSION {row['size']} {row['case']}: {row['baseline_ms']} ms -> {row['current_ms']} ms "
+                  f"(x{row['ratio']})", file=sys.stderr)
+        exit_status = 1 if regressions else 0
+
+    document = json.dumps(output, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as output_file:
+            output_file.write(document)
+    print(document)
+    sys.exit(exit_status)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,5 @@
-from src.containers.GenericCRUDPageContainer import GenericCRUDPageContainer
-from src.containers.RepositoryContainer import RepositoryContainer
-from src.model.example_model import ExampleModel
-from src.infrastructure.SQLModelRepository import SQLModelRepository
-from src.services.CRUDService import CRUDService
-from src.view.GenericCRUDPage.BaseCRUDPage import BaseCRUDPage
-from src.view.GenericCRUDPage.BaseStreamLitForm import BaseStreamLitForm
+from src.bootstrap import get_application
 from src.view.Interfaces.IStreamLitPage import IStreamLitPage
-from src.view.ReadmePage import ReadmePage
-from src.view.BasePage import BasePage
 
 
 def main(entryPage: IStreamLitPage):
@@ -15,25 +7,7 @@ def main(entryPage: IStreamLitPage):
 
 
 if __name__ == "__main__":
-    #container wiring
-    container = GenericCRUDPageContainer()
-    container.wire()
-
-    repository_container = RepositoryContainer()
-    repository_container.wire()
-
-    # HomePage
-    ReadmePage = ReadmePage()
-
-    # ExampleModel
-    ExampleModelCRUDService = CRUDService[ExampleModel](SQLModelRepository(ExampleModel))
-    ExampleModelPage = BaseCRUDPage(ExampleModelCRUDService, ExampleModel, BaseStreamLitForm[ExampleModel](ExampleModel))
-
-    # Base Page
-    sections = {
-        "Home": ReadmePage,
-        "ExampleModel CRUD": ExampleModelPage
-    }
-
-    BasePage = BasePage(sections)
-    main(BasePage)
\ No newline at end of file
+    # The application graph is built once per process and reused across reruns and sessions
+    application = get_application()
+    with application.session_scope():
+        main(application.entry_page)
@@ -0,0 +1,128 @@
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
+from typing import Iterator, Type
+import streamlit as st
+from sqlmodel import SQLModel
+
+from src.containers.GenericCRUDPageContainer import GenericCRUDPageContainer
+from src.containers.RepositoryContainer import RepositoryContainer
+from src.containers.ServiceContainer import ServiceContainer
+from src.infrastructure.SQLModelRepository import SQLModelRepository
+from src.infrastructure.SessionManager import SessionScope
+from src.infrastructure.MetricsServer import start_metrics_server
+from src.services.CRUDService import CRUDService
+from src.services.InstrumentedCRUDService import InstrumentedCRUDService
+from src.services.ServiceRegistry import ServiceRegistry
+from src.view.GenericCRUDPage.BaseCRUDPage import BaseCRUDPage
+from src.view.GenericCRUDPage.BaseStreamLitForm import BaseStreamLitForm
+from src.view.Interfaces.IStreamLitPage import IStreamLitPage
+from src.view.ReadmePage import ReadmePage
+from src.view.BasePage import BasePage
+from src.view.DiagnosticsPage import DiagnosticsPage
+from src.view.ImportPage import ImportPage
+from src.view.InstrumentedPage import InstrumentedPage
+from src.view.LazyPage import LazyPage
+
+"""
+Application bootstrap.
+
+Streamlit re-executes main.py on every widget interaction, so everything that is expensive to
+build (containers, engine and connection pool, repositories, services and pages) is built here
+once per process and shared by every session and rerun. The pages of the models are built the
+first time their section is opened (see LazyPage and ServiceRegistry). Per-user state must live in
+st.session_state, never on the objects built here.
+"""
+
+
+@dataclass(frozen=True)
+class Application:
+    """The object graph shared by all sessions."""
+
+    page_container: GenericCRUDPageContainer
+    repository_container: RepositoryContainer
+    service_container: ServiceContainer
+    entry_page: IStreamLitPage
+
+    @contextmanager
+    def session_scope(self) -> Iterator[None]:
+        """Open the database session scope configured for a script run (see SessionScope)."""
+        session_manager = self.repository_container.sqllite_session_manager()
+        if session_manager.scope == SessionScope.RERUN:
+            with session_manager.bind():
+                yield
+        elif session_manager.scope == SessionScope.USER_SESSION:
+            # The Session follows the user across reruns, its connection is released at the end of each run.
+            if "_database_session" not in st.session_state:
+                st.session_state["_database_session"] = session_manager.create_session()
+            with session_manager.bind(st.session_state["_database_session"]):
+                yield
+        else:
+            yield
+
+
+def build_application() -> Application:
+    """Wire the containers and build the pages. Prefer get_application, which caches the result."""
+    #container wiring
+    page_container = GenericCRUDPageContainer()
+    page_container.wire()
+
+    repository_container = RepositoryContainer()
+    repository_container.wire()
+
+    service_container = ServiceContainer()
+    query_cache = service_container.query_cache()
+
+    # Instrumentation
+    instrumentation = repository_container.config.instrumentation() or {}
+    instrumented = bool(instrumentation.get("enabled"))
+    metrics_registry = repository_container.metrics_registry()
+
+    # HomePage
+    readme_page = ReadmePage()
+
+    # Models: discovered at startup, their services and pages are built the first time a section is opened
+    model_registry = service_container.model_registry()
+
+    versioned = bool((service_container.config.query_cache() or {}).get("versioned"))
+
+    def build_crud_service(model: Type[SQLModel]) -> CRUDService:
+        crud_service = CRUDService(SQLModelRepository(model), query_cache, versioned=versioned)
+        if instrumented:
+            crud_service = InstrumentedCRUDService(crud_service, metrics_registry)
+        return crud_service
+
+    export = service_container.config.export() or {}
+    download_server = service_container.download_server() if export.get("port") is not None else None
+    service_registry = ServiceRegistry(model_registry, build_crud_service, download_server,
+                                       export_batch_size=int(export.get("batch_size", 10000)))
+
+    def build_crud_page(name: str) -> BaseCRUDPage:
+        model = model_registry.get(name)
+        return BaseCRUDPage(service_registry.crud_services[name], model, BaseStreamLitForm[model](model),
+                            export_service=service_registry.export_services[name])
+
+    # Base Page
+    sections = {"Home": readme_page}
+    for name in model_registry.names():
+        sections[f"{name} CRUD"] = LazyPage(partial(build_crud_page, name))
+    sections["Import"] = ImportPage(service_registry.import_services)
+    if instrumented:
+        sections = {name: InstrumentedPage(page, metrics_registry, name) for name, page in sections.items()}
+        if instrumentation.get("diagnostics_page"):
+            sections["Diagnostics"] = DiagnosticsPage(metrics_registry)
+        if instrumentation.get("metrics_port"):
+            start_metrics_server(metrics_registry, int(instrumentation["metrics_port"]))
+
+    entry_page = BasePage(sections)
+    if instrumented:
+        # The whole rerun, sidebar included
+        entry_page = InstrumentedPage(entry_page, metrics_registry, "rerun")
+
+    return Application(page_container, repository_container, service_container, entry_page)
+
+
+@st.cache_resource(show_spinner=False)
+def get_application() -> Application:
+    """Return the process wide Application, building it on the first call."""
+    return build_application()
@@ -0,0 +1,53 @@
+"""
+Explain the queries of a CRUD page and suggest the indexes they miss.
+
+Usage:
+    python -m src.cli.advise_indexes [--model ExampleModel] [--where "value:between:10,20"]
+        [--order-by value] [--descending]
+
+For each model (all the registered models by default) the keyset page, the count and the full
+query of the given filters and sort are explained with EXPLAIN QUERY PLAN on the configured
+database. Steps reading the whole table or sorting every row are reported with the index that
+avoids them, to add to the __indexes__ of the model. The exit status is 1 when an index is
+missing, 2 when the queries could not be explained.
+"""
+import argparse
+import sys
+
+from src.cli.common import build_crud_service, load_model, parse_filters
+from src.containers.ServiceContainer import ServiceContainer
+from src.infrastructure.Exceptions.RepositoryExceptions import RepositoryError
+from src.infrastructure.QuerySpec import QuerySpec, SortOrder
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", help="model name in src.model, or package.module:Class; all the models by default")
+    parser.add_argument("--where", action="append", default=[], metavar="FIELD:OPERATOR:VALUE", help="filter, e.g. id:ge:100")
+    parser.add_argument("--order-by", help="sort field, the ID by default")
+    parser.add_argument("--descending", action="store_true")
+    args = parser.parse_args()
+
+    missing = 0
+    try:
+        models = [load_model(args.model)] if args.model else list(ServiceContainer().model_registry().models.values())
+        for model in models:
+            order_by = args.order_by or "id"
+            spec = QuerySpec(filters=parse_filters(model, args.where), order_by=(SortOrder(order_by, args.descending),))
+            for advice in build_crud_service(model).explain_queries(spec, order_by, args.descending):
+                print(f"{model.__name__}: {advice.statement}")
+                for line in advice.plan:
+                    print(f"    {line}")
+                if advice.needs_index:
+                    missing += 1
+                    print(f"  -> missing index {advice.columns}: {advice.create_statement}")
+                print()
+    except (ValueError, RepositoryError) as e:
+        print(f"Explain failed: {e}", file=sys.stderr)
+        sys.exit(2)
+    print(f"{missing} missing indexes", file=sys.stderr)
+    sys.exit(1 if missing else 0)
+
+
+if __name__ == "__main__":
+    main()
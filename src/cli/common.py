@@ -0,0 +1,48 @@
+import importlib
+from typing import List, Sequence, Type
+from sqlmodel import SQLModel
+
+from src.containers.RepositoryContainer import RepositoryContainer
+from src.containers.ServiceContainer import ServiceContainer
+from src.infrastructure.QuerySpec import FieldFilter, parse_filter
+from src.infrastructure.SQLModelRepository import SQLModelRepository
+from src.services.CRUDService import CRUDService
+
+"""
+Helpers shared by the command line tools. They use db_config.yml like the Streamlit application.
+"""
+
+
+def load_model(name: str) -> Type[SQLModel]:
+    """
+        The table model called name in the configured model packages (see ModelRegistry), or at "package.module:Class".
+        Raises ValueError if there is no such model.
+    """
+    if ":" not in name:
+        return ServiceContainer().model_registry().get(name)
+    module_name, class_name = name.split(":", 1)
+    model = getattr(importlib.import_module(module_name), class_name, None)
+    if not (isinstance(model, type) and issubclass(model, SQLModel) and getattr(model, "__table__", None) is not None):
+        raise ValueError(f"Unknown table model: {name}")
+    return model
+
+
+def parse_filters(model: Type[SQLModel], wheres: Sequence[str]) -> List[FieldFilter]:
+    """
+        The filters of --where options written FIELD:OPERATOR:VALUE, e.g. id:ge:100.
+        Raises ValueError (or InvalidQueryError) for malformed filters, unknown fields or invalid values.
+    """
+    filters = []
+    for where in wheres:
+        field, operator, raw_value = where.split(":", 2) if where.count(":") >= 2 else (where, "", "")
+        if not operator:
+            raise ValueError(f"Invalid filter, expected FIELD:OPERATOR:VALUE: {where}")
+        filters.append(parse_filter(model, field, operator, raw_value))
+    return filters
+
+
+def build_crud_service(model: Type[SQLModel]) -> CRUDService:
+    """A CRUDService of model on the configured database, without query cache."""
+    repository_container = RepositoryContainer()
+    repository_container.wire()
+    return CRUDService(SQLModelRepository(model))
@@ -0,0 +1,53 @@
+"""
+Export a table model to a CSV, Parquet or Arrow IPC file.
+
+Usage:
+    python -m src.cli.export_data --model ExampleModel --output example.parquet
+        [--where "name:like:%term%"] [--order-by id] [--descending] [--batch-size 10000] [--format csv]
+
+The rows are streamed from the database in batches, so the export runs in bounded memory. --where
+can be repeated, its value is parsed like the filters of the CRUD pages. An output of "-" writes
+to the standard output (--format is then required). The exit status is 2 when the export failed.
+"""
+import argparse
+import sys
+
+from src.cli.common import build_crud_service, load_model, parse_filters
+from src.infrastructure.ArrowIO import FileFormat
+from src.infrastructure.Exceptions.RepositoryExceptions import RepositoryError
+from src.infrastructure.QuerySpec import QuerySpec, SortOrder
+from src.services.ExportService import ExportService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", required=True, help="model name in src.model, or package.module:Class")
+    parser.add_argument("--output", required=True, help='file to write, "-" for the standard output')
+    parser.add_argument("--format", choices=[file_format.value for file_format in FileFormat], help="defaults to the file extension")
+    parser.add_argument("--where", action="append", default=[], metavar="FIELD:OPERATOR:VALUE", help="filter, e.g. id:ge:100")
+    parser.add_argument("--order-by", help="sort field")
+    parser.add_argument("--descending", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    try:
+        model = load_model(args.model)
+        if args.format is not None:
+            file_format = FileFormat(args.format)
+        elif args.output == "-":
+            raise ValueError("--format is required when writing to the standard output")
+        else:
+            file_format = FileFormat.from_name(args.output)
+        filters = parse_filters(model, args.where)
+        order_by = (SortOrder(args.order_by, args.descending),) if args.order_by else ()
+        service = ExportService(build_crud_service(model), model, batch_size=args.batch_size)
+        sink = sys.stdout.buffer if args.output == "-" else args.output
+        rows = service.export(sink, file_format, QuerySpec(filters=filters, order_by=order_by))
+    except (ValueError, OSError, RepositoryError) as e:
+        print(f"Export failed: {e}", file=sys.stderr)
+        sys.exit(2)
+    print(f"{rows} rows exported", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
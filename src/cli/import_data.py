@@ -0,0 +1,49 @@
+"""
+Import a CSV, Parquet or Arrow IPC file into a table model.
+
+Usage:
+    python -m src.cli.import_data FILE --model ExampleModel [--rejects rejects.csv] [--batch-size 10000] [--format csv]
+
+Rows failing validation are written to the reject file (with their line number and error) and the
+others are inserted in batches. The exit status is 1 when rows were rejected, 2 when the import failed.
+"""
+import argparse
+import sys
+
+from src.cli.common import build_crud_service, load_model
+from src.infrastructure.Exceptions.RepositoryExceptions import RepositoryError
+from src.services.ImportService import ImportProgress, ImportService
+
+
+def print_progress(progress: ImportProgress) -> None:
+    done = f" ({progress.fraction:.0%})" if progress.fraction is not None else ""
+    print(f"\r{progress.rows_read} rows read{done}, {progress.rows_imported} imported, {progress.rows_rejected} rejected, "
+          f"{progress.rows_per_second:,.0f} rows/s", end="", file=sys.stderr, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("file")
+    parser.add_argument("--model", required=True, help="model name in src.model, or package.module:Class")
+    parser.add_argument("--format", choices=["csv", "parquet", "arrow"], help="defaults to the file extension")
+    parser.add_argument("--rejects", help="CSV file receiving the invalid rows")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--quiet", action="store_true", help="do not report progress")
+    args = parser.parse_args()
+
+    try:
+        model = load_model(args.model)
+        service = ImportService(build_crud_service(model), model, batch_size=args.batch_size)
+        report = service.import_file(args.file, args.format, args.rejects, None if args.quiet else print_progress)
+    except (ValueError, OSError, RepositoryError) as e:
+        print(f"\nImport failed: {e}", file=sys.stderr)
+        sys.exit(2)
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f"{report.rows_imported} rows imported, {report.rows_rejected} rejected in {report.seconds:.1f} s"
+          + (f", rejects in {report.reject_path}" if report.reject_path else ""))
+    sys.exit(1 if report.rows_rejected else 0)
+
+
+if __name__ == "__main__":
+    main()
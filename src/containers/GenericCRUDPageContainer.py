@@ -1,5 +1,7 @@
+import datetime
+import enum
 from dependency_injector import containers, providers
-from src.view.GenericCRUDPage.StreamLitFieldDispatcher import BooleanFieldRenderer, FloatFieldRenderer, IntegerFieldRenderer, StreamLitFieldDispatcher, TextFieldRenderer
+from src.view.GenericCRUDPage.StreamLitFieldDispatcher import BooleanFieldRenderer, DateFieldRenderer, DateTimeFieldRenderer, EnumFieldRenderer, FloatFieldRenderer, IntegerFieldRenderer, StreamLitFieldDispatcher, TextFieldRenderer, TimeFieldRenderer
 
 class GenericCRUDPageContainer(containers.DeclarativeContainer):
 
@@ -32,6 +34,10 @@ class GenericCRUDPageContainer(containers.DeclarativeContainer):
                 int: providers.Factory(IntegerFieldRenderer)(),
                 float: providers.Factory(FloatFieldRenderer)(),
                 bool: providers.Factory(BooleanFieldRenderer)(),
+                enum.Enum: providers.Factory(EnumFieldRenderer)(),
+                datetime.date: providers.Factory(DateFieldRenderer)(),
+                datetime.time: providers.Factory(TimeFieldRenderer)(),
+                datetime.datetime: providers.Factory(DateTimeFieldRenderer)(),
             }
         )
     
@@ -1,5 +1,14 @@
 from dependency_injector import containers, providers
-from sqlmodel import SQLModel, create_engine, Session
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, create_engine
+from src.infrastructure.AsyncSessionManager import AsyncSessionManager
+from src.infrastructure.DataVersion import compact_change_log, install_data_versions
+from src.infrastructure.FullTextSearch import install_full_text_search
+from src.infrastructure.Indexes import install_indexes
+from src.infrastructure.Instrumentation import instrument_engine
+from src.infrastructure.Metrics import MetricsRegistry
+from src.infrastructure.SessionManager import SessionManager
+from src.infrastructure.SQLiteProfile import apply_sqlite_pragmas, pool_options
 
 class RepositoryContainer(containers.DeclarativeContainer):
 
@@ -8,11 +17,27 @@ class RepositoryContainer(containers.DeclarativeContainer):
 
     wiring_config = containers.WiringConfiguration(modules=[
         "src.infrastructure.SQLModelRepository",
+        "src.infrastructure.AsyncSQLModelRepository",
     ])
     
     # Load configuration from YAML file (default: db_config.yml)
     config = providers.Configuration(yaml_files=["db_config.yml"])
 
+    """
+        Metrics of the process, see the instrumentation section of db_config.yml
+    """
+
+    metrics_registry = providers.ThreadSafeSingleton(
+        MetricsRegistry,
+        slow_query_log_size=config.instrumentation.slow_query_log_size.as_int(),
+    )
+
+    @staticmethod
+    def __instrument(engine, name: str, registry: MetricsRegistry, instrumentation: dict | None):
+        if instrumentation and instrumentation.get("enabled"):
+            instrument_engine(engine, registry, name, instrumentation.get("slow_query_ms"))
+        return engine
+
     """
         SqlLite configuration
     """
@@ -24,13 +49,96 @@ class RepositoryContainer(containers.DeclarativeContainer):
     )
 
     @staticmethod
-    def __create_engine(database_url: str):
-        engine = create_engine(database_url, echo=True)
+    def __create_engine(database_url: str, echo: bool = False, pragmas: dict | None = None, pool: dict | None = None,
+                        registry: MetricsRegistry | None = None, instrumentation: dict | None = None,
+                        change_log: dict | None = None, versioned: bool | None = None):
+        engine = create_engine(database_url, echo=bool(echo), **pool_options(pool))
+        # Registered before the first connection is opened, so every pooled connection gets the profile
+        apply_sqlite_pragmas(engine, pragmas)
+        RepositoryContainer.__instrument(engine, "primary", registry, instrumentation)
         SQLModel.metadata.create_all(engine)
+        # Indexes declared in __indexes__ that existing tables do not have yet
+        install_indexes(engine)
+        # FTS5 indexes and triggers of the models declaring __searchable__ fields
+        install_full_text_search(engine)
+        # Data versions and change log, for the query cache and the delta refreshes of the CRUD pages
+        install_data_versions(engine, versioned=bool(versioned))
+        if change_log and change_log.get("retain_versions") is not None:
+            compact_change_log(engine, int(change_log["retain_versions"]))
         return engine
 
-    sqllite_engine = providers.Singleton(__create_engine, sqllite_database_url)
-    sqllite_session = providers.Factory(
-        Session, 
-        sqllite_engine
-    )
\ No newline at end of file
+    sqllite_engine = providers.ThreadSafeSingleton(
+        __create_engine,
+        sqllite_database_url,
+        echo=config.sqllite.echo,
+        pragmas=config.sqllite.pragmas,
+        pool=config.sqllite.pool,
+        registry=metrics_registry,
+        instrumentation=config.instrumentation,
+        change_log=config.change_log,
+        versioned=config.query_cache.versioned,
+    )
+
+    @staticmethod
+    def __create_replica_engines(replicas: dict | None = None, echo: bool = False,
+                                 registry: MetricsRegistry | None = None, instrumentation: dict | None = None,
+                        change_log: dict | None = None, versioned: bool | None = None):
+        # Replicas are read-only copies: the schema is never created through them
+        engines = {}
+        for name, options in (replicas or {}).items():
+            engine = create_engine(options["url"], echo=bool(echo), **pool_options(options.get("pool")))
+            apply_sqlite_pragmas(engine, options.get("pragmas"))
+            engines[name] = RepositoryContainer.__instrument(engine, name, registry, instrumentation)
+        return engines
+
+    sqllite_replica_engines = providers.ThreadSafeSingleton(
+        __create_replica_engines,
+        replicas=config.sqllite.replicas,
+        echo=config.sqllite.echo,
+        registry=metrics_registry,
+        instrumentation=config.instrumentation,
+    )
+    # Hands out short-lived sessions; the scope (call, rerun, user_session) comes from db_config.yml.
+    # Reads go to the replicas, if any, writes to sqllite_engine
+    sqllite_session_manager = providers.ThreadSafeSingleton(
+        SessionManager,
+        sqllite_engine,
+        scope=config.sqllite.session_scope,
+        replicas=sqllite_replica_engines,
+        read_strategy=config.sqllite.read_strategy,
+    )
+
+    """
+        Async SqlLite configuration (aiosqlite), on the same database file
+    """
+
+    sqllite_async_database_url = providers.Factory(
+        lambda driver, database: f"{driver}:///{database}",
+        driver=config.sqllite.async_driver,
+        database=config.sqllite.database,
+    )
+
+    @staticmethod
+    def __create_async_engine(database_url: str, echo: bool = False, pragmas: dict | None = None, pool: dict | None = None,
+                              schema_engine=None, registry: MetricsRegistry | None = None, instrumentation: dict | None = None):
+        # The schema is created through the synchronous engine (schema_engine), create_all cannot be awaited here
+        engine = create_async_engine(database_url, echo=bool(echo), **pool_options(pool, asynchronous=True))
+        apply_sqlite_pragmas(engine.sync_engine, pragmas)
+        RepositoryContainer.__instrument(engine.sync_engine, "async", registry, instrumentation)
+        return engine
+
+    sqllite_async_engine = providers.ThreadSafeSingleton(
+        __create_async_engine,
+        sqllite_async_database_url,
+        echo=config.sqllite.echo,
+        pragmas=config.sqllite.pragmas,
+        pool=config.sqllite.pool,
+        schema_engine=sqllite_engine,
+        registry=metrics_registry,
+        instrumentation=config.instrumentation,
+    )
+    sqllite_async_session_manager = providers.ThreadSafeSingleton(
+        AsyncSessionManager,
+        sqllite_async_engine,
+        scope=config.sqllite.session_scope,
+    )
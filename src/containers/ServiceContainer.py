@@ -0,0 +1,40 @@
+from dependency_injector import containers, providers
+from src.infrastructure.DownloadServer import DownloadServer
+from src.infrastructure.ModelRegistry import ModelRegistry
+from src.services.TTLQueryCache import TTLQueryCache
+
+class ServiceContainer(containers.DeclarativeContainer):
+
+    # Load configuration from YAML file (default: db_config.yml)
+    config = providers.Configuration(yaml_files=["db_config.yml"])
+
+    """
+        Query cache shared by the CRUD services of the process
+    """
+
+    query_cache = providers.ThreadSafeSingleton(
+        TTLQueryCache,
+        maxsize=config.query_cache.maxsize.as_int(),
+        ttl=config.query_cache.ttl.as_(float),
+    )
+
+    """
+        Server of the streamed exports, started on the first download
+    """
+
+    download_server = providers.ThreadSafeSingleton(
+        DownloadServer,
+        host=config.export.host,
+        port=config.export.port.as_int(),
+        public_url=config.export.public_url,
+        ttl=config.export.link_ttl.as_(float),
+    )
+
+    """
+        Table models of the application, discovered in the configured packages
+    """
+
+    model_registry = providers.ThreadSafeSingleton(
+        ModelRegistry,
+        packages=config.models.packages,
+    )
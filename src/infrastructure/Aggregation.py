@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence, Type
+import pyarrow as pa
+from sqlalchemy import Select, func
+from sqlmodel import SQLModel, select
+from src.infrastructure.ArrowIO import arrow_type
+from src.infrastructure.Exceptions.RepositoryExceptions import InvalidQueryError
+from src.infrastructure.QuerySpec import QuerySpec, build_where, get_column
+
+"""
+Aggregations computed by the database: COUNT, SUM, AVG, MIN and MAX, optionally grouped by fields.
+
+An aggregate SELECT returns one row per group, so its cost is a single pass over the matching rows
+(an index range when the filters allow it) and its memory follows the number of groups, not the
+number of rows. The filters are those of a QuerySpec, the same as the listings.
+"""
+
+
+class AggregateFunction(str, Enum):
+    COUNT = "count"  # without a field, counts the rows; with a field, its non null values
+    SUM = "sum"
+    AVG = "avg"
+    MIN = "min"
+    MAX = "max"
+
+
+@dataclass(frozen=True)
+class Aggregate:
+    """An aggregate function over a field, or COUNT(*) without field. Its result column is named label."""
+
+    function: AggregateFunction
+    field: Optional[str] = None
+
+    def __post_init__(self):
+        object.__setattr__(self, "function", AggregateFunction(self.function))
+        if self.field is None and self.function != AggregateFunction.COUNT:
+            raise InvalidQueryError(f"Aggregate {self.function.value} needs a field")
+
+    @property
+    def label(self) -> str:
+        return f"{self.function.value}_{self.field}" if self.field else "count"
+
+
+_FUNCTIONS = {
+    AggregateFunction.COUNT: func.count,
+    AggregateFunction.SUM: func.sum,
+    AggregateFunction.AVG: func.avg,
+    AggregateFunction.MIN: func.min,
+    AggregateFunction.MAX: func.max,
+}
+
+
+def numeric_fields(model: Type[SQLModel]) -> List[str]:
+    """The int, float and decimal fields of model, the primary key excluded."""
+    primary_key = {column.name for column in model.__table__.primary_key}
+    return [name for name, field in model.model_fields.items() if name not in primary_key and _is_numeric(field.annotation)]
+
+
+def _is_numeric(annotation: Any) -> bool:
+    data_type = arrow_type(annotation)
+    return pa.types.is_integer(data_type) or pa.types.is_floating(data_type) or pa.types.is_decimal(data_type)
+
+
+def result_annotation(model: Type[SQLModel], aggregate: Aggregate) -> Any:
+    """The type of the values of an aggregate column: int for counts, float for averages, the field type otherwise."""
+    if aggregate.function == AggregateFunction.COUNT:
+        return int
+    if aggregate.function == AggregateFunction.AVG:
+        return float
+    return model.model_fields[aggregate.field].annotation
+
+
+def build_aggregate_select(model: Type[SQLModel], aggregates: Sequence[Aggregate], group_by: Sequence[str] = (),
+                           spec: Optional[QuerySpec] = None, limit: Optional[int] = None) -> Select:
+    """
+        Compile aggregates into a SELECT of the group_by fields then the aggregates, one row per group
+        in the order of the group_by fields, over the rows matching the filters of spec.
+
+        Raises:
+            InvalidQueryError: For unknown fields, SUM or AVG of a non numeric field, no aggregates or a non positive limit.
+    """
+    if not aggregates:
+        raise InvalidQueryError("At least one aggregate is needed")
+    if limit is not None and limit < 1:
+        raise InvalidQueryError("Limit must be positive")
+    columns = []
+    for aggregate in aggregates:
+        if aggregate.field is None:
+            columns.append(func.count().label(aggregate.label))
+            continue
+        column = get_column(model, aggregate.field)
+        if aggregate.function in (AggregateFunction.SUM, AggregateFunction.AVG) and not _is_numeric(model.model_fields[aggregate.field].annotation):
+            raise InvalidQueryError(f"Aggregate {aggregate.function.value} needs a numeric field, not {aggregate.field}")
+        columns.append(_FUNCTIONS[aggregate.function](column).label(aggregate.label))
+    groups = [get_column(model, field) for field in group_by]
+    statement = (select(*groups, *columns).select_from(model)
+                 .where(*build_where(model, spec.filters if spec else ()))
+                 .group_by(*groups).order_by(*groups))
+    return statement.limit(limit) if limit is not None else statement
+
+
+def summary_aggregates(model: Type[SQLModel]) -> List[Aggregate]:
+    """COUNT(*) then the count, sum, average, minimum and maximum of every numeric field."""
+    return [Aggregate(AggregateFunction.COUNT)] + [Aggregate(function, field) for field in numeric_fields(model) for function in AggregateFunction]
+
+
+@dataclass(frozen=True)
+class Summary:
+    """The number of matching rows and, per numeric field, its count, sum, avg, min and max."""
+
+    count: int
+    fields: List[Dict[str, Any]]
+
+    @classmethod
+    def from_row(cls, model: Type[SQLModel], values: Sequence[Any]) -> "Summary":
+        """The summary of the single row returned by the summary_aggregates of model."""
+        results = dict(zip((aggregate.label for aggregate in summary_aggregates(model)), values))
+        return cls(results["count"], [{"field": field, **{function.value: results[Aggregate(function, field).label]
+                                                          for function in AggregateFunction}}
+                                      for field in numeric_fields(model)])
@@ -0,0 +1,160 @@
+import datetime
+import decimal
+import enum
+import os
+import types
+import uuid
+from contextlib import contextmanager
+from enum import Enum
+from typing import Annotated, Any, BinaryIO, Iterator, Optional, Sequence, Type, Union, get_args, get_origin
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.ipc as pa_ipc
+import pyarrow.parquet as pq
+from sqlmodel import SQLModel
+
+"""
+Chunked reading and writing of tabular files with pyarrow.
+
+Files are never loaded whole: CSV is parsed block by block and Parquet row group by row group, and
+writers take one record batch at a time, so memory is bounded by the batch size whatever the size
+of the file.
+"""
+
+
+class FileFormat(str, Enum):
+    CSV = "csv"
+    PARQUET = "parquet"
+    ARROW = "arrow"  # Arrow IPC file format (Feather v2)
+
+    @classmethod
+    def from_name(cls, name: str) -> "FileFormat":
+        """Format of a file from its extension. Raises ValueError for other extensions."""
+        extension = os.path.splitext(str(name))[1].lower().lstrip(".")
+        if extension in ("parquet", "pq"):
+            return cls.PARQUET
+        if extension in ("csv", "txt"):
+            return cls.CSV
+        if extension in ("arrow", "feather", "ipc"):
+            return cls.ARROW
+        raise ValueError(f"Unsupported file extension: {name}")
+
+    @property
+    def extension(self) -> str:
+        return self.value
+
+    @property
+    def mime_type(self) -> str:
+        return {FileFormat.CSV: "text/csv", FileFormat.PARQUET: "application/vnd.apache.parquet",
+                FileFormat.ARROW: "application/vnd.apache.arrow.file"}[self]
+
+
+_ARROW_TYPES = {
+    bool: pa.bool_(),
+    int: pa.int64(),
+    float: pa.float64(),
+    str: pa.string(),
+    bytes: pa.binary(),
+    datetime.datetime: pa.timestamp("us"),
+    datetime.date: pa.date32(),
+    datetime.time: pa.time64("us"),
+    datetime.timedelta: pa.duration("us"),
+    decimal.Decimal: pa.string(),
+    uuid.UUID: pa.string(),
+}
+
+
+def arrow_type(annotation: Any) -> pa.DataType:
+    """Arrow type of a field annotation; Optional and Annotated are unwrapped, enums and unknown types become strings."""
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        return arrow_type(get_args(annotation)[0])
+    if origin in (Union, types.UnionType):
+        arguments = [argument for argument in get_args(annotation) if argument is not type(None)]
+        return arrow_type(arguments[0]) if len(arguments) == 1 else pa.string()
+    if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+        return pa.string()
+    return _ARROW_TYPES.get(annotation, pa.string())
+
+
+def arrow_schema(model: Type[SQLModel], columns: Optional[Sequence[str]] = None) -> pa.Schema:
+    """Arrow schema of a model, or of some of its columns."""
+    fields = model.model_fields
+    return pa.schema([pa.field(name, arrow_type(fields[name].annotation)) for name in (columns or list(fields))])
+
+
+@contextmanager
+def open_writer(sink: str | BinaryIO, file_format: FileFormat, schema: pa.Schema) -> Iterator[Any]:
+    """
+        Writer of record batches (write_batch) for a path or a binary file.
+        Every batch is written as it comes: a CSV block, a Parquet row group or an IPC record batch.
+    """
+    if file_format == FileFormat.PARQUET:
+        writer = pq.ParquetWriter(sink, schema)
+    elif file_format == FileFormat.ARROW:
+        writer = pa_ipc.new_file(sink, schema)
+    else:
+        writer = pa_csv.CSVWriter(sink, schema)
+    try:
+        yield writer
+    finally:
+        writer.close()
+
+
+def read_columns(source: str | BinaryIO, file_format: FileFormat) -> list[str]:
+    """Column names of a file, reading only its header (CSV) or footer (Parquet, Arrow)."""
+    if file_format == FileFormat.PARQUET:
+        return pq.ParquetFile(source).schema_arrow.names
+    if file_format == FileFormat.ARROW:
+        return pa_ipc.open_file(source).schema.names
+    reader = pa_csv.open_csv(source)
+    try:
+        return reader.schema.names
+    finally:
+        reader.close()
+
+
+def read_batches(source: str | BinaryIO, file_format: FileFormat, columns: Optional[Sequence[str]] = None,
+                 batch_size: int = 10000) -> Iterator[pa.RecordBatch]:
+    """
+        Stream a CSV, Parquet or Arrow file as record batches of the given columns (all columns if None).
+        CSV values are read as strings, empty ones as nulls: the caller converts them to the model types,
+        so that a column inferred as a number from its first block cannot fail on a later block.
+    """
+    if file_format == FileFormat.PARQUET:
+        parquet_file = pq.ParquetFile(source)
+        yield from parquet_file.iter_batches(batch_size=batch_size, columns=list(columns) if columns is not None else None)
+        return
+    if file_format == FileFormat.ARROW:
+        # The IPC file format is random access, record batches are read (memory-mapped for paths) one at a time
+        reader = pa_ipc.open_file(pa.memory_map(source) if isinstance(source, str) else source)
+        for index in range(reader.num_record_batches):
+            batch = reader.get_batch(index)
+            if columns is not None:
+                batch = batch.select(list(columns))
+            for offset in range(0, batch.num_rows, batch_size):
+                yield batch.slice(offset, batch_size)
+        return
+
+    names = read_columns(source, file_format) if columns is None else list(columns)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    # Roughly batch_size rows of a hundred bytes per block
+    read_options = pa_csv.ReadOptions(block_size=max(batch_size * 100, 1 << 20))
+    convert_options = pa_csv.ConvertOptions(include_columns=names, column_types={name: pa.string() for name in names},
+                                            strings_can_be_null=True, null_values=[""])
+    reader = pa_csv.open_csv(source, read_options=read_options, convert_options=convert_options)
+    try:
+        for batch in reader:
+            # Blocks are sized in bytes, split them to honour the batch size
+            for offset in range(0, batch.num_rows, batch_size):
+                yield batch.slice(offset, batch_size)
+    finally:
+        reader.close()
+
+
+def count_rows(source: str | BinaryIO, file_format: FileFormat) -> Optional[int]:
+    """Number of rows when it is known without reading the file (Parquet metadata), None otherwise."""
+    if file_format == FileFormat.PARQUET:
+        return pq.ParquetFile(source).metadata.num_rows
+    return None
@@ -0,0 +1,413 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Generic, Iterable, Mapping, TypeVar, List, Optional, Type
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import delete, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession as SQLAlchemyAsyncSession
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from src.containers.RepositoryContainer import RepositoryContainer
+from src.infrastructure.Interfaces.IAsyncRepository import IAsyncRepository
+from src.infrastructure.AsyncSessionManager import AsyncSessionManager
+from src.infrastructure.QuerySpec import QuerySpec
+from src.infrastructure.Pagination import KeysetPage
+from src.infrastructure.Statements import KeysetQuery, build_count, build_select, chunked, group_by_columns, to_row
+from dependency_injector.wiring import Provide, inject
+from src.infrastructure.Exceptions.RepositoryExceptions import (
+    DatabaseConnectionError,
+    QueryExecutionError,
+    CommitError,
+    InvalidQueryError
+)
+
+T = TypeVar("T", bound=SQLModel)
+
+
+class AsyncSQLModelRepository(IAsyncRepository[T, int], Generic[T]):
+    """
+        Asynchronous SQLModelRepository on an AsyncEngine (aiosqlite for SQLite).
+        Statements are built exactly as in SQLModelRepository, only their execution is awaited.
+    """
+
+    @inject
+    def __init__(self, model: Type[T], session: Optional[AsyncSession] = None,
+                 session_manager: AsyncSessionManager = Provide[RepositoryContainer.sqllite_async_session_manager],
+                 batch_size: int = 1000):
+        if batch_size < 1:
+            raise ValueError("Batch size must be positive")
+        self.model = model
+        self.session = session
+        self._session_manager = session_manager
+        self.batch_size = batch_size
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[AsyncSession]:
+        if self.session is not None:
+            yield self.session
+            return
+        async with self._session_manager.session() as session:
+            yield session
+
+    @staticmethod
+    async def _execute(session: AsyncSession, statement: Any, parameters: Optional[List[Dict[str, Any]]] = None) -> Any:
+        # INSERT, UPDATE and DELETE, possibly as executemany: AsyncSession.exec only takes a single set of
+        # parameters and SQLModel deprecates its execute, so they run on the SQLAlchemy session it extends
+        return await SQLAlchemyAsyncSession.execute(session, statement, parameters)
+
+    async def get_all(self) -> List[T]:
+        try:
+            statement = select(self.model)
+        except OperationalError as e:
+            raise DatabaseConnectionError(f"Database connection error in get_all for {self.model.__name__}: {str(e)}") from e
+        except SQLAlchemyError as e:
+            raise QueryExecutionError(f"Query preparation error in get_all for {self.model.__name__}: {str(e)}") from e
+        
+        async with self._session() as session:
+            try:
+                results = await session.exec(statement)
+                return results.all()
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error executing get_all for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Query execution error in get_all for {self.model.__name__}: {str(e)}") from e
+
+    async def get_page(self, skip: int = 0, limit: int = 10) -> List[T]:
+        try:
+            statement = select(self.model).order_by(self.model.id).offset(skip).limit(limit)
+        except OperationalError as e:
+            raise DatabaseConnectionError(f"Database connection error in get_page for {self.model.__name__}: {str(e)}") from e
+        except SQLAlchemyError as e:
+            raise QueryExecutionError(f"Query preparation error in get_page for {self.model.__name__}: {str(e)}") from e
+
+        async with self._session() as session:
+            try:
+                results = await session.exec(statement)
+                return results.all()
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error executing get_page for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Query execution error in get_page for {self.model.__name__}: {str(e)}") from e
+
+    async def get_page_by_cursor(self, cursor: Optional[str] = None, limit: int = 10, order_by: Optional[str] = None,
+                                 descending: bool = False, spec: Optional[QuerySpec] = None) -> KeysetPage[T]:
+        try:
+            keyset_query = KeysetQuery.build(self.model, cursor, limit, order_by, descending, spec)
+        except OperationalError as e:
+            raise DatabaseConnectionError(f"Database connection error in get_page_by_cursor for {self.model.__name__}: {str(e)}") from e
+        except SQLAlchemyError as e:
+            raise QueryExecutionError(f"Query preparation error in get_page_by_cursor for {self.model.__name__}: {str(e)}") from e
+
+        async with self._session() as session:
+            try:
+                items = (await session.exec(keyset_query.statement)).all()
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error executing get_page_by_cursor for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Query execution error in get_page_by_cursor for {self.model.__name__}: {str(e)}") from e
+        return keyset_query.to_page(items)
+
+    async def count(self, spec: Optional[QuerySpec] = None) -> int:
+        try:
+            statement = build_count(self.model, spec)
+        except OperationalError as e:
+            raise DatabaseConnectionError(f"Database connection error in count for {self.model.__name__}: {str(e)}") from e
+        except SQLAlchemyError as e:
+            raise QueryExecutionError(f"Query preparation error in count for {self.model.__name__}: {str(e)}") from e
+
+        async with self._session() as session:
+            try:
+                return (await session.exec(statement)).one()
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error executing count for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Query execution error in count for {self.model.__name__}: {str(e)}") from e
+
+    async def query(self, spec: QuerySpec) -> List[T] | List[Dict[str, Any]]:
+        try:
+            statement = build_select(self.model, spec)
+        except OperationalError as e:
+            raise DatabaseConnectionError(f"Database connection error in query for {self.model.__name__}: {str(e)}") from e
+        except SQLAlchemyError as e:
+            raise QueryExecutionError(f"Query preparation error in query for {self.model.__name__}: {str(e)}") from e
+
+        async with self._session() as session:
+            try:
+                if spec.columns is None:
+                    return (await session.exec(statement)).all()
+                return [dict(row) for row in (await session.exec(statement)).mappings()]
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error executing query for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Query execution error in query for {self.model.__name__}: {str(e)}") from e
+
+    async def iter_batches(self, spec: Optional[QuerySpec] = None, batch_size: Optional[int] = None) -> AsyncIterator[List[T]]:
+        spec = spec or QuerySpec()
+        batch_size = batch_size or self.batch_size
+        try:
+            # stream() keeps a cursor open and yield_per hydrates batch_size rows at a time
+            statement = build_select(self.model, spec).execution_options(yield_per=batch_size)
+        except OperationalError as e:
+            raise DatabaseConnectionError(f"Database connection error in iter_batches for {self.model.__name__}: {str(e)}") from e
+        except SQLAlchemyError as e:
+            raise QueryExecutionError(f"Query preparation error in iter_batches for {self.model.__name__}: {str(e)}") from e
+
+        async with self._session() as session:
+            try:
+                result = await session.stream(statement)
+                partitions = result.scalars().partitions() if spec.columns is None else result.mappings().partitions()
+                async for partition in partitions:
+                    yield list(partition) if spec.columns is None else [dict(row) for row in partition]
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error executing iter_batches for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Query execution error in iter_batches for {self.model.__name__}: {str(e)}") from e
+
+    async def get_by_id(self, item_id: int) -> Optional[T]:
+        try:
+            statement = select(self.model).where(self.model.id == item_id)
+        except OperationalError as e:
+            raise DatabaseConnectionError(f"Database connection error in get_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+        except SQLAlchemyError as e:
+            raise QueryExecutionError(f"Query preparation error in get_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+        
+        async with self._session() as session:
+            try:
+                result = (await session.exec(statement)).first()
+                return result
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error executing get_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Query execution error in get_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+
+    async def add(self, item: T) -> T:
+        async with self._session() as session:
+            try:
+                session.add(item)
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error in add for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Error adding item in add for {self.model.__name__}: {str(e)}") from e
+        
+            try:
+                await session.commit()
+            except OperationalError as e:
+                await session.rollback()
+                raise DatabaseConnectionError(f"Database connection error during commit in add for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                await session.rollback()
+                raise CommitError(f"Commit error in add for {self.model.__name__}: {str(e)}") from e
+        
+            try:
+                await session.refresh(item)
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error during refresh in add for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Error refreshing item in add for {self.model.__name__}: {str(e)}") from e
+        
+            return item
+
+    async def update(self, item: T) -> T:
+        async with self._session() as session:
+            try:
+                session.add(item)
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error in update for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Error updating item in update for {self.model.__name__}: {str(e)}") from e
+        
+            try:
+                await session.commit()
+            except OperationalError as e:
+                await session.rollback()
+                raise DatabaseConnectionError(f"Database connection error during commit in update for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                await session.rollback()
+                raise CommitError(f"Commit error in update for {self.model.__name__}: {str(e)}") from e
+        
+            try:
+                await session.refresh(item)
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error during refresh in update for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Error refreshing item in update for {self.model.__name__}: {str(e)}") from e
+        
+            return item
+
+    async def delete(self, item: T) -> None:
+        async with self._session() as session:
+            try:
+                await session.delete(item)
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error in delete for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Error deleting item in delete for {self.model.__name__}: {str(e)}") from e
+        
+            try:
+                await session.commit()
+            except OperationalError as e:
+                await session.rollback()
+                raise DatabaseConnectionError(f"Database connection error during commit in delete for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                await session.rollback()
+                raise CommitError(f"Commit error in delete for {self.model.__name__}: {str(e)}") from e
+
+    async def update_by_id(self, item_id: int, values: Mapping[str, Any], returning: bool = False) -> bool | Optional[T]:
+        unknown_fields = set(values) - set(self.model.model_fields)
+        if unknown_fields:
+            raise InvalidQueryError(f"Unknown fields {sorted(unknown_fields)} in update_by_id for {self.model.__name__} with id={item_id}")
+        if not values:
+            # Nothing to set: an UPDATE without SET clause is not valid SQL
+            item = await self.get_by_id(item_id)
+            return item if returning else item is not None
+
+        try:
+            statement = update(self.model).where(self.model.id == item_id).values(**values)
+            if returning:
+                statement = statement.returning(self.model)
+        except OperationalError as e:
+            raise DatabaseConnectionError(f"Database connection error in update_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+        except SQLAlchemyError as e:
+            raise QueryExecutionError(f"Query preparation error in update_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+
+        async with self._session() as session:
+            try:
+                result = await self._execute(session, statement)
+                outcome = result.scalars().first() if returning else result.rowcount > 0
+            except OperationalError as e:
+                await session.rollback()
+                raise DatabaseConnectionError(f"Database connection error executing update_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                await session.rollback()
+                raise QueryExecutionError(f"Query execution error in update_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+
+            try:
+                await session.commit()
+            except OperationalError as e:
+                await session.rollback()
+                raise DatabaseConnectionError(f"Database connection error during commit in update_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                await session.rollback()
+                raise CommitError(f"Commit error in update_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+        return outcome
+
+    async def delete_by_id(self, item_id: int, returning: bool = False) -> bool | Optional[T]:
+        try:
+            statement = delete(self.model).where(self.model.id == item_id)
+            if returning:
+                # Plain columns: the deleted row is rebuilt as a detached instance that outlives the commit
+                statement = statement.returning(*self.model.__table__.columns)
+        except OperationalError as e:
+            raise DatabaseConnectionError(f"Database connection error in delete_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+        except SQLAlchemyError as e:
+            raise QueryExecutionError(f"Query preparation error in delete_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+
+        async with self._session() as session:
+            try:
+                result = await self._execute(session, statement)
+                if returning:
+                    row = result.mappings().first()
+                    outcome = self.model.model_validate(row) if row is not None else None
+                else:
+                    outcome = result.rowcount > 0
+            except OperationalError as e:
+                await session.rollback()
+                raise DatabaseConnectionError(f"Database connection error executing delete_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                await session.rollback()
+                raise QueryExecutionError(f"Query execution error in delete_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+
+            try:
+                await session.commit()
+            except OperationalError as e:
+                await session.rollback()
+                raise DatabaseConnectionError(f"Database connection error during commit in delete_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                await session.rollback()
+                raise CommitError(f"Commit error in delete_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+        return outcome
+
+    async def add_many(self, items: Iterable[T | Mapping[str, Any]], chunk_size: Optional[int] = None, return_ids: bool = False) -> int:
+        # Core insert on the table, see SQLModelRepository.add_many
+        table = self.model.__table__
+        statement = insert(table)
+        if return_ids:
+            statement = statement.returning(table.c.id, sort_by_parameter_order=True)
+
+        inserted = 0
+        async with self._session() as session:
+            for chunk in chunked(items, chunk_size or self.batch_size):
+                rows = [to_row(item, drop_empty_id=True, model=self.model) for item in chunk]
+                try:
+                    # Rows with an explicit ID, or missing required fields, go in their own statement
+                    for positions in group_by_columns(rows):
+                        result = await self._execute(session, statement, [rows[position] for position in positions])
+                        if return_ids:
+                            for position, item_id in zip(positions, result.scalars().all()):
+                                if isinstance(chunk[position], SQLModel):
+                                    chunk[position].id = item_id
+                except OperationalError as e:
+                    await session.rollback()
+                    raise DatabaseConnectionError(f"Database connection error in add_many for {self.model.__name__}: {str(e)}") from e
+                except SQLAlchemyError as e:
+                    await session.rollback()
+                    raise QueryExecutionError(f"Error inserting items in add_many for {self.model.__name__}: {str(e)}") from e
+
+                try:
+                    await session.commit()
+                except OperationalError as e:
+                    await session.rollback()
+                    raise DatabaseConnectionError(f"Database connection error during commit in add_many for {self.model.__name__}: {str(e)}") from e
+                except SQLAlchemyError as e:
+                    await session.rollback()
+                    raise CommitError(f"Commit error in add_many for {self.model.__name__}: {str(e)}") from e
+                inserted += len(rows)
+        return inserted
+
+    async def update_many(self, items: Iterable[T | Mapping[str, Any]], chunk_size: Optional[int] = None) -> int:
+        updated = 0
+        async with self._session() as session:
+            for chunk in chunked(items, chunk_size or self.batch_size):
+                rows = [to_row(item) for item in chunk]
+                try:
+                    # ORM bulk UPDATE by primary key: one executemany per group of rows with the same columns
+                    await self._execute(session, update(self.model), rows)
+                except OperationalError as e:
+                    await session.rollback()
+                    raise DatabaseConnectionError(f"Database connection error in update_many for {self.model.__name__}: {str(e)}") from e
+                except SQLAlchemyError as e:
+                    await session.rollback()
+                    raise QueryExecutionError(f"Error updating items in update_many for {self.model.__name__}: {str(e)}") from e
+
+                try:
+                    await session.commit()
+                except OperationalError as e:
+                    await session.rollback()
+                    raise DatabaseConnectionError(f"Database connection error during commit in update_many for {self.model.__name__}: {str(e)}") from e
+                except SQLAlchemyError as e:
+                    await session.rollback()
+                    raise CommitError(f"Commit error in update_many for {self.model.__name__}: {str(e)}") from e
+                updated += len(rows)
+        return updated
+
+    async def delete_many_by_ids(self, item_ids: Iterable[int], chunk_size: Optional[int] = None) -> int:
+        deleted = 0
+        async with self._session() as session:
+            for chunk in chunked(item_ids, chunk_size or self.batch_size):
+                try:
+                    result = await self._execute(session, delete(self.model).where(self.model.id.in_(chunk)))
+                except OperationalError as e:
+                    await session.rollback()
+                    raise DatabaseConnectionError(f"Database connection error in delete_many_by_ids for {self.model.__name__}: {str(e)}") from e
+                except SQLAlchemyError as e:
+                    await session.rollback()
+                    raise QueryExecutionError(f"Error deleting items in delete_many_by_ids for {self.model.__name__}: {str(e)}") from e
+
+                try:
+                    await session.commit()
+                except OperationalError as e:
+                    await session.rollback()
+                    raise DatabaseConnectionError(f"Database connection error during commit in delete_many_by_ids for {self.model.__name__}: {str(e)}") from e
+                except SQLAlchemyError as e:
+                    await session.rollback()
+                    raise CommitError(f"Commit error in delete_many_by_ids for {self.model.__name__}: {str(e)}") from e
+                deleted += result.rowcount
+        return deleted
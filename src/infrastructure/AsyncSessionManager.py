@@ -0,0 +1,70 @@
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.infrastructure.SessionManager import SessionScope
+
+"""
+Asynchronous counterpart of SessionManager.
+
+Outside of a scope every operation gets its own AsyncSession, so independent operations can run
+concurrently on different pooled connections. An AsyncSession does not support concurrent use:
+operations inside a scope share the bound session and are serialized by a lock.
+"""
+
+
+class AsyncSessionManager:
+    """Creates short-lived async sessions and binds them to the current task for the configured scope."""
+
+    def __init__(self, engine: AsyncEngine, scope: Optional[SessionScope | str] = None):
+        if engine is None:
+            raise ValueError("Engine cannot be None")
+        self._engine = engine
+        self._scope = SessionScope(scope or SessionScope.CALL)
+        # Tasks inherit a copy of the context, so tasks spawned inside a scope see the bound session.
+        self._bound_session: ContextVar[Optional[Tuple[AsyncSession, asyncio.Lock]]] = ContextVar(f"bound_async_session_{id(self)}", default=None)
+
+    @property
+    def scope(self) -> SessionScope:
+        return self._scope
+
+    @property
+    def engine(self) -> AsyncEngine:
+        return self._engine
+
+    def create_session(self) -> AsyncSession:
+        """Create a new AsyncSession. Loaded objects stay readable after commit and close."""
+        return AsyncSession(self._engine, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        """Session for a single operation: the bound one if a scope is open, otherwise a fresh one closed on exit."""
+        bound = self._bound_session.get()
+        if bound is not None:
+            bound_session, lock = bound
+            async with lock:
+                yield bound_session
+            return
+        async with self.create_session() as session:
+            yield session
+
+    @asynccontextmanager
+    async def bind(self, session: Optional[AsyncSession] = None) -> AsyncIterator[AsyncSession]:
+        """Open a scope, see SessionManager.bind."""
+        owned = session is None
+        session = session if session is not None else self.create_session()
+        token = self._bound_session.set((session, asyncio.Lock()))
+        try:
+            yield session
+        except BaseException:
+            await session.rollback()
+            raise
+        else:
+            await session.commit()
+        finally:
+            self._bound_session.reset(token)
+            if owned:
+                await session.close()
@@ -0,0 +1,54 @@
+from enum import Enum
+from typing import Any, List, Mapping, Optional, Sequence, Tuple, Type
+import pandas as pd
+import pyarrow as pa
+from sqlalchemy import Row
+from sqlmodel import SQLModel
+from src.infrastructure.ArrowIO import arrow_type
+
+"""
+Columnar assembly of Core result rows, for read-only listings and exports.
+
+The rows come straight from the database driver (no ORM identity map, no pydantic model per row)
+and are turned into one of three shapes: a list of tuples, a pandas DataFrame or a pyarrow Table.
+The DataFrame and the Table are built column by column from the transposed rows, which is a
+handful of C level passes instead of one Python object per row. The values are trusted as they
+come from the database, they are not validated again.
+"""
+
+ColumnarData = List[Tuple[Any, ...]] | pd.DataFrame | pa.Table
+
+
+class RowFormat(str, Enum):
+    TUPLES = "tuples"
+    DATAFRAME = "dataframe"
+    ARROW = "arrow"
+
+
+def assemble(model: Type[SQLModel], columns: Sequence[str], rows: Sequence[Row | Tuple[Any, ...]],
+             row_format: RowFormat, annotations: Optional[Mapping[str, Any]] = None) -> ColumnarData:
+    """
+        Build the rows (values in the order of columns) in the requested format.
+        annotations gives the types of the columns that are not fields of model, e.g. computed ones.
+    """
+    if row_format == RowFormat.TUPLES:
+        return [tuple(row) for row in rows]
+    values = list(zip(*rows)) if rows else [() for _ in columns]
+    if row_format == RowFormat.DATAFRAME:
+        return pd.DataFrame({name: list(column) for name, column in zip(columns, values)}, columns=list(columns))
+
+    annotations = {**{name: field.annotation for name, field in model.model_fields.items()}, **(annotations or {})}
+    schema = pa.schema([pa.field(name, arrow_type(annotations[name])) for name in columns])
+    arrays = []
+    for field, column in zip(schema, values):
+        # Enums, decimals, UUIDs... are stored as text in Arrow, see ArrowIO.arrow_type
+        if field.type == pa.string() and annotations[field.name] is not str:
+            column = [_to_text(value) for value in column]
+        arrays.append(pa.array(column, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _to_text(value: Any) -> Any:
+    if value is None or isinstance(value, str):
+        return value
+    return value.value if isinstance(value, Enum) else str(value)
@@ -0,0 +1,180 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Generic, List, Optional, Sequence, Type, TypeVar
+from sqlalchemy import Engine, Select, column, table
+from sqlmodel import SQLModel, select
+from src.infrastructure.ModelRegistry import imported_table_models
+
+"""
+Data versions and change log, maintained by triggers on INSERT, UPDATE and DELETE.
+
+Every table has a version, a counter incremented by each written row. Reading it is a primary key
+lookup in a table of a few rows, whatever the size of the data, so a cache can check it before
+every read and keep its entries until the data actually changes.
+
+The change log is opt-in, for the tables whose copies are refreshed with changes_since:
+
+    class Order(SQLModel, table=True):
+        __change_log__ = True
+        ...
+
+It keeps, per written row, the version of its last change and whether it was deleted (a
+tombstone). The versions are thus a monotonic change sequence: the rows changed since version v
+are the log entries of the table with a version above v, read through an index, so a client
+holding a copy of the table refreshes it at a cost that follows the churn, not the table size.
+A row has a single log entry, the log grows with the rows ever written, not with the writes, until
+compact_change_log drops the entries older than a horizon; tokens older than the horizon are then
+expired (ChangeSet.expired) and their copies must be read again.
+
+The triggers run in the writing transaction, so writes of other processes and of raw SQL are seen
+too, at a price on bulk inserts: with add_many on 50k rows of a 4 column table, 165k rows/s without
+triggers, 110k rows/s with the version counter and 87k rows/s with the change log as well. The
+version counter is thus only installed when the query cache uses it or the model has a change log.
+PRAGMA data_version was not enough: its value is per connection, changes with any table and
+ignores the commits of the connection itself, which a connection pool cannot make use of.
+"""
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+VERSION_TABLE = "data_version"
+CHANGE_LOG_TABLE = "change_log"
+
+_versions = table(VERSION_TABLE, column("table_name"), column("version"), column("compacted"))
+_changes = table(CHANGE_LOG_TABLE, column("table_name"), column("row_id"), column("version"), column("deleted"))
+
+
+@dataclass(frozen=True)
+class ChangeSet(Generic[T]):
+    """
+        The rows of a table changed since a version: the current values of the inserted and updated
+        rows, and the IDs of the deleted ones. token is the version to ask the next changes from;
+        has_more is set when the limit cut the changes, which continue from token. expired is set,
+        with no changes, when the log was compacted past the version asked for: the copy must be
+        read again, from token.
+    """
+
+    items: T
+    deleted_ids: List[int] = field(default_factory=list)
+    token: int = 0
+    has_more: bool = False
+    expired: bool = False
+
+    def __len__(self) -> int:
+        return len(self.items) + len(self.deleted_ids)
+
+
+def has_change_log(model: Type[SQLModel]) -> bool:
+    """Whether model declares __change_log__, i.e. its writes are logged for changes_since."""
+    return bool(getattr(model, "__change_log__", False))
+
+
+def version_ddl(model: Type[SQLModel]) -> List[str]:
+    """The statements creating the version row of the table of model and its triggers, all idempotent."""
+    source = model.__table__.name
+    increment = f"UPDATE {VERSION_TABLE} SET version = version + 1 WHERE table_name = '{source}';"
+
+    def log(row_id: str, deleted: int, condition: str = "") -> str:
+        if not has_change_log(model):
+            return ""
+        # The row takes the version its change has just produced
+        return (f" INSERT INTO {CHANGE_LOG_TABLE} (table_name, row_id, version, deleted) "
+                f"SELECT '{source}', {row_id}, version, {deleted} FROM {VERSION_TABLE} WHERE table_name = '{source}'{condition} "
+                "ON CONFLICT (table_name, row_id) DO UPDATE SET version = excluded.version, deleted = excluded.deleted;")
+
+    bodies = {
+        "INSERT": f"{increment}{log('new.id', 0)}",
+        # A changed primary key deletes the old row
+        "UPDATE": f"{increment}{log('old.id', 1, ' AND old.id <> new.id')}{log('new.id', 0)}",
+        "DELETE": f"{increment}{log('old.id', 1)}",
+    }
+    statements = [f"INSERT OR IGNORE INTO {VERSION_TABLE} (table_name, version) VALUES ('{source}', 0)"]
+    for operation, body in bodies.items():
+        trigger = f"{source}_version_{operation.lower()}"
+        # Recreated so that the triggers of older installs follow the current bodies and __change_log__
+        statements += [f"DROP TRIGGER IF EXISTS {trigger}", f"CREATE TRIGGER {trigger} AFTER {operation} ON {source} BEGIN {body} END"]
+    if not has_change_log(model):
+        # Entries left by an install where the model had a change log
+        statements.append(f"DELETE FROM {CHANGE_LOG_TABLE} WHERE table_name = '{source}'")
+    return statements
+
+
+def version_drop_ddl(model: Type[SQLModel]) -> List[str]:
+    """The statements dropping the triggers, the version and the change log entries of the table of model, if they exist."""
+    source = model.__table__.name
+    return ([f"DROP TRIGGER IF EXISTS {source}_version_{operation}" for operation in ("insert", "update", "delete")]
+            + [f"DELETE FROM {VERSION_TABLE} WHERE table_name = '{source}'", f"DELETE FROM {CHANGE_LOG_TABLE} WHERE table_name = '{source}'"])
+
+
+def install_data_versions(engine: Engine, models: Optional[Sequence[Type[SQLModel]]] = None, versioned: bool = True) -> None:
+    """
+        Create the version table, the change log and the triggers of models (all imported table models by default),
+        logging the changes of the models declaring __change_log__. Unless versioned (the query cache checks the
+        versions), the models without a change log get no triggers and no version.
+    """
+    if engine.dialect.name != "sqlite":
+        logger.warning("Data versions need SQLite triggers, not installed on %s", engine.dialect.name)
+        return
+    with engine.begin() as connection:
+        connection.exec_driver_sql(f"CREATE TABLE IF NOT EXISTS {VERSION_TABLE} (table_name TEXT PRIMARY KEY, "
+                                   "version INTEGER NOT NULL, compacted INTEGER NOT NULL DEFAULT 0) WITHOUT ROWID")
+        columns = [row[1] for row in connection.exec_driver_sql(f"PRAGMA table_info({VERSION_TABLE})")]
+        if "compacted" not in columns:
+            # Version tables created before compaction
+            connection.exec_driver_sql(f"ALTER TABLE {VERSION_TABLE} ADD COLUMN compacted INTEGER NOT NULL DEFAULT 0")
+        connection.exec_driver_sql(f"CREATE TABLE IF NOT EXISTS {CHANGE_LOG_TABLE} (table_name TEXT NOT NULL, row_id INTEGER NOT NULL, "
+                                   "version INTEGER NOT NULL, deleted INTEGER NOT NULL, PRIMARY KEY (table_name, row_id)) WITHOUT ROWID")
+        connection.exec_driver_sql(f"CREATE INDEX IF NOT EXISTS ix_{CHANGE_LOG_TABLE}_version ON {CHANGE_LOG_TABLE} (table_name, version)")
+        for model in models if models is not None else imported_table_models():
+            for statement in version_ddl(model) if versioned or has_change_log(model) else version_drop_ddl(model):
+                connection.exec_driver_sql(statement)
+
+
+def compact_change_log(engine: Engine, retain_versions: int, models: Optional[Sequence[Type[SQLModel]]] = None) -> int:
+    """
+        Drop the change log entries of models (all imported table models by default) older than their last
+        retain_versions versions, returning the number of entries dropped. The tokens older than this horizon
+        are expired: changes_since can no longer list their deletions.
+    """
+    if engine.dialect.name != "sqlite":
+        return 0
+    dropped = 0
+    with engine.begin() as connection:
+        for model in models if models is not None else imported_table_models():
+            if not has_change_log(model):
+                continue
+            source = model.__table__.name
+            horizon = connection.exec_driver_sql(f"SELECT version - ?, compacted FROM {VERSION_TABLE} WHERE table_name = ?",
+                                                 (retain_versions, source)).first()
+            if horizon is None or horizon[0] <= horizon[1]:
+                continue
+            dropped += connection.exec_driver_sql(f"DELETE FROM {CHANGE_LOG_TABLE} WHERE table_name = ? AND version <= ?",
+                                                  (source, horizon[0])).rowcount
+            connection.exec_driver_sql(f"UPDATE {VERSION_TABLE} SET compacted = ? WHERE table_name = ?", (horizon[0], source))
+    return dropped
+
+
+def build_version_select(model: Type[SQLModel]) -> Select:
+    """The SELECT of the data version of the table of model."""
+    return select(_versions.c.version).where(_versions.c.table_name == model.__table__.name)
+
+
+def build_horizon_select(model: Type[SQLModel]) -> Select:
+    """The SELECT of the (version, compacted) of the table of model: the tokens below compacted are expired."""
+    return select(_versions.c.version, _versions.c.compacted).where(_versions.c.table_name == model.__table__.name)
+
+
+def build_changes_select(model: Type[SQLModel], token: int, limit: Optional[int] = None) -> Select:
+    """The SELECT of the (row ID, version, deleted) log entries of model changed after version token, oldest first."""
+    statement = (select(_changes.c.row_id, _changes.c.version, _changes.c.deleted)
+                 .where(_changes.c.table_name == model.__table__.name, _changes.c.version > token)
+                 .order_by(_changes.c.version))
+    return statement.limit(limit) if limit is not None else statement
+
+
+def split_changes(rows: Sequence[Any], token: int, limit: Optional[int] = None) -> tuple[List[int], List[int], int, bool]:
+    """The changed IDs, the deleted IDs, the next token and has_more of the log entries returned by build_changes_select."""
+    changed = [row_id for row_id, _, deleted in rows if not deleted]
+    deleted = [row_id for row_id, _, is_deleted in rows if is_deleted]
+    return changed, deleted, rows[-1][1] if rows else token, limit is not None and len(rows) >= limit
@@ -0,0 +1,115 @@
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, Optional
+from urllib.parse import quote
+
+"""
+Streamed file downloads, served next to Streamlit by a daemon thread.
+
+Streamlit sends downloads through its websocket and keeps them in memory, so large files are served
+here instead: the page registers a download (a function producing the file as chunks of bytes) and
+links to the returned URL. The chunks are produced while the browser receives them (HTTP chunked
+transfer encoding), nothing is materialized. Links can be used once and expire after ttl seconds.
+"""
+
+
+@dataclass(frozen=True)
+class _Download:
+    chunks: Callable[[], Iterator[bytes]]
+    file_name: str
+    content_type: str
+    expires: float
+
+
+class DownloadServer:
+    """HTTP server of one-shot, streamed downloads."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, public_url: Optional[str] = None, ttl: float = 600):
+        """
+            port 0 picks a free port. public_url is the base URL of the server as seen by browsers
+            (e.g. behind a reverse proxy), defaults to http://host:port.
+        """
+        if ttl <= 0:
+            raise ValueError("TTL must be positive")
+        self._host = host
+        self._port = port
+        self._public_url = public_url.rstrip("/") if public_url else None
+        self._ttl = ttl
+        self._downloads: Dict[str, _Download] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def base_url(self) -> str:
+        self.start()
+        return self._public_url or f"http://{self._host}:{self._server.server_address[1]}"
+
+    def start(self) -> None:
+        """Start serving, if not started yet. Called by register."""
+        with self._lock:
+            if self._server is not None:
+                return
+            self._server = ThreadingHTTPServer((self._host, self._port), self._handler())
+            self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="download-server", daemon=True).start()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            server, self._server = self._server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    def register(self, chunks: Callable[[], Iterator[bytes]], file_name: str, content_type: str) -> str:
+        """Register a download and return its URL. chunks is only called when the URL is fetched."""
+        token = secrets.token_urlsafe(24)
+        now = time.monotonic()
+        with self._lock:
+            # Forget the expired downloads that were never fetched
+            for expired in [key for key, download in self._downloads.items() if download.expires < now]:
+                del self._downloads[expired]
+            self._downloads[token] = _Download(chunks, file_name, content_type, now + self._ttl)
+        return f"{self.base_url}/download/{token}"
+
+    def _take(self, token: str) -> Optional[_Download]:
+        with self._lock:
+            download = self._downloads.pop(token, None)
+        if download is None or download.expires < time.monotonic():
+            return None
+        return download
+
+    def _handler(self):
+        server = self
+
+        class DownloadHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                prefix = "/download/"
+                download = server._take(self.path[len(prefix):]) if self.path.startswith(prefix) else None
+                if download is None:
+                    self.send_error(404, "Unknown or expired download")
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", download.content_type)
+                self.send_header("Content-Disposition", f"attachment; filename*=UTF-8''{quote(download.file_name)}")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    for chunk in download.chunks():
+                        if chunk:
+                            self.wfile.write(f"{len(chunk):X}\r\n".encode("ascii") + chunk + b"\r\n")
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    # The browser cancelled the download, stop producing chunks
+                    pass
+                finally:
+                    self.close_connection = True
+
+            def log_message(self, format, *args):
+                pass
+
+        return DownloadHandler
@@ -0,0 +1,83 @@
+import threading
+from contextlib import contextmanager
+from enum import Enum
+from typing import Dict, Iterator, Mapping, Optional
+from sqlalchemy.engine import Engine
+
+"""
+Read/write routing between a primary engine and read replicas.
+
+Writes always go to the primary. Reads go to one of the replicas, picked in turn (round_robin) or
+by the smallest number of reads in flight (least_busy). Without replicas every read goes to the
+primary. Replicas are read-only copies kept up to date outside of the application, the router
+does not replicate anything itself.
+"""
+
+
+class ReadStrategy(str, Enum):
+    """How a replica is picked for a read."""
+
+    ROUND_ROBIN = "round_robin"  # each replica in turn
+    LEAST_BUSY = "least_busy"    # the replica with the fewest reads in flight
+
+
+class EngineRouter:
+    """Picks the engine of an operation: the primary for writes, a replica for reads."""
+
+    def __init__(self, primary: Engine, replicas: Optional[Mapping[str, Engine]] = None,
+                 strategy: Optional[ReadStrategy | str] = None):
+        if primary is None:
+            raise ValueError("Primary engine cannot be None")
+        self._primary = primary
+        self._replicas: Dict[str, Engine] = dict(replicas or {})
+        self._strategy = ReadStrategy(strategy or ReadStrategy.ROUND_ROBIN)
+        self._names = list(self._replicas)
+        self._in_flight = {name: 0 for name in self._names}
+        self._turn = 0
+        self._lock = threading.Lock()
+
+    @property
+    def primary(self) -> Engine:
+        return self._primary
+
+    @property
+    def replicas(self) -> Dict[str, Engine]:
+        return dict(self._replicas)
+
+    @property
+    def strategy(self) -> ReadStrategy:
+        return self._strategy
+
+    @property
+    def has_replicas(self) -> bool:
+        return bool(self._replicas)
+
+    def in_flight(self) -> Dict[str, int]:
+        """Number of reads currently running on each replica."""
+        with self._lock:
+            return dict(self._in_flight)
+
+    @contextmanager
+    def reader(self) -> Iterator[Engine]:
+        """
+            Engine for a read, counted as in flight until exit.
+            Falls back to the primary when there are no replicas.
+        """
+        if not self._replicas:
+            yield self._primary
+            return
+        with self._lock:
+            if self._strategy == ReadStrategy.LEAST_BUSY:
+                # Ties go to the replica after the last one picked, so idle replicas share the load
+                start = self._turn
+                order = self._names[start:] + self._names[:start]
+                name = min(order, key=self._in_flight.__getitem__)
+            else:
+                name = self._names[self._turn % len(self._names)]
+            self._turn = (self._names.index(name) + 1) % len(self._names)
+            self._in_flight[name] += 1
+        try:
+            yield self._replicas[name]
+        finally:
+            with self._lock:
+                self._in_flight[name] -= 1
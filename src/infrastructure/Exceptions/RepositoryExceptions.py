@@ -12,4 +12,12 @@ class QueryExecutionError(RepositoryError):
 
 class CommitError(RepositoryError):
     """Raised when a commit operation fails."""
-    pass
\ No newline at end of file
+    pass
+
+class InvalidQueryError(RepositoryError):
+    """Raised when a query references unknown fields or receives malformed arguments."""
+    pass
+
+class InvalidCursorError(InvalidQueryError):
+    """Raised when a pagination cursor cannot be decoded or does not match the query."""
+    pass
@@ -0,0 +1,154 @@
+import logging
+from typing import Iterable, List, Optional, Sequence, Tuple, Type
+from sqlalchemy import Engine, Select, column, literal_column, table
+from sqlmodel import SQLModel, select
+from src.infrastructure.Exceptions.RepositoryExceptions import InvalidQueryError
+from src.infrastructure.ModelRegistry import imported_table_models
+
+"""
+Full-text search over the text fields of a model, with SQLite FTS5.
+
+A model opts in by listing its searchable str fields:
+
+    class Article(SQLModel, table=True):
+        __searchable__ = ("title", "body")
+        ...
+
+install_full_text_search then creates, next to the table, an external content FTS5 index
+("<table>_fts", storing only the index, the text stays in the table) and the triggers keeping it in
+sync on INSERT, UPDATE and DELETE. An index created over an existing table is filled once with the
+FTS5 rebuild command. Searches read the index, not the table: their cost follows the number of
+matches rather than the size of the table. Matches are ranked with bm25, which scores every match,
+so only queries with at most RANKED_MATCHES matches are ranked; broader ones (a common word, a one
+letter prefix) return their first matches in table order, in milliseconds instead of seconds.
+"""
+
+logger = logging.getLogger(__name__)
+
+# Above this number of matches, ranking costs hundreds of milliseconds on 1M rows
+RANKED_MATCHES = 10000
+
+
+def searchable_fields(model: Type[SQLModel]) -> Tuple[str, ...]:
+    """
+        The searchable fields declared by model, empty if it has none.
+        Raises InvalidQueryError for fields that are not fields of the model.
+    """
+    fields = tuple(getattr(model, "__searchable__", ()))
+    unknown = [name for name in fields if name not in model.model_fields]
+    if unknown:
+        raise InvalidQueryError(f"Unknown searchable fields {unknown} for {model.__name__}")
+    return fields
+
+
+def fts_table_name(model: Type[SQLModel]) -> str:
+    return f"{model.__table__.name}_fts"
+
+
+def fts_drop_ddl(model: Type[SQLModel]) -> List[str]:
+    """The statements dropping the FTS5 index of model and its triggers, if they exist."""
+    index = fts_table_name(model)
+    return [f"DROP TRIGGER IF EXISTS {index}_{operation}" for operation in ("insert", "delete", "update")] + [f"DROP TABLE IF EXISTS {index}"]
+
+
+def fts_ddl(model: Type[SQLModel]) -> List[str]:
+    """The statements creating the FTS5 index of model and its triggers, all idempotent."""
+    fields = searchable_fields(model)
+    source, index = model.__table__.name, fts_table_name(model)
+    columns = ", ".join(fields)
+    new_values = ", ".join(f"new.{name}" for name in fields)
+    old_values = ", ".join(f"old.{name}" for name in fields)
+    delete_old = f"INSERT INTO {index}({index}, rowid, {columns}) VALUES ('delete', old.id, {old_values});"
+    insert_new = f"INSERT INTO {index}(rowid, {columns}) VALUES (new.id, {new_values});"
+    triggers = {
+        "insert": f"AFTER INSERT ON {source} BEGIN {insert_new} END",
+        "delete": f"AFTER DELETE ON {source} BEGIN {delete_old} END",
+        # Only updates of the indexed columns touch the index
+        "update": f"AFTER UPDATE OF {columns} ON {source} BEGIN {delete_old} {insert_new} END",
+    }
+    statements = [f"CREATE VIRTUAL TABLE IF NOT EXISTS {index} USING fts5({columns}, content='{source}', content_rowid='id', "
+                  f"tokenize='unicode61 remove_diacritics 2')"]
+    for operation, body in triggers.items():
+        # Recreated so that the triggers of older installs follow the current fields
+        statements += [f"DROP TRIGGER IF EXISTS {index}_{operation}", f"CREATE TRIGGER {index}_{operation} {body}"]
+    return statements
+
+
+def searchable_models(models: Optional[Iterable[Type[SQLModel]]] = None) -> List[Type[SQLModel]]:
+    """The models declaring searchable fields, among models or among all the imported table models."""
+    if models is None:
+        models = imported_table_models()
+    return [model for model in models if searchable_fields(model)]
+
+
+def install_full_text_search(engine: Engine, models: Optional[Sequence[Type[SQLModel]]] = None) -> None:
+    """
+        Create the FTS5 indexes and triggers of the searchable models (all imported table models by default).
+        An index whose columns differ from the searchable fields is dropped, created again and rebuilt.
+    """
+    if engine.dialect.name != "sqlite":
+        logger.warning("Full-text search needs SQLite FTS5, not installed on %s", engine.dialect.name)
+        return
+    with engine.begin() as connection:
+        for model in searchable_models(models):
+            index = fts_table_name(model)
+            columns = tuple(row[1] for row in connection.exec_driver_sql(f"PRAGMA table_info({index})"))
+            if columns and columns != searchable_fields(model):
+                logger.warning("Full-text index %s is on %s instead of %s, recreating it", index, columns, searchable_fields(model))
+                for statement in fts_drop_ddl(model):
+                    connection.exec_driver_sql(statement)
+                columns = ()
+            for statement in fts_ddl(model):
+                connection.exec_driver_sql(statement)
+            if not columns:
+                # The table may already hold rows, index them once
+                logger.info("Building the full-text index %s", index)
+                connection.exec_driver_sql(f"INSERT INTO {index}({index}) VALUES ('rebuild')")
+
+
+def to_match_query(query: str) -> str:
+    """
+        An FTS5 MATCH expression from user input: every word must match, as a prefix.
+        Words are quoted, so FTS5 operators and punctuation in the input cannot cause syntax errors.
+
+        Raises:
+            InvalidQueryError: If the input has no words.
+    """
+    words = [word.replace('"', '""') for word in query.split()]
+    words = [word for word in words if word.strip('"')]
+    if not words:
+        raise InvalidQueryError("Empty search query")
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def _match(model: Type[SQLModel], query: str):
+    index_name = fts_table_name(model)
+    return table(index_name, column("rowid")), literal_column(index_name).op("MATCH")(to_match_query(query))
+
+
+def build_match_probe(model: Type[SQLModel], query: str, limit: int = RANKED_MATCHES + 1) -> Select:
+    """The SELECT of the rowids of the first limit matches of query, read from the index only."""
+    if not searchable_fields(model):
+        raise InvalidQueryError(f"{model.__name__} has no searchable fields")
+    index, match = _match(model, query)
+    return select(index.c.rowid).select_from(index).where(match).limit(limit)
+
+
+def build_search(model: Type[SQLModel], query: str, limit: int, columnar: bool = False, ranked: bool = True) -> Select:
+    """
+        The SELECT of the rows of model matching query, best matches first if ranked, else in table order.
+        columnar selects the columns of the model fields instead of the entity, for Core execution.
+
+        Raises:
+            InvalidQueryError: If the model has no searchable fields, the query is empty or limit is not positive.
+    """
+    if not searchable_fields(model):
+        raise InvalidQueryError(f"{model.__name__} has no searchable fields")
+    if limit < 1:
+        raise InvalidQueryError("Limit must be positive")
+    index, match = _match(model, query)
+    selected = [getattr(model, name) for name in model.model_fields] if columnar else [model]
+    statement = select(*selected).join_from(model, index, model.id == index.c.rowid).where(match)
+    if ranked:
+        statement = statement.order_by(literal_column(f"bm25({index.name})"))
+    return statement.limit(limit)
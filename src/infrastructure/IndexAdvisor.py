@@ -0,0 +1,102 @@
+import re
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Tuple, Type
+from sqlalchemy import Column, Connection, Select, Tuple as TupleClause
+from sqlalchemy.sql import operators, visitors
+from sqlalchemy.sql.elements import BinaryExpression
+from sqlmodel import SQLModel
+from src.infrastructure.Indexes import index_name
+
+"""
+Missing-index advisor, on SQLite EXPLAIN QUERY PLAN.
+
+advise explains a SELECT built for a model and reports the steps reading the whole table ("SCAN
+<table>") or sorting all the matching rows ("USE TEMP B-TREE FOR ORDER BY"). It suggests the index
+SQLite would use instead, read from the statement itself: the columns compared for equality
+first, then the sort columns (given by the caller, from the QuerySpec or page the statement was
+built from), or the first range-filtered column when there is no sort. Add the
+suggestion to the __indexes__ of the model (see Indexes) and install_indexes creates it.
+"""
+
+_FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?\w+(?: AS \w+)?$")
+_TEMP_SORT = "USE TEMP B-TREE FOR ORDER BY"
+_EQUALITY = (operators.eq, operators.in_op, operators.is_)
+_RANGE = (operators.lt, operators.le, operators.gt, operators.ge, operators.between_op)
+
+
+@dataclass(frozen=True)
+class IndexAdvice:
+    """The plan of a statement, its full-table steps and the index that would avoid them."""
+
+    statement: str
+    plan: Tuple[str, ...]
+    full_scans: Tuple[str, ...]
+    columns: Tuple[str, ...]
+    create_statement: Optional[str]
+
+    @property
+    def needs_index(self) -> bool:
+        return bool(self.full_scans and self.create_statement)
+
+
+def _bindable(value: Any) -> Any:
+    # The plan does not depend on the exact values, text is enough for the types sqlite3 cannot bind
+    return value if value is None or isinstance(value, (int, float, str, bytes)) else str(value)
+
+
+def explain_query_plan(connection: Connection, statement: Select) -> Tuple[str, ...]:
+    """The steps of the SQLite query plan of statement, one line per step, indented by depth."""
+    compiled = statement.compile(dialect=connection.dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.construct_params()
+    parameters = tuple(_bindable(params[name]) for name in compiled.positiontup or ())
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", parameters).all()
+    depths = {0: -1}
+    lines = []
+    for step_id, parent, _, detail in rows:
+        depths[step_id] = depths.get(parent, -1) + 1
+        lines.append(f"{'  ' * depths[step_id]}{detail}")
+    return tuple(lines)
+
+
+def _table_columns(model: Type[SQLModel], element: Any) -> List[str]:
+    if isinstance(element, TupleClause):
+        return [name for clause in element.clauses for name in _table_columns(model, clause)]
+    if isinstance(element, Column) and element.table is model.__table__:
+        return [element.name]
+    return []
+
+
+def suggest_index(model: Type[SQLModel], statement: Select, order_by: Sequence[str] = ()) -> Tuple[str, ...]:
+    """
+        The columns of the index serving the filters of statement on model and its sort, the order_by
+        fields of the QuerySpec or page it was built from; empty if no index would serve them.
+    """
+    equality, ranges = [], []
+    if statement.whereclause is not None:
+        for clause in visitors.iterate(statement.whereclause):
+            if not isinstance(clause, BinaryExpression):
+                continue
+            if clause.operator in _EQUALITY and isinstance(clause.left, Column):
+                equality += _table_columns(model, clause.left)
+            elif clause.operator in _RANGE:
+                ranges += _table_columns(model, clause.left)
+    columns = list(dict.fromkeys(equality + (list(order_by) or ranges[:1])))
+    # Every index ends with the primary key, the rowid of the table
+    primary_key = {column.name for column in model.__table__.primary_key}
+    while columns and columns[-1] in primary_key:
+        columns.pop()
+    return tuple(columns)
+
+
+def advise(connection: Connection, model: Type[SQLModel], statement: Select, order_by: Sequence[str] = ()) -> IndexAdvice:
+    """
+        Explain statement and suggest an index of model if its plan reads the whole table or sorts all
+        the rows. order_by are the sort fields of the statement, see suggest_index.
+    """
+    plan = explain_query_plan(connection, statement)
+    full_scans = tuple(line.strip() for line in plan if _FULL_SCAN.match(line.strip()) or line.strip() == _TEMP_SORT)
+    columns = suggest_index(model, statement, order_by)
+    create_statement = None
+    if full_scans and columns:
+        create_statement = f"CREATE INDEX {index_name(model, columns)} ON {model.__table__.name} ({', '.join(columns)})"
+    return IndexAdvice(str(statement.compile(dialect=connection.dialect)), plan, full_scans, columns, create_statement)
@@ -0,0 +1,78 @@
+import logging
+from typing import List, Optional, Sequence, Type
+from sqlalchemy import Engine, Index, inspect
+from sqlmodel import SQLModel
+from src.infrastructure.Exceptions.RepositoryExceptions import InvalidQueryError
+from src.infrastructure.ModelRegistry import imported_table_models
+
+"""
+Secondary indexes declared on the models.
+
+SQLModel.metadata.create_all only creates the indexes of the tables it creates, so an index added
+to a model later never reaches an existing database. A model lists the fields it is filtered and
+sorted by, one entry per index, a tuple for a composite index:
+
+    class Order(SQLModel, table=True):
+        __indexes__ = ("created_at", ("customer_id", "status"))
+        ...
+
+install_indexes runs at startup: it creates the declared indexes (and those of Field(index=True))
+that are missing and recreates the ones whose columns changed. The primary key needs no index, and
+every index already ends with it, so ("status", "id") is the same index as ("status",).
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def index_name(model: Type[SQLModel], columns: Sequence[str]) -> str:
+    return f"ix_{model.__table__.name}_{'_'.join(columns)}"
+
+
+def declared_indexes(model: Type[SQLModel]) -> List[Index]:
+    """
+        The indexes declared in __indexes__, attached to the table of model so that create_all creates
+        them with new tables. Calling it again returns the same indexes.
+        Raises InvalidQueryError for fields that are not fields of the model.
+    """
+    table = model.__table__
+    existing = {index.name: index for index in table.indexes}
+    indexes = []
+    for entry in getattr(model, "__indexes__", ()):
+        columns = (entry,) if isinstance(entry, str) else tuple(entry)
+        unknown = [name for name in columns if name not in model.model_fields]
+        if not columns or unknown:
+            raise InvalidQueryError(f"Invalid index {columns} for {model.__name__}, unknown fields {unknown}")
+        name = index_name(model, columns)
+        # Index() adds itself to the table of its columns
+        indexes.append(existing.get(name) or Index(name, *(table.c[column] for column in columns)))
+    return indexes
+
+
+def install_indexes(engine: Engine, models: Optional[Sequence[Type[SQLModel]]] = None) -> List[str]:
+    """
+        Create the missing indexes of models (all imported table models by default), returning their names.
+        An index whose columns differ from its declaration is dropped and created again.
+    """
+    created = []
+    with engine.begin() as connection:
+        inspector = inspect(connection)
+        for model in models if models is not None else imported_table_models():
+            declared_indexes(model)
+            table = model.__table__
+            if not inspector.has_table(table.name):
+                continue
+            existing = {index["name"]: tuple(index["column_names"]) for index in inspector.get_indexes(table.name)}
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                columns = tuple(column.name for column in index.columns)
+                if existing.get(index.name) == columns:
+                    continue
+                if index.name in existing:
+                    logger.warning("Index %s is on %s instead of %s, recreating it", index.name, existing[index.name], columns)
+                    index.drop(connection)
+                logger.info("Creating index %s on %s%s", index.name, table.name, columns)
+                index.create(connection)
+                created.append(index.name)
+        if created and engine.dialect.name == "sqlite":
+            # Refresh the statistics the query planner uses to pick between the indexes
+            connection.exec_driver_sql("PRAGMA optimize")
+    return created
@@ -0,0 +1,84 @@
+import logging
+import re
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.infrastructure.Metrics import MetricsRegistry, SlowQuery
+
+"""
+SQLAlchemy instrumentation.
+
+before/after_cursor_execute events time every statement sent to the database driver and record
+db_query_seconds{engine, operation, table}; statements slower than the threshold are counted in
+db_slow_queries_total, kept in the registry slow query log and logged as warnings. The wait for a
+pooled connection is recorded in db_pool_checkout_seconds{engine}.
+"""
+
+logger = logging.getLogger(__name__)
+
+_OPERATION = re.compile(r"\s*(\w+)")
+_TABLE = re.compile(r"\b(?:FROM|INTO|UPDATE)\s+[\"`\[]?(\w+)", re.IGNORECASE)
+_SLOW_STATEMENT_LENGTH = 1000
+# Key of the start times in Connection.info, a stack because cursor executions can nest (executemany batches)
+_START_TIMES = "_instrumentation_start_times"
+
+
+def statement_labels(statement: str) -> tuple[str, str]:
+    """Operation (SELECT, INSERT, ...) and first table of a SQL statement."""
+    operation = _OPERATION.match(statement)
+    table = _TABLE.search(statement)
+    return (operation.group(1).upper() if operation else "UNKNOWN", table.group(1) if table else "")
+
+
+def instrument_engine(engine: Engine, registry: MetricsRegistry, name: str = "primary",
+                      slow_query_ms: float | None = None) -> Engine:
+    """
+        Record the statement latencies and pool checkout waits of engine in registry.
+        For an AsyncEngine pass engine.sync_engine. slow_query_ms None disables the slow query log.
+        Returns the engine, so the call can wrap create_engine.
+    """
+    slow_query_seconds = slow_query_ms / 1000 if slow_query_ms is not None else None
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(connection, cursor, statement, parameters, context, executemany):
+        connection.info.setdefault(_START_TIMES, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_timer(connection, cursor, statement, parameters, context, executemany):
+        start_times = connection.info.get(_START_TIMES)
+        if not start_times:
+            return
+        elapsed = time.perf_counter() - start_times.pop()
+        operation, table = statement_labels(statement)
+        registry.observe("db_query_seconds", elapsed, engine=name, operation=operation, table=table)
+        if slow_query_seconds is not None and elapsed >= slow_query_seconds:
+            registry.increment("db_slow_queries_total", engine=name)
+            registry.record_slow_query(SlowQuery(name, statement[:_SLOW_STATEMENT_LENGTH], elapsed, time.time()))
+            # Parameters are left out of the log, they may hold user data
+            logger.warning("Slow query on %s (%.1f ms): %s", name, elapsed * 1000, statement[:_SLOW_STATEMENT_LENGTH])
+
+    @event.listens_for(engine, "handle_error")
+    def discard_timer(exception_context):
+        # after_cursor_execute is not called for a failing statement
+        connection = exception_context.connection
+        if connection is not None and connection.info.get(_START_TIMES):
+            connection.info[_START_TIMES].pop()
+            registry.increment("db_query_errors_total", engine=name)
+
+    # The pool has no "before checkout" event, so its connect method is timed by a subclass of the pool
+    # class. Engine.dispose() and pool recreation build the new pool from the class of the old one,
+    # which keeps the timing.
+    pool_class = type(engine.pool)
+
+    class TimedPool(pool_class):
+        def connect(self):
+            start = time.perf_counter()
+            try:
+                return super().connect()
+            finally:
+                registry.observe("db_pool_checkout_seconds", time.perf_counter() - start, engine=name)
+
+    TimedPool.__name__ = TimedPool.__qualname__ = f"Timed{pool_class.__name__}"
+    engine.pool.__class__ = TimedPool
+    return engine
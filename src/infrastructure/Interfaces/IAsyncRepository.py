@@ -0,0 +1,78 @@
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, Generic, Iterable, Mapping, TypeVar, List, Optional
+from sqlmodel import SQLModel
+from src.infrastructure.Pagination import KeysetPage
+from src.infrastructure.QuerySpec import QuerySpec
+
+T = TypeVar("T", bound=SQLModel)
+ID = TypeVar("ID")
+
+
+class IAsyncRepository(ABC, Generic[T, ID]):
+    """
+        Asynchronous counterpart of IRepository: same operations, same arguments and same exceptions,
+        see IRepository for the documentation of each method.
+        Operations that do not share a session can be awaited concurrently (e.g. with asyncio.gather).
+    """
+
+    @abstractmethod
+    async def get_all(self) -> List[T]:
+        pass
+
+    @abstractmethod
+    async def get_page(self, skip: int = 0, limit: int = 10) -> List[T]:
+        pass
+
+    @abstractmethod
+    async def get_page_by_cursor(self, cursor: Optional[str] = None, limit: int = 10, order_by: Optional[str] = None,
+                                 descending: bool = False, spec: Optional[QuerySpec] = None) -> KeysetPage[T]:
+        pass
+
+    @abstractmethod
+    async def count(self, spec: Optional[QuerySpec] = None) -> int:
+        pass
+
+    @abstractmethod
+    async def query(self, spec: QuerySpec) -> List[T] | List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def iter_batches(self, spec: Optional[QuerySpec] = None, batch_size: Optional[int] = None) -> AsyncIterator[List[T]]:
+        """Asynchronous generator, iterate it with async for."""
+        pass
+
+    @abstractmethod
+    async def get_by_id(self, item_id: ID) -> Optional[T]:
+        pass
+
+    @abstractmethod
+    async def add(self, item: T) -> T:
+        pass
+
+    @abstractmethod
+    async def update(self, item: T) -> T:
+        pass
+
+    @abstractmethod
+    async def delete(self, item: T) -> None:
+        pass
+
+    @abstractmethod
+    async def update_by_id(self, item_id: ID, values: Mapping[str, Any], returning: bool = False) -> bool | Optional[T]:
+        pass
+
+    @abstractmethod
+    async def delete_by_id(self, item_id: ID, returning: bool = False) -> bool | Optional[T]:
+        pass
+
+    @abstractmethod
+    async def add_many(self, items: Iterable[T | Mapping[str, Any]], chunk_size: Optional[int] = None, return_ids: bool = False) -> int:
+        pass
+
+    @abstractmethod
+    async def update_many(self, items: Iterable[T | Mapping[str, Any]], chunk_size: Optional[int] = None) -> int:
+        pass
+
+    @abstractmethod
+    async def delete_many_by_ids(self, item_ids: Iterable[ID], chunk_size: Optional[int] = None) -> int:
+        pass
@@ -1,6 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, List, Optional
+from typing import Any, Dict, Generic, Iterable, Iterator, Mapping, Sequence, TypeVar, List, Optional
 from sqlmodel import SQLModel
+from src.infrastructure.Aggregation import Aggregate
+from src.infrastructure.Columnar import ColumnarData, RowFormat
+from src.infrastructure.DataVersion import ChangeSet
+from src.infrastructure.IndexAdvisor import IndexAdvice
+from src.infrastructure.Pagination import KeysetPage
+from src.infrastructure.QuerySpec import QuerySpec
 
 T = TypeVar("T", bound=SQLModel)
 ID = TypeVar("ID")
@@ -25,6 +31,247 @@ class IRepository(ABC, Generic[T, ID]):
         """
         pass
 
+    @abstractmethod
+    def get_page(self, skip: int = 0, limit: int = 10) -> List[T]:
+        """
+        Retrieve a page of items, letting the database apply the offset and limit.
+
+        Args:
+            skip (int): Number of items to skip.
+            limit (int): Maximum number of items to return.
+
+        Raises:
+            DatabaseConnectionError: If there is a database connection issue.
+            QueryExecutionError: If the query fails to execute.
+        """
+        pass
+
+    @abstractmethod
+    def get_page_by_cursor(self, cursor: Optional[str] = None, limit: int = 10, order_by: Optional[str] = None,
+                           descending: bool = False, spec: Optional[QuerySpec] = None) -> KeysetPage[T]:
+        """
+        Retrieve a page of items with keyset pagination, seeking from the position stored in the cursor.
+        Unlike get_page the cost does not depend on how deep the page is.
+
+        Args:
+            cursor (Optional[str]): A cursor from a previous KeysetPage, None for the first page.
+            limit (int): Maximum number of items to return.
+            order_by (Optional[str]): Field to sort by, ties are broken by the ID. Defaults to the ID.
+                The field should be indexed. NULLs sort first, or last when descending.
+            descending (bool): Sort in descending order.
+            spec (Optional[QuerySpec]): Only the filters of the spec are applied.
+
+        Raises:
+            InvalidQueryError: If order_by is not a field of the model.
+            InvalidCursorError: If the cursor is malformed or was produced for another sort field.
+            DatabaseConnectionError: If there is a database connection issue.
+            QueryExecutionError: If the query fails to execute.
+        """
+        pass
+
+    @abstractmethod
+    def data_version(self) -> Optional[int]:
+        """
+        The data version of the model (see DataVersion): a counter that grows with every write to its table,
+        read in constant time. None if the table is not versioned.
+
+        Raises:
+            DatabaseConnectionError: If there is a database connection issue.
+            QueryExecutionError: If the query fails to execute.
+        """
+        pass
+
+    @abstractmethod
+    def changes_since(self, token: int, limit: Optional[int] = None, row_format: Optional[RowFormat] = None) -> ChangeSet:
+        """
+        The items inserted, updated or deleted since a data version (see DataVersion), oldest change first.
+        Only for models declaring __change_log__; a token older than the compacted log gives an expired ChangeSet.
+
+        Args:
+            token (int): A data_version read before the copy being refreshed, or the token of the previous changes.
+            limit (Optional[int]): Maximum number of changes, the next ones are read from the returned token.
+            row_format (Optional[RowFormat]): Return the changed items in this format instead of model instances.
+
+        Raises:
+            DatabaseConnectionError: If there is a database connection issue.
+            InvalidQueryError: If the model does not declare __change_log__.
+            QueryExecutionError: If the query fails to execute, e.g. the change log is not installed.
+        """
+        pass
+
+    @abstractmethod
+    def count(self, spec: Optional[QuerySpec] = None) -> int:
+        """
+        Count the items in the repository without loading them.
+
+        Args:
+            spec (Optional[QuerySpec]): Only count the items matching the filters of the spec.
+
+        Raises:
+            InvalidQueryError: If the spec references unknown fields.
+            DatabaseConnectionError: If there is a database connection issue.
+            QueryExecutionError: If the query fails to execute.
+        """
+        pass
+
+    @abstractmethod
+    def query(self, spec: QuerySpec) -> List[T] | List[Dict[str, Any]]:
+        """
+        Retrieve the items matching a query specification, compiled into a single SELECT:
+        filtering, ordering, projection and slicing all happen in the database.
+
+        Args:
+            spec (QuerySpec): The filters, sort orders, columns and slice to retrieve.
+
+        Returns:
+            List[T] | List[Dict[str, Any]]: The items, or a dictionary per row when spec.columns is set.
+
+        Raises:
+            InvalidQueryError: If the spec references unknown fields.
+            DatabaseConnectionError: If there is a database connection issue.
+            QueryExecutionError: If the query fails to execute.
+        """
+        pass
+
+    @abstractmethod
+    def iter_batches(self, spec: Optional[QuerySpec] = None, batch_size: Optional[int] = None) -> Iterator[List[T]]:
+        """
+        Stream the items matching a query specification in batches, for full-table reads and exports.
+        Memory use is bounded by the batch size; the session stays open until the generator is exhausted or closed.
+
+        Args:
+            spec (Optional[QuerySpec]): The query to stream, all items ordered by ID by default.
+            batch_size (Optional[int]): Number of rows fetched and hydrated at a time. Defaults to the repository batch size.
+
+        Yields:
+            List[T]: A batch of items, or of dictionaries when spec.columns is set.
+
+        Raises:
+            InvalidQueryError: If the spec references unknown fields.
+            DatabaseConnectionError: If there is a database connection issue.
+            QueryExecutionError: If the query fails to execute.
+        """
+        pass
+
+    @abstractmethod
+    def iter_all(self, spec: Optional[QuerySpec] = None, batch_size: Optional[int] = None) -> Iterator[T]:
+        """
+        Stream the items matching a query specification one by one, fetching them in batches (see iter_batches).
+
+        Raises:
+            InvalidQueryError: If the spec references unknown fields.
+            DatabaseConnectionError: If there is a database connection issue.
+            QueryExecutionError: If the query fails to execute.
+        """
+        pass
+
+    @abstractmethod
+    def get_columns_by_cursor(self, cursor: Optional[str] = None, limit: int = 10, order_by: Optional[str] = None,
+                              descending: bool = False, spec: Optional[QuerySpec] = None,
+                              row_format: RowFormat = RowFormat.TUPLES) -> KeysetPage[Any]:
+        """
+        Read-only variant of get_page_by_cursor: the items of the page are the column values of the model fields,
+        assembled in row_format from the Core result, without building model instances.
+
+        Returns:
+            KeysetPage[Any]: A page whose items are a list of tuples, a DataFrame or an Arrow Table.
+
+        Raises:
+            InvalidQueryError: If order_by is not a field of the model.
+            InvalidCursorError: If the cursor is malformed or was produced for another sort field.
+            DatabaseConnectionError: If there is a database connection issue.
+            QueryExecutionError: If the query fails to execute.
+        """
+        pass
+
+    @abstractmethod
+    def query_columns(self, spec: Optional[QuerySpec] = None, row_format: RowFormat = RowFormat.TUPLES) -> ColumnarData:
+        """
+        Read-only variant of query: the rows are assembled in row_format from the Core result,
+        without building model instances or validating the values again.
+
+        Args:
+            spec (Optional[QuerySpec]): The query to run; spec.columns selects the columns, all the model fields by default.
+            row_format (RowFormat): A list of tuples, a pandas DataFrame or a pyarrow Table.
+
+        Raises:
+            InvalidQueryError: If the spec references unknown fields.
+            DatabaseConnectionError: If there is a database connection issue.
+            QueryExecutionError: If the query fails to execute.
+        """
+        pass
+
+    @abstractmethod
+    def iter_column_batches(self, spec: Optional[QuerySpec] = None, batch_size: Optional[int] = None,
+                            row_format: RowFormat = RowFormat.TUPLES) -> Iterator[ColumnarData]:
+        """
+        Read-only variant of iter_batches: the result is streamed with fetchmany and each batch is
+        assembled in row_format, without building model instances.
+
+        Raises:
+            InvalidQueryError: If the spec references unknown fields.
+            DatabaseConnectionError: If there is a database connection issue.
+            QueryExecutionError: If the query fails to execute.
+        """
+        pass
+
+    @abstractmethod
+    def aggregate(self, aggregates: Sequence[Aggregate], group_by: Sequence[str] = (), spec: Optional[QuerySpec] = None,
+                  limit: Optional[int] = None, row_format: RowFormat = RowFormat.TUPLES) -> ColumnarData:
+        """
+        Compute aggregates in the database (see Aggregation), one row per group.
+
+        Args:
+            aggregates (Sequence[Aggregate]): The functions and their fields, e.g. Aggregate("avg", "value").
+            group_by (Sequence[str]): Fields to group by, none for a single row over all the matching items.
+            spec (Optional[QuerySpec]): Only aggregate the items matching its filters.
+            limit (Optional[int]): Maximum number of groups, in the order of the group_by fields.
+            row_format (RowFormat): Format of the result, the group_by fields then the aggregate labels.
+
+        Raises:
+            InvalidQueryError: For unknown fields, SUM or AVG of a non numeric field or no aggregates.
+            DatabaseConnectionError: If there is a database connection issue.
+            QueryExecutionError: If the query fails to execute.
+        """
+        pass
+
+    @abstractmethod
+    def search(self, query: str, limit: int = 20, row_format: Optional[RowFormat] = None) -> List[T] | ColumnarData:
+        """
+        Full-text search over the searchable fields of the model (see FullTextSearch), best matches first.
+        Every word of the query must match the start of a word of the item.
+
+        Args:
+            query (str): The words to look for.
+            limit (int): Maximum number of items to return.
+            row_format (Optional[RowFormat]): Return the rows in this format instead of model instances.
+
+        Raises:
+            InvalidQueryError: If the model has no searchable fields or the query has no words.
+            DatabaseConnectionError: If there is a database connection issue.
+            QueryExecutionError: If the query fails to execute, e.g. the full-text index is missing.
+        """
+        pass
+
+    @abstractmethod
+    def explain(self, spec: Optional[QuerySpec] = None, order_by: Optional[str] = None,
+                descending: bool = False) -> List[IndexAdvice]:
+        """
+        Explain the reads of a paged, filtered and sorted view (see IndexAdvisor): the keyset page,
+        the count and, with a spec, the full query used by exports.
+
+        Args:
+            spec (Optional[QuerySpec]): The filters, and the sort of the full query.
+            order_by (Optional[str]): Field the pages are sorted by, the ID by default.
+            descending (bool): Sort the pages in descending order.
+
+        Raises:
+            InvalidQueryError: If order_by or the filters reference unknown fields.
+            DatabaseConnectionError: If there is a database connection issue.
+            QueryExecutionError: If the plan cannot be read, e.g. the database is not SQLite.
+        """
+        pass
+
     @abstractmethod
     def get_by_id(self, item_id: ID) -> Optional[T]:
         """
@@ -41,12 +288,12 @@ class IRepository(ABC, Generic[T, ID]):
         pass
 
     @abstractmethod
-    def add(self, item: list[T]) -> T:
+    def add(self, item: T) -> T:
         """
-        Add new items to the repository.
+        Add a new item to the repository. Use add_many to insert several items.
 
         Args:
-            item (list(T)): The items to add.
+            item (T): The item to add.
 
         Raises:
             DatabaseConnectionError: If there is a database connection issue.
@@ -83,4 +330,108 @@ class IRepository(ABC, Generic[T, ID]):
             QueryExecutionError: If the query fails to execute.
             CommitError: If the commit operation fails.
         """
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def update_by_id(self, item_id: ID, values: Mapping[str, Any], returning: bool = False) -> bool | Optional[T]:
+        """
+        Update the given fields of an item with a single UPDATE statement, without loading it first.
+
+        Args:
+            item_id (ID): The ID of the item to update.
+            values (Mapping[str, Any]): The fields to update and their new values.
+                When empty, no statement is run and the item is read as it is.
+            returning (bool): Return the updated item, read back with RETURNING in the same statement.
+
+        Returns:
+            bool | Optional[T]: The updated item, or None if not found, when returning is True.
+                Otherwise whether an item was updated.
+
+        Raises:
+            InvalidQueryError: If values contain unknown fields.
+            DatabaseConnectionError: If there is a database connection issue.
+            QueryExecutionError: If the query fails to execute.
+            CommitError: If the commit operation fails.
+        """
+        pass
+
+    @abstractmethod
+    def delete_by_id(self, item_id: ID, returning: bool = False) -> bool | Optional[T]:
+        """
+        Delete an item with a single DELETE statement, without loading it first.
+
+        Args:
+            item_id (ID): The ID of the item to delete.
+            returning (bool): Return the deleted item, read back with RETURNING in the same statement.
+
+        Returns:
+            bool | Optional[T]: The deleted item, or None if not found, when returning is True.
+                Otherwise whether an item was deleted.
+
+        Raises:
+            DatabaseConnectionError: If there is a database connection issue.
+            QueryExecutionError: If the query fails to execute.
+            CommitError: If the commit operation fails.
+        """
+        pass
+
+    @abstractmethod
+    def add_many(self, items: Iterable[T | Mapping[str, Any]], chunk_size: Optional[int] = None, return_ids: bool = False) -> int:
+        """
+        Insert many items with multi-row INSERT statements, committing once per chunk.
+        Chunks committed before a failure stay committed.
+
+        Args:
+            items (Iterable[T | Mapping[str, Any]]): The items, or their column values, to insert. May be a generator.
+                Fields missing from a mapping take their default.
+            chunk_size (Optional[int]): Number of rows per statement and transaction. Defaults to the repository batch size.
+            return_ids (bool): Fetch the generated IDs with RETURNING and set them on the given model instances.
+
+        Returns:
+            int: The number of inserted rows.
+
+        Raises:
+            DatabaseConnectionError: If there is a database connection issue.
+            QueryExecutionError: If the query fails to execute.
+            CommitError: If the commit operation fails.
+        """
+        pass
+
+    @abstractmethod
+    def update_many(self, items: Iterable[T | Mapping[str, Any]], chunk_size: Optional[int] = None) -> int:
+        """
+        Update many items by ID with executemany UPDATE statements, committing once per chunk.
+        Only the columns present in each item are updated, so mappings allow partial updates.
+
+        Args:
+            items (Iterable[T | Mapping[str, Any]]): The items, or their column values including the ID, to update.
+            chunk_size (Optional[int]): Number of rows per transaction. Defaults to the repository batch size.
+
+        Returns:
+            int: The number of items sent to the database.
+
+        Raises:
+            DatabaseConnectionError: If there is a database connection issue.
+            QueryExecutionError: If the query fails to execute.
+            CommitError: If the commit operation fails.
+        """
+        pass
+
+    @abstractmethod
+    def delete_many_by_ids(self, item_ids: Iterable[ID], chunk_size: Optional[int] = None) -> int:
+        """
+        Delete many items with DELETE ... WHERE id IN (...) statements, committing once per chunk.
+
+        Args:
+            item_ids (Iterable[ID]): The IDs of the items to delete.
+            chunk_size (Optional[int]): Number of IDs per statement and transaction. Defaults to the repository batch size.
+
+        Returns:
+            int: The number of deleted rows.
+
+        Raises:
+            DatabaseConnectionError: If there is a database connection issue.
+            QueryExecutionError: If the query fails to execute.
+            CommitError: If the commit operation fails.
+        """
+        pass
@@ -0,0 +1,179 @@
+import bisect
+import json
+import math
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+"""
+In-process metrics: counters, fixed-bucket histograms and a log of the latest slow queries.
+
+Recording is a dictionary lookup and a bisect under a lock, cheap enough for the query hot path.
+The registry is exported as Prometheus text (to_prometheus) or JSON (to_json).
+"""
+
+# Seconds, from half a millisecond to ten seconds
+LATENCY_BUCKETS: Tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Number of rows
+ROW_BUCKETS: Tuple[float, ...] = (0, 1, 10, 100, 1000, 10000, 100000)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+@dataclass(frozen=True)
+class SlowQuery:
+    """A statement that ran longer than the slow query threshold."""
+
+    engine: str
+    statement: str
+    seconds: float
+    timestamp: float
+
+
+class Histogram:
+    """Cumulative-bucket histogram, as in the Prometheus exposition format."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.bounds: Tuple[float, ...] = tuple(sorted(buckets))
+        # One counter per bound plus the +Inf bucket, not cumulative until exported
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        total, result = 0, []
+        for bound, count in zip(self.bounds + (math.inf,), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by linear interpolation inside its bucket, None if empty."""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        lower, seen = 0.0, 0
+        for bound, count in zip(self.bounds, self.counts):
+            if count and seen + count >= rank:
+                return lower + (bound - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        # Only the +Inf bucket is left, report the largest finite bound
+        return self.bounds[-1] if self.bounds else None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": [["+Inf" if math.isinf(bound) else bound, count] for bound, count in self.cumulative()],
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe store of the counters, histograms and slow queries of the process."""
+
+    def __init__(self, slow_query_log_size: int = 100):
+        if slow_query_log_size < 1:
+            raise ValueError("Slow query log size must be positive")
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._slow_queries: Deque[SlowQuery] = deque(maxlen=slow_query_log_size)
+
+    @staticmethod
+    def _labels(labels: Dict[str, Any]) -> Labels:
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    def increment(self, name: str, amount: float = 1, **labels: Any) -> None:
+        """Add amount to the counter name{labels}."""
+        key = self._labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, buckets: Sequence[float] = LATENCY_BUCKETS, **labels: Any) -> None:
+        """Record value in the histogram name{labels}. The buckets of a histogram are fixed by its first observation."""
+        key = self._labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def record_slow_query(self, slow_query: SlowQuery) -> None:
+        with self._lock:
+            self._slow_queries.append(slow_query)
+
+    def counters(self) -> Dict[str, Dict[Labels, float]]:
+        with self._lock:
+            return {name: dict(series) for name, series in self._counters.items()}
+
+    def histograms(self) -> Dict[str, Dict[Labels, Dict[str, Any]]]:
+        """Summary (count, sum, mean, estimated quantiles and buckets) of every histogram series."""
+        with self._lock:
+            return {name: {labels: histogram.summary() for labels, histogram in series.items()}
+                    for name, series in self._histograms.items()}
+
+    def slow_queries(self) -> List[SlowQuery]:
+        """The latest slow queries, oldest first."""
+        with self._lock:
+            return list(self._slow_queries)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._slow_queries.clear()
+
+    def to_json(self) -> str:
+        """Export every metric and the slow query log as a JSON document."""
+        def series_list(series):
+            return [{"labels": dict(labels), "value": value} for labels, value in series.items()]
+        return json.dumps({
+            "counters": {name: series_list(series) for name, series in self.counters().items()},
+            "histograms": {name: series_list(series) for name, series in self.histograms().items()},
+            "slow_queries": [slow_query.__dict__ for slow_query in self.slow_queries()],
+        }, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Export counters and histograms in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for name, series in sorted(self.counters().items()):
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in series.items():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for name, series in sorted(self.histograms().items()):
+            lines.append(f"# TYPE {name} histogram")
+            for labels, summary in series.items():
+                for bound, count in summary["buckets"]:
+                    bucket_labels = labels + (("le", bound if bound == "+Inf" else _format_value(bound)),)
+                    lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(summary['sum'])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {summary['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
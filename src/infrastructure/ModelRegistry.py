@@ -0,0 +1,81 @@
+import importlib
+import pkgutil
+import threading
+from typing import Dict, List, Optional, Sequence, Type
+from sqlmodel import SQLModel
+
+"""
+Discovery of the table models of the application.
+
+The models are found by importing the modules of the model packages (src.model by default) and
+keeping the SQLModel classes declared with table=True. Discovery runs once per registry; what is
+built from the models (services, pages) is left to the callers, which should build it lazily.
+"""
+
+
+def imported_table_models() -> List[Type[SQLModel]]:
+    """The table models imported so far, from any package: those SQLModel.metadata.create_all creates."""
+    models, pending = [], list(SQLModel.__subclasses__())
+    while pending:
+        model = pending.pop()
+        pending.extend(model.__subclasses__())
+        if getattr(model, "__table__", None) is not None:
+            models.append(model)
+    return models
+
+
+def discover_models(package: str) -> Dict[str, Type[SQLModel]]:
+    """
+        The table models declared in package and its subpackages, by class name.
+        Models imported from elsewhere are ignored, so re-exports are not found twice.
+
+        Raises:
+            ValueError: If two models have the same class name.
+    """
+    root = importlib.import_module(package)
+    modules = [root]
+    if hasattr(root, "__path__"):
+        modules += [importlib.import_module(module_info.name)
+                    for module_info in pkgutil.walk_packages(root.__path__, f"{root.__name__}.")]
+    models: Dict[str, Type[SQLModel]] = {}
+    for module in modules:
+        for candidate in vars(module).values():
+            if (isinstance(candidate, type) and issubclass(candidate, SQLModel) and candidate.__module__ == module.__name__
+                    and getattr(candidate, "__table__", None) is not None):
+                if models.get(candidate.__name__, candidate) is not candidate:
+                    raise ValueError(f"Duplicate model name {candidate.__name__} in {package}")
+                models[candidate.__name__] = candidate
+    return models
+
+
+class ModelRegistry:
+    """The table models of the configured packages, discovered on first use."""
+
+    def __init__(self, packages: Optional[Sequence[str]] = None):
+        self._packages = list(packages or ["src.model"])
+        self._models: Optional[Dict[str, Type[SQLModel]]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def models(self) -> Dict[str, Type[SQLModel]]:
+        if self._models is None:
+            with self._lock:
+                if self._models is None:
+                    models: Dict[str, Type[SQLModel]] = {}
+                    for package in self._packages:
+                        for name, model in discover_models(package).items():
+                            if models.get(name, model) is not model:
+                                raise ValueError(f"Duplicate model name {name} in {', '.join(self._packages)}")
+                            models[name] = model
+                    self._models = models
+        return self._models
+
+    def names(self) -> List[str]:
+        return list(self.models)
+
+    def get(self, name: str) -> Type[SQLModel]:
+        """The model called name. Raises ValueError if there is no such model."""
+        try:
+            return self.models[name]
+        except KeyError:
+            raise ValueError(f"Unknown table model: {name}") from None
@@ -0,0 +1,54 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from typing import Any, Generic, List, Optional, Tuple, TypeVar
+
+from src.infrastructure.Exceptions.RepositoryExceptions import InvalidCursorError
+
+"""
+Keyset (cursor based) pagination helpers.
+
+A cursor remembers the sort key of the row a page starts or ends at, so the next page
+is a range seek on an index instead of an OFFSET that has to walk all the skipped rows.
+Cursors are opaque to callers: they are only meant to be handed back to the repository.
+"""
+
+T = TypeVar("T")
+
+NEXT = "next"
+PREVIOUS = "prev"
+
+
+@dataclass(frozen=True)
+class KeysetPage(Generic[T]):
+    """
+        A page of items together with the cursors to reach the adjacent pages.
+        A cursor is None when there is no page in that direction.
+    """
+
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
+
+
+def encode_cursor(order_by: str, sort_value: Any, item_id: Any, direction: str) -> str:
+    """Encode the position of a row into an opaque, url safe cursor."""
+    payload = json.dumps([order_by, sort_value, item_id, direction], default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, Any, Any, str]:
+    """
+        Decode a cursor produced by encode_cursor.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed.
+    """
+    try:
+        order_by, sort_value, item_id, direction = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError, UnicodeError, binascii.Error) as e:
+        raise InvalidCursorError(f"Malformed cursor: {cursor!r}") from e
+    if direction not in (NEXT, PREVIOUS):
+        raise InvalidCursorError(f"Malformed cursor direction: {direction!r}")
+    return order_by, sort_value, item_id, direction
@@ -0,0 +1,140 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, List, Optional, Tuple, Type
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import SQLModel
+
+from src.infrastructure.Exceptions.RepositoryExceptions import InvalidQueryError
+
+"""
+Declarative query specification.
+
+A QuerySpec describes which rows (filters), in which order (order_by), which columns and which
+slice (skip/limit) a caller wants. Repositories compile it into a single SELECT, so filtering,
+sorting and projection run in the database. Specs are immutable and hashable, which makes them
+usable as cache keys.
+"""
+
+
+class FilterOperator(str, Enum):
+    EQ = "eq"
+    NE = "ne"
+    LT = "lt"
+    LE = "le"
+    GT = "gt"
+    GE = "ge"
+    BETWEEN = "between"  # value is a (low, high) pair, both included
+    IN = "in"            # value is a sequence
+    LIKE = "like"        # value is a SQL LIKE pattern, e.g. "%term%"
+
+
+@dataclass(frozen=True)
+class FieldFilter:
+    """A predicate on a single field."""
+
+    field: str
+    operator: FilterOperator
+    value: Any
+
+    def __post_init__(self):
+        object.__setattr__(self, "operator", FilterOperator(self.operator))
+        if self.operator in (FilterOperator.IN, FilterOperator.BETWEEN):
+            if isinstance(self.value, (str, bytes)) or not hasattr(self.value, "__iter__"):
+                raise InvalidQueryError(f"Operator {self.operator.value} on {self.field} needs a sequence of values")
+            object.__setattr__(self, "value", tuple(self.value))
+            if self.operator == FilterOperator.BETWEEN and len(self.value) != 2:
+                raise InvalidQueryError(f"Operator between on {self.field} needs exactly two values")
+
+
+@dataclass(frozen=True)
+class SortOrder:
+    """Sort by a field, ascending unless descending is set."""
+
+    field: str
+    descending: bool = False
+
+
+@dataclass(frozen=True)
+class QuerySpec:
+    """Filters are combined with AND. Rows are always ordered by ID last, so pages are stable."""
+
+    filters: Tuple[FieldFilter, ...] = ()
+    order_by: Tuple[SortOrder, ...] = ()
+    columns: Optional[Tuple[str, ...]] = None
+    skip: int = 0
+    limit: Optional[int] = None
+
+    def __post_init__(self):
+        object.__setattr__(self, "filters", tuple(self.filters))
+        object.__setattr__(self, "order_by", tuple(self.order_by))
+        if self.columns is not None:
+            object.__setattr__(self, "columns", tuple(self.columns))
+        if self.skip < 0:
+            raise InvalidQueryError("Skip cannot be negative")
+        if self.limit is not None and self.limit < 1:
+            raise InvalidQueryError("Limit must be positive")
+
+
+def get_column(model: Type[SQLModel], field: str) -> ColumnElement:
+    """Return the column of a model field. Raises InvalidQueryError for unknown fields."""
+    if field not in model.model_fields:
+        raise InvalidQueryError(f"Unknown field {field} for {model.__name__}")
+    return getattr(model, field)
+
+
+def parse_filter(model: Type[SQLModel], field: str, operator: FilterOperator | str, raw_value: str) -> FieldFilter:
+    """
+        Build a filter from text typed by a user, converting the value to the type of the field.
+        'in' and 'between' take comma separated values, 'like' a pattern used as is.
+        Raises InvalidQueryError for unknown fields or values that do not convert.
+    """
+    get_column(model, field)
+    operator = FilterOperator(operator)
+    if operator == FilterOperator.LIKE:
+        return FieldFilter(field, operator, raw_value)
+    adapter = TypeAdapter(model.model_fields[field].annotation)
+    try:
+        if operator in (FilterOperator.IN, FilterOperator.BETWEEN):
+            return FieldFilter(field, operator, [adapter.validate_python(part.strip()) for part in raw_value.split(",")])
+        return FieldFilter(field, operator, adapter.validate_python(raw_value))
+    except ValidationError as e:
+        raise InvalidQueryError(f"Invalid value for {field}: {e.errors()[0]['msg']}") from e
+
+
+def build_where(model: Type[SQLModel], filters: Tuple[FieldFilter, ...]) -> List[ColumnElement]:
+    """Compile the filters of a spec into WHERE clauses."""
+    clauses = []
+    for field_filter in filters:
+        column = get_column(model, field_filter.field)
+        operator, value = field_filter.operator, field_filter.value
+        if operator == FilterOperator.EQ:
+            clauses.append(column.is_(None) if value is None else column == value)
+        elif operator == FilterOperator.NE:
+            clauses.append(column.is_not(None) if value is None else column != value)
+        elif operator == FilterOperator.LT:
+            clauses.append(column < value)
+        elif operator == FilterOperator.LE:
+            clauses.append(column <= value)
+        elif operator == FilterOperator.GT:
+            clauses.append(column > value)
+        elif operator == FilterOperator.GE:
+            clauses.append(column >= value)
+        elif operator == FilterOperator.BETWEEN:
+            clauses.append(column.between(*value))
+        elif operator == FilterOperator.IN:
+            clauses.append(column.in_(value))
+        elif operator == FilterOperator.LIKE:
+            clauses.append(column.like(value))
+    return clauses
+
+
+def build_order_by(model: Type[SQLModel], order_by: Tuple[SortOrder, ...]) -> List[ColumnElement]:
+    """Compile the sort orders of a spec, with the ID as final tie breaker."""
+    clauses = []
+    for sort_order in order_by:
+        column = get_column(model, sort_order.field)
+        clauses.append(column.desc() if sort_order.descending else column.asc())
+    if "id" not in (sort_order.field for sort_order in order_by):
+        clauses.append(model.id.asc())
+    return clauses
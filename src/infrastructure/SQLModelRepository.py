@@ -1,24 +1,75 @@
-from typing import Generic, TypeVar, List, Optional, Type
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import Any, Dict, Generic, Iterable, Iterator, Mapping, Sequence, TypeVar, List, Optional, Type
 from sqlmodel import SQLModel, Session, select
+from sqlalchemy import delete, insert, update
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
 from src.containers.RepositoryContainer import RepositoryContainer
 from src.infrastructure.Interfaces.IRepository import IRepository
+from src.infrastructure.SessionManager import SessionManager
+from src.infrastructure.QuerySpec import QuerySpec
+from src.infrastructure.Pagination import KeysetPage
+from src.infrastructure.Statements import KeysetQuery, build_column_select, build_count, build_select, chunked, column_names, group_by_columns, to_row
+from src.infrastructure.Columnar import ColumnarData, RowFormat, assemble
+from src.infrastructure.Aggregation import Aggregate, build_aggregate_select, result_annotation
+from src.infrastructure.DataVersion import ChangeSet, build_changes_select, build_horizon_select, build_version_select, has_change_log, split_changes
+from src.infrastructure.IndexAdvisor import IndexAdvice, advise
+from src.infrastructure.FullTextSearch import RANKED_MATCHES, build_match_probe, build_search
 from dependency_injector.wiring import Provide, inject
 from src.infrastructure.Exceptions.RepositoryExceptions import (
     DatabaseConnectionError,
     QueryExecutionError,
-    CommitError
+    CommitError,
+    InvalidQueryError
 )
 
 T = TypeVar("T", bound=SQLModel)
 
+
 class SQLModelRepository(IRepository[T, int], Generic[T]):
     
     # Here we should put a dependency injector.
     @inject
-    def __init__(self, model: Type[T], session: Session = Provide[RepositoryContainer.sqllite_session] ):
+    def __init__(self, model: Type[T], session: Optional[Session] = None,
+                 session_manager: SessionManager = Provide[RepositoryContainer.sqllite_session_manager],
+                 batch_size: int = 1000):
+        """
+            Operations get a short-lived Session from the session manager (or the Session bound to the current scope).
+            Passing an explicit session pins the repository to it, which is only meant for tests and scripts.
+            batch_size is the default number of rows per statement and transaction of the bulk operations.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be positive")
         self.model = model
         self.session = session
+        self._session_manager = session_manager
+        self.batch_size = batch_size
+
+    @contextmanager
+    def _session(self) -> Iterator[Session]:
+        if self.session is not None:
+            yield self.session
+            return
+        with self._session_manager.session() as session:
+            yield session
+
+    @contextmanager
+    def _read_session(self) -> Iterator[Session]:
+        # Reads may run on a read replica, see SessionManager.read_session
+        if self.session is not None:
+            yield self.session
+            return
+        with self._session_manager.read_session() as session:
+            yield session
+
+    @contextmanager
+    def _primary_read_session(self) -> Iterator[Session]:
+        # Reads of the primary that do not count as writes of the scope, see SessionManager.primary_read_session
+        if self.session is not None:
+            yield self.session
+            return
+        with self._session_manager.primary_read_session() as session:
+            yield session
 
     def get_all(self) -> List[T]:
         try:
@@ -28,95 +79,520 @@ class SQLModelRepository(IRepository[T, int], Generic[T]):
         except SQLAlchemyError as e:
             raise QueryExecutionError(f"Query preparation error in get_all for {self.model.__name__}: {str(e)}") from e
         
+        with self._read_session() as session:
+            try:
+                results = session.exec(statement)
+                return results.all()
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error executing get_all for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Query execution error in get_all for {self.model.__name__}: {str(e)}") from e
+
+    def get_page(self, skip: int = 0, limit: int = 10) -> List[T]:
         try:
-            results = self.session.exec(statement)
-            return results.all()
+            statement = select(self.model).order_by(self.model.id).offset(skip).limit(limit)
         except OperationalError as e:
-            raise DatabaseConnectionError(f"Database connection error executing get_all for {self.model.__name__}: {str(e)}") from e
+            raise DatabaseConnectionError(f"Database connection error in get_page for {self.model.__name__}: {str(e)}") from e
         except SQLAlchemyError as e:
-            raise QueryExecutionError(f"Query execution error in get_all for {self.model.__name__}: {str(e)}") from e
+            raise QueryExecutionError(f"Query preparation error in get_page for {self.model.__name__}: {str(e)}") from e
 
-    def get_by_id(self, item_id: int) -> Optional[T]:
+        with self._read_session() as session:
+            try:
+                results = session.exec(statement)
+                return results.all()
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error executing get_page for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Query execution error in get_page for {self.model.__name__}: {str(e)}") from e
+
+    def get_page_by_cursor(self, cursor: Optional[str] = None, limit: int = 10, order_by: Optional[str] = None,
+                           descending: bool = False, spec: Optional[QuerySpec] = None) -> KeysetPage[T]:
         try:
-            statement = select(self.model).where(self.model.id == item_id)
+            keyset_query = KeysetQuery.build(self.model, cursor, limit, order_by, descending, spec)
         except OperationalError as e:
-            raise DatabaseConnectionError(f"Database connection error in get_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+            raise DatabaseConnectionError(f"Database connection error in get_page_by_cursor for {self.model.__name__}: {str(e)}") from e
         except SQLAlchemyError as e:
-            raise QueryExecutionError(f"Query preparation error in get_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
-        
+            raise QueryExecutionError(f"Query preparation error in get_page_by_cursor for {self.model.__name__}: {str(e)}") from e
+
+        with self._read_session() as session:
+            try:
+                items = session.exec(keyset_query.statement).all()
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error executing get_page_by_cursor for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Query execution error in get_page_by_cursor for {self.model.__name__}: {str(e)}") from e
+        return keyset_query.to_page(items)
+
+    def data_version(self) -> Optional[int]:
+        statement = build_version_select(self.model)
+        # Read on the primary, where the writes happen: a replica only shows them once it has caught up
+        with self._primary_read_session() as session:
+            try:
+                return session.connection().execute(statement).scalar_one_or_none()
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error executing data_version for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Query execution error in data_version for {self.model.__name__}: {str(e)}") from e
+
+    def changes_since(self, token: int, limit: Optional[int] = None, row_format: Optional[RowFormat] = None) -> ChangeSet:
+        if not has_change_log(self.model):
+            raise InvalidQueryError(f"{self.model.__name__} does not keep a change log, see __change_log__")
+        statement = build_changes_select(self.model, token, limit)
+        # On the primary, like data_version: the tokens of the callers come from there
+        with self._primary_read_session() as session:
+            try:
+                # Horizon, log and rows are read in the same transaction, so they are consistent
+                horizon = session.connection().execute(build_horizon_select(self.model)).first()
+                if horizon is not None and token < horizon.compacted:
+                    # Deletions before the horizon were compacted away: the caller reads its copy again
+                    items = [] if row_format is None else assemble(self.model, list(self.model.model_fields), [], row_format)
+                    return ChangeSet(items, token=horizon.version, expired=True)
+                changed, deleted, next_token, has_more = split_changes(session.connection().execute(statement).all(), token, limit)
+                if row_format is None:
+                    items = [item for ids in chunked(changed, self.batch_size)
+                             for item in session.exec(select(self.model).where(self.model.id.in_(ids))).all()]
+                else:
+                    fields = [getattr(self.model, name) for name in self.model.model_fields]
+                    rows = [row for ids in chunked(changed, self.batch_size)
+                            for row in session.connection().execute(select(*fields).where(self.model.id.in_(ids))).all()]
+                    items = assemble(self.model, list(self.model.model_fields), rows, row_format)
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error executing changes_since for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Query execution error in changes_since for {self.model.__name__}: {str(e)}") from e
+        return ChangeSet(items, deleted, next_token, has_more)
+
+    def count(self, spec: Optional[QuerySpec] = None) -> int:
         try:
-            result = self.session.exec(statement).first()
-            return result
+            statement = build_count(self.model, spec)
         except OperationalError as e:
-            raise DatabaseConnectionError(f"Database connection error executing get_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+            raise DatabaseConnectionError(f"Database connection error in count for {self.model.__name__}: {str(e)}") from e
         except SQLAlchemyError as e:
-            raise QueryExecutionError(f"Query execution error in get_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+            raise QueryExecutionError(f"Query preparation error in count for {self.model.__name__}: {str(e)}") from e
 
-    def add(self, item: T) -> T:
+        with self._read_session() as session:
+            try:
+                return session.exec(statement).one()
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error executing count for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Query execution error in count for {self.model.__name__}: {str(e)}") from e
+
+    def query(self, spec: QuerySpec) -> List[T] | List[Dict[str, Any]]:
         try:
-            self.session.add(item)
+            statement = build_select(self.model, spec)
         except OperationalError as e:
-            raise DatabaseConnectionError(f"Database connection error in add for {self.model.__name__}: {str(e)}") from e
+            raise DatabaseConnectionError(f"Database connection error in query for {self.model.__name__}: {str(e)}") from e
         except SQLAlchemyError as e:
-            raise QueryExecutionError(f"Error adding item in add for {self.model.__name__}: {str(e)}") from e
-        
+            raise QueryExecutionError(f"Query preparation error in query for {self.model.__name__}: {str(e)}") from e
+
+        with self._read_session() as session:
+            try:
+                if spec.columns is None:
+                    return session.exec(statement).all()
+                return [dict(row) for row in session.execute(statement).mappings()]
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error executing query for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Query execution error in query for {self.model.__name__}: {str(e)}") from e
+
+    def iter_batches(self, spec: Optional[QuerySpec] = None, batch_size: Optional[int] = None) -> Iterator[List[T]]:
+        spec = spec or QuerySpec()
+        batch_size = batch_size or self.batch_size
         try:
-            self.session.commit()
+            # yield_per streams the result with a server-side cursor and hydrates batch_size rows at a time
+            statement = build_select(self.model, spec).execution_options(yield_per=batch_size)
         except OperationalError as e:
-            self.session.rollback()
-            raise DatabaseConnectionError(f"Database connection error during commit in add for {self.model.__name__}: {str(e)}") from e
+            raise DatabaseConnectionError(f"Database connection error in iter_batches for {self.model.__name__}: {str(e)}") from e
         except SQLAlchemyError as e:
-            self.session.rollback()
-            raise CommitError(f"Commit error in add for {self.model.__name__}: {str(e)}") from e
-        
+            raise QueryExecutionError(f"Query preparation error in iter_batches for {self.model.__name__}: {str(e)}") from e
+
+        with self._read_session() as session:
+            try:
+                result = session.execute(statement)
+                partitions = result.scalars().partitions() if spec.columns is None else result.mappings().partitions()
+                for partition in partitions:
+                    yield list(partition) if spec.columns is None else [dict(row) for row in partition]
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error executing iter_batches for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Query execution error in iter_batches for {self.model.__name__}: {str(e)}") from e
+
+    def iter_all(self, spec: Optional[QuerySpec] = None, batch_size: Optional[int] = None) -> Iterator[T]:
+        for batch in self.iter_batches(spec, batch_size):
+            yield from batch
+
+    def get_columns_by_cursor(self, cursor: Optional[str] = None, limit: int = 10, order_by: Optional[str] = None,
+                              descending: bool = False, spec: Optional[QuerySpec] = None,
+                              row_format: RowFormat = RowFormat.TUPLES) -> KeysetPage[Any]:
         try:
-            self.session.refresh(item)
+            keyset_query = KeysetQuery.build(self.model, cursor, limit, order_by, descending, spec, columnar=True)
         except OperationalError as e:
-            raise DatabaseConnectionError(f"Database connection error during refresh in add for {self.model.__name__}: {str(e)}") from e
+            raise DatabaseConnectionError(f"Database connection error in get_columns_by_cursor for {self.model.__name__}: {str(e)}") from e
         except SQLAlchemyError as e:
-            raise QueryExecutionError(f"Error refreshing item in add for {self.model.__name__}: {str(e)}") from e
-        
-        return item
+            raise QueryExecutionError(f"Query preparation error in get_columns_by_cursor for {self.model.__name__}: {str(e)}") from e
 
-    def update(self, item: T) -> T:
+        with self._read_session() as session:
+            try:
+                # Core execution on the connection of the session: rows, no entities
+                rows = session.connection().execute(keyset_query.statement).all()
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error executing get_columns_by_cursor for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Query execution error in get_columns_by_cursor for {self.model.__name__}: {str(e)}") from e
+        page = keyset_query.to_page(rows)
+        return replace(page, items=assemble(self.model, list(self.model.model_fields), page.items, row_format))
+
+    def query_columns(self, spec: Optional[QuerySpec] = None, row_format: RowFormat = RowFormat.TUPLES) -> ColumnarData:
         try:
-            self.session.add(item)
+            statement = build_column_select(self.model, spec)
         except OperationalError as e:
-            raise DatabaseConnectionError(f"Database connection error in update for {self.model.__name__}: {str(e)}") from e
+            raise DatabaseConnectionError(f"Database connection error in query_columns for {self.model.__name__}: {str(e)}") from e
         except SQLAlchemyError as e:
-            raise QueryExecutionError(f"Error updating item in update for {self.model.__name__}: {str(e)}") from e
-        
+            raise QueryExecutionError(f"Query preparation error in query_columns for {self.model.__name__}: {str(e)}") from e
+
+        with self._read_session() as session:
+            try:
+                rows = session.connection().execute(statement).all()
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error executing query_columns for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Query execution error in query_columns for {self.model.__name__}: {str(e)}") from e
+        return assemble(self.model, column_names(self.model, spec), rows, row_format)
+
+    def iter_column_batches(self, spec: Optional[QuerySpec] = None, batch_size: Optional[int] = None,
+                            row_format: RowFormat = RowFormat.TUPLES) -> Iterator[ColumnarData]:
+        batch_size = batch_size or self.batch_size
+        columns = column_names(self.model, spec)
         try:
-            self.session.commit()
+            # A server-side cursor where the driver has one, read batch_size rows at a time with fetchmany
+            statement = build_column_select(self.model, spec).execution_options(stream_results=True, max_row_buffer=batch_size)
         except OperationalError as e:
-            self.session.rollback()
-            raise DatabaseConnectionError(f"Database connection error during commit in update for {self.model.__name__}: {str(e)}") from e
+            raise DatabaseConnectionError(f"Database connection error in iter_column_batches for {self.model.__name__}: {str(e)}") from e
         except SQLAlchemyError as e:
-            self.session.rollback()
-            raise CommitError(f"Commit error in update for {self.model.__name__}: {str(e)}") from e
-        
+            raise QueryExecutionError(f"Query preparation error in iter_column_batches for {self.model.__name__}: {str(e)}") from e
+
+        with self._read_session() as session:
+            try:
+                result = session.connection().execute(statement)
+                while rows := result.fetchmany(batch_size):
+                    yield assemble(self.model, columns, rows, row_format)
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error executing iter_column_batches for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Query execution error in iter_column_batches for {self.model.__name__}: {str(e)}") from e
+
+    def aggregate(self, aggregates: Sequence[Aggregate], group_by: Sequence[str] = (), spec: Optional[QuerySpec] = None,
+                  limit: Optional[int] = None, row_format: RowFormat = RowFormat.TUPLES) -> ColumnarData:
         try:
-            self.session.refresh(item)
+            statement = build_aggregate_select(self.model, aggregates, group_by, spec, limit)
         except OperationalError as e:
-            raise DatabaseConnectionError(f"Database connection error during refresh in update for {self.model.__name__}: {str(e)}") from e
+            raise DatabaseConnectionError(f"Database connection error in aggregate for {self.model.__name__}: {str(e)}") from e
         except SQLAlchemyError as e:
-            raise QueryExecutionError(f"Error refreshing item in update for {self.model.__name__}: {str(e)}") from e
+            raise QueryExecutionError(f"Query preparation error in aggregate for {self.model.__name__}: {str(e)}") from e
+
+        with self._read_session() as session:
+            try:
+                # One row per group, the matching rows never leave the database
+                rows = session.connection().execute(statement).all()
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error executing aggregate for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Query execution error in aggregate for {self.model.__name__}: {str(e)}") from e
+        annotations = {aggregate.label: result_annotation(self.model, aggregate) for aggregate in aggregates}
+        return assemble(self.model, [*group_by, *(aggregate.label for aggregate in aggregates)], rows, row_format, annotations)
+
+    def search(self, query: str, limit: int = 20, row_format: Optional[RowFormat] = None) -> List[T] | ColumnarData:
+        try:
+            probe = build_match_probe(self.model, query)
+        except SQLAlchemyError as e:
+            raise QueryExecutionError(f"Query preparation error in search for {self.model.__name__}: {str(e)}") from e
+
+        with self._read_session() as session:
+            try:
+                # Ranking scores every match, broad queries skip it
+                ranked = len(session.connection().execute(probe).all()) <= RANKED_MATCHES
+                statement = build_search(self.model, query, limit, columnar=row_format is not None, ranked=ranked)
+                if row_format is None:
+                    return session.exec(statement).all()
+                rows = session.connection().execute(statement).all()
+            except OperationalError as e:
+                # A missing index is an OperationalError too, the message tells them apart
+                raise DatabaseConnectionError(f"Database connection error executing search for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Query execution error in search for {self.model.__name__}: {str(e)}") from e
+        return assemble(self.model, list(self.model.model_fields), rows, row_format)
+
+    def explain(self, spec: Optional[QuerySpec] = None, order_by: Optional[str] = None,
+                descending: bool = False) -> List[IndexAdvice]:
+        try:
+            # The statements of get_page_by_cursor (the first page, the next ones seek the same index), count and query
+            # With the fields each one is sorted by
+            statements = [(KeysetQuery.build(self.model, None, 10, order_by, descending, spec).statement, (order_by or "id",)),
+                          (build_count(self.model, spec), ())]
+            if spec is not None:
+                statements.append((build_select(self.model, spec), tuple(sort_order.field for sort_order in spec.order_by)))
+        except OperationalError as e:
+            raise DatabaseConnectionError(f"Database connection error in explain for {self.model.__name__}: {str(e)}") from e
+        except SQLAlchemyError as e:
+            raise QueryExecutionError(f"Query preparation error in explain for {self.model.__name__}: {str(e)}") from e
+
+        with self._read_session() as session:
+            try:
+                connection = session.connection()
+                return [advise(connection, self.model, statement, sort) for statement, sort in statements]
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error executing explain for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Query execution error in explain for {self.model.__name__}: {str(e)}") from e
+
+    def get_by_id(self, item_id: int) -> Optional[T]:
+        try:
+            statement = select(self.model).where(self.model.id == item_id)
+        except OperationalError as e:
+            raise DatabaseConnectionError(f"Database connection error in get_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+        except SQLAlchemyError as e:
+            raise QueryExecutionError(f"Query preparation error in get_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+        
+        with self._read_session() as session:
+            try:
+                result = session.exec(statement).first()
+                return result
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error executing get_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Query execution error in get_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+
+    def add(self, item: T) -> T:
+        with self._session() as session:
+            try:
+                session.add(item)
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error in add for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Error adding item in add for {self.model.__name__}: {str(e)}") from e
+        
+            try:
+                session.commit()
+            except OperationalError as e:
+                session.rollback()
+                raise DatabaseConnectionError(f"Database connection error during commit in add for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                session.rollback()
+                raise CommitError(f"Commit error in add for {self.model.__name__}: {str(e)}") from e
+        
+            try:
+                session.refresh(item)
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error during refresh in add for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Error refreshing item in add for {self.model.__name__}: {str(e)}") from e
+        
+            return item
+
+    def update(self, item: T) -> T:
+        with self._session() as session:
+            try:
+                session.add(item)
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error in update for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Error updating item in update for {self.model.__name__}: {str(e)}") from e
+        
+            try:
+                session.commit()
+            except OperationalError as e:
+                session.rollback()
+                raise DatabaseConnectionError(f"Database connection error during commit in update for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                session.rollback()
+                raise CommitError(f"Commit error in update for {self.model.__name__}: {str(e)}") from e
+        
+            try:
+                session.refresh(item)
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error during refresh in update for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Error refreshing item in update for {self.model.__name__}: {str(e)}") from e
         
-        return item
+            return item
 
     def delete(self, item: T) -> None:
+        with self._session() as session:
+            try:
+                session.delete(item)
+            except OperationalError as e:
+                raise DatabaseConnectionError(f"Database connection error in delete for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                raise QueryExecutionError(f"Error deleting item in delete for {self.model.__name__}: {str(e)}") from e
+        
+            try:
+                session.commit()
+            except OperationalError as e:
+                session.rollback()
+                raise DatabaseConnectionError(f"Database connection error during commit in delete for {self.model.__name__}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                session.rollback()
+                raise CommitError(f"Commit error in delete for {self.model.__name__}: {str(e)}") from e
+
+    def update_by_id(self, item_id: int, values: Mapping[str, Any], returning: bool = False) -> bool | Optional[T]:
+        unknown_fields = set(values) - set(self.model.model_fields)
+        if unknown_fields:
+            raise InvalidQueryError(f"Unknown fields {sorted(unknown_fields)} in update_by_id for {self.model.__name__} with id={item_id}")
+        if not values:
+            # Nothing to set: an UPDATE without SET clause is not valid SQL
+            item = self.get_by_id(item_id)
+            return item if returning else item is not None
+
         try:
-            self.session.delete(item)
+            statement = update(self.model).where(self.model.id == item_id).values(**values)
+            if returning:
+                statement = statement.returning(self.model)
         except OperationalError as e:
-            raise DatabaseConnectionError(f"Database connection error in delete for {self.model.__name__}: {str(e)}") from e
+            raise DatabaseConnectionError(f"Database connection error in update_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
         except SQLAlchemyError as e:
-            raise QueryExecutionError(f"Error deleting item in delete for {self.model.__name__}: {str(e)}") from e
-        
+            raise QueryExecutionError(f"Query preparation error in update_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+
+        with self._session() as session:
+            try:
+                result = session.execute(statement)
+                outcome = result.scalars().first() if returning else result.rowcount > 0
+            except OperationalError as e:
+                session.rollback()
+                raise DatabaseConnectionError(f"Database connection error executing update_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                session.rollback()
+                raise QueryExecutionError(f"Query execution error in update_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+
+            try:
+                session.commit()
+            except OperationalError as e:
+                session.rollback()
+                raise DatabaseConnectionError(f"Database connection error during commit in update_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                session.rollback()
+                raise CommitError(f"Commit error in update_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+        return outcome
+
+    def delete_by_id(self, item_id: int, returning: bool = False) -> bool | Optional[T]:
         try:
-            self.session.commit()
+            statement = delete(self.model).where(self.model.id == item_id)
+            if returning:
+                # Plain columns: the deleted row is rebuilt as a detached instance that outlives the commit
+                statement = statement.returning(*self.model.__table__.columns)
         except OperationalError as e:
-            self.session.rollback()
-            raise DatabaseConnectionError(f"Database connection error during commit in delete for {self.model.__name__}: {str(e)}") from e
+            raise DatabaseConnectionError(f"Database connection error in delete_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
         except SQLAlchemyError as e:
-            self.session.rollback()
-            raise CommitError(f"Commit error in delete for {self.model.__name__}: {str(e)}") from e
\ No newline at end of file
+            raise QueryExecutionError(f"Query preparation error in delete_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+
+        with self._session() as session:
+            try:
+                result = session.execute(statement)
+                if returning:
+                    row = result.mappings().first()
+                    outcome = self.model.model_validate(row) if row is not None else None
+                else:
+                    outcome = result.rowcount > 0
+            except OperationalError as e:
+                session.rollback()
+                raise DatabaseConnectionError(f"Database connection error executing delete_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                session.rollback()
+                raise QueryExecutionError(f"Query execution error in delete_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+
+            try:
+                session.commit()
+            except OperationalError as e:
+                session.rollback()
+                raise DatabaseConnectionError(f"Database connection error during commit in delete_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+            except SQLAlchemyError as e:
+                session.rollback()
+                raise CommitError(f"Commit error in delete_by_id for {self.model.__name__} with id={item_id}: {str(e)}") from e
+        return outcome
+
+    def add_many(self, items: Iterable[T | Mapping[str, Any]], chunk_size: Optional[int] = None, return_ids: bool = False) -> int:
+        # Core insert on the table: the rows are already plain dictionaries, the ORM bulk path would only add bookkeeping
+        table = self.model.__table__
+        statement = insert(table)
+        if return_ids:
+            statement = statement.returning(table.c.id, sort_by_parameter_order=True)
+
+        inserted = 0
+        with self._session() as session:
+            for chunk in chunked(items, chunk_size or self.batch_size):
+                rows = [to_row(item, drop_empty_id=True, model=self.model) for item in chunk]
+                try:
+                    # Rows with an explicit ID, or missing required fields, go in their own statement
+                    for positions in group_by_columns(rows):
+                        result = session.execute(statement, [rows[position] for position in positions])
+                        if return_ids:
+                            for position, item_id in zip(positions, result.scalars().all()):
+                                if isinstance(chunk[position], SQLModel):
+                                    chunk[position].id = item_id
+                except OperationalError as e:
+                    session.rollback()
+                    raise DatabaseConnectionError(f"Database connection error in add_many for {self.model.__name__}: {str(e)}") from e
+                except SQLAlchemyError as e:
+                    session.rollback()
+                    raise QueryExecutionError(f"Error inserting items in add_many for {self.model.__name__}: {str(e)}") from e
+
+                try:
+                    session.commit()
+                except OperationalError as e:
+                    session.rollback()
+                    raise DatabaseConnectionError(f"Database connection error during commit in add_many for {self.model.__name__}: {str(e)}") from e
+                except SQLAlchemyError as e:
+                    session.rollback()
+                    raise CommitError(f"Commit error in add_many for {self.model.__name__}: {str(e)}") from e
+                inserted += len(rows)
+        return inserted
+
+    def update_many(self, items: Iterable[T | Mapping[str, Any]], chunk_size: Optional[int] = None) -> int:
+        updated = 0
+        with self._session() as session:
+            for chunk in chunked(items, chunk_size or self.batch_size):
+                rows = [to_row(item) for item in chunk]
+                try:
+                    # ORM bulk UPDATE by primary key: one executemany per group of rows with the same columns
+                    session.execute(update(self.model), rows)
+                except OperationalError as e:
+                    session.rollback()
+                    raise DatabaseConnectionError(f"Database connection error in update_many for {self.model.__name__}: {str(e)}") from e
+                except SQLAlchemyError as e:
+                    session.rollback()
+                    raise QueryExecutionError(f"Error updating items in update_many for {self.model.__name__}: {str(e)}") from e
+
+                try:
+                    session.commit()
+                except OperationalError as e:
+                    session.rollback()
+                    raise DatabaseConnectionError(f"Database connection error during commit in update_many for {self.model.__name__}: {str(e)}") from e
+                except SQLAlchemyError as e:
+                    session.rollback()
+                    raise CommitError(f"Commit error in update_many for {self.model.__name__}: {str(e)}") from e
+                updated += len(rows)
+        return updated
+
+    def delete_many_by_ids(self, item_ids: Iterable[int], chunk_size: Optional[int] = None) -> int:
+        deleted = 0
+        with self._session() as session:
+            for chunk in chunked(item_ids, chunk_size or self.batch_size):
+                try:
+                    result = session.execute(delete(self.model).where(self.model.id.in_(chunk)))
+                except OperationalError as e:
+                    session.rollback()
+                    raise DatabaseConnectionError(f"Database connection error in delete_many_by_ids for {self.model.__name__}: {str(e)}") from e
+                except SQLAlchemyError as e:
+                    session.rollback()
+                    raise QueryExecutionError(f"Error deleting items in delete_many_by_ids for {self.model.__name__}: {str(e)}") from e
+
+                try:
+                    session.commit()
+                except OperationalError as e:
+                    session.rollback()
+                    raise DatabaseConnectionError(f"Database connection error during commit in delete_many_by_ids for {self.model.__name__}: {str(e)}") from e
+                except SQLAlchemyError as e:
+                    session.rollback()
+                    raise CommitError(f"Commit error in delete_many_by_ids for {self.model.__name__}: {str(e)}") from e
+                deleted += result.rowcount
+        return deleted
@@ -0,0 +1,70 @@
+import re
+from typing import Any, Dict, Mapping, Optional
+from sqlalchemy import event, pool
+from sqlalchemy.engine import Engine
+
+"""
+SQLite performance profile.
+
+SQLite settings such as journal_mode, synchronous or busy_timeout are per connection (journal_mode=WAL
+is persistent, but setting it again is harmless), so they are applied with PRAGMA statements every time
+the pool opens a new connection. The profile is configured in db_config.yml, see the sqllite section.
+"""
+
+_PRAGMA_NAME = re.compile(r"[A-Za-z_]+")
+_PRAGMA_VALUE = re.compile(r"-?[A-Za-z0-9_]+")
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: Optional[Mapping[str, Any]]) -> None:
+    """
+        Register a connect event on the engine that runs "PRAGMA name = value" for every pragma.
+
+        Raises:
+            ValueError: If a pragma name or value is not a plain identifier or number.
+    """
+    if not pragmas:
+        return
+    statements = []
+    for name, value in pragmas.items():
+        if isinstance(value, bool):
+            value = "ON" if value else "OFF"
+        if not _PRAGMA_NAME.fullmatch(str(name)) or not _PRAGMA_VALUE.fullmatch(str(value)):
+            raise ValueError(f"Invalid SQLite pragma: {name} = {value}")
+        statements.append(f"PRAGMA {name} = {value}")
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def pool_options(pool_config: Optional[Mapping[str, Any]], asynchronous: bool = False) -> Dict[str, Any]:
+    """
+        Translate the pool section of the configuration into create_engine keyword arguments.
+        Supported keys: class (a sqlalchemy.pool class name), size, max_overflow, timeout and recycle.
+        For an async engine QueuePool is replaced by its asyncio counterpart, AsyncAdaptedQueuePool.
+
+        Raises:
+            ValueError: If the pool class is unknown.
+    """
+    if not pool_config:
+        return {}
+    options: Dict[str, Any] = {}
+    pool_class_name = pool_config.get("class")
+    if pool_class_name:
+        pool_class = getattr(pool, pool_class_name, None)
+        if not isinstance(pool_class, type) or not issubclass(pool_class, pool.Pool):
+            raise ValueError(f"Unknown pool class: {pool_class_name}")
+        if asynchronous and pool_class is pool.QueuePool:
+            pool_class = pool.AsyncAdaptedQueuePool
+        options["poolclass"] = pool_class
+    # Sizing only applies to the queue pools, the default pools for SQLite files
+    if options.get("poolclass", pool.QueuePool) in (pool.QueuePool, pool.AsyncAdaptedQueuePool):
+        for key, option in (("size", "pool_size"), ("max_overflow", "max_overflow"), ("timeout", "pool_timeout"), ("recycle", "pool_recycle")):
+            if pool_config.get(key) is not None:
+                options[option] = pool_config[key]
+    return options
@@ -0,0 +1,147 @@
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Iterator, Mapping, Optional
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from src.infrastructure.EngineRouter import EngineRouter, ReadStrategy
+
+"""
+Unit of work / session scope management.
+
+Repositories never keep a Session of their own: they ask the SessionManager for one per operation.
+Outside of a scope every operation gets a fresh, short-lived Session that is closed (and its
+connection returned to the pool) as soon as the operation ends. Inside a scope opened with bind()
+all operations of the current thread/task share the bound Session, which is the unit of work.
+
+With read replicas, read operations ask for read_session() and run on a replica. Inside a scope the
+reads share one replica Session until the scope writes; from then on they use the bound primary
+Session, so a scope always reads its own writes. Outside of a scope (the "call" scope) every read
+may go to a different replica. The few reads that need the primary, such as the data versions, use
+primary_read_session(), which leaves the routing of the scope as it is.
+"""
+
+
+class SessionScope(str, Enum):
+    """How long a Session lives."""
+
+    CALL = "call"                  # one Session per repository operation
+    RERUN = "rerun"                # one Session per Streamlit script run
+    USER_SESSION = "user_session"  # one Session per Streamlit user session, released after each run
+
+
+class _BoundScope:
+    """State of an open scope: the primary Session, the lazily opened replica Session and whether it wrote."""
+
+    __slots__ = ("session", "replica_session", "written", "resources")
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.replica_session: Optional[Session] = None
+        self.written = False
+        self.resources = ExitStack()
+
+
+class SessionManager:
+    """Creates short-lived sessions and binds them to the current context for the configured scope."""
+
+    def __init__(self, engine: Engine, scope: Optional[SessionScope | str] = None,
+                 replicas: Optional[Mapping[str, Engine]] = None, read_strategy: Optional[ReadStrategy | str] = None):
+        if engine is None:
+            raise ValueError("Engine cannot be None")
+        self._engine = engine
+        self._scope = SessionScope(scope or SessionScope.CALL)
+        self._router = EngineRouter(engine, replicas, read_strategy)
+        # ContextVars are per thread (and per asyncio task), so concurrent reruns never share a bound Session.
+        self._bound_scope: ContextVar[Optional[_BoundScope]] = ContextVar(f"bound_session_{id(self)}", default=None)
+
+    @property
+    def scope(self) -> SessionScope:
+        return self._scope
+
+    @property
+    def engine(self) -> Engine:
+        return self._engine
+
+    @property
+    def router(self) -> EngineRouter:
+        return self._router
+
+    def create_session(self) -> Session:
+        """Create a new Session. Loaded objects stay readable after commit and close."""
+        return Session(self._engine, expire_on_commit=False)
+
+    def current_session(self) -> Optional[Session]:
+        """Return the Session bound to the current context, if any."""
+        bound_scope = self._bound_scope.get()
+        return bound_scope.session if bound_scope is not None else None
+
+    @contextmanager
+    def session(self) -> Iterator[Session]:
+        """
+            Primary Session for a single operation: the bound one if a scope is open, otherwise a fresh one
+            closed on exit. Inside a scope, later reads go to the primary as well (read-your-writes).
+        """
+        bound_scope = self._bound_scope.get()
+        if bound_scope is not None:
+            bound_scope.written = True
+            yield bound_scope.session
+            return
+        with self.create_session() as session:
+            yield session
+
+    @contextmanager
+    def primary_read_session(self) -> Iterator[Session]:
+        """
+            Primary Session for a read that must see the latest commits, e.g. the data versions. Unlike
+            session() it does not route the later reads of the scope to the primary, as it writes nothing.
+        """
+        bound_scope = self._bound_scope.get()
+        if bound_scope is not None:
+            yield bound_scope.session
+            return
+        with self.create_session() as session:
+            yield session
+
+    @contextmanager
+    def read_session(self) -> Iterator[Session]:
+        """Session for a read-only operation, on a replica when there is one (see the module docstring)."""
+        bound_scope = self._bound_scope.get()
+        if not self._router.has_replicas or (bound_scope is not None and bound_scope.written):
+            with self.session() as session:
+                yield session
+            return
+        if bound_scope is not None:
+            if bound_scope.replica_session is None:
+                engine = bound_scope.resources.enter_context(self._router.reader())
+                bound_scope.replica_session = bound_scope.resources.enter_context(Session(engine, expire_on_commit=False))
+            yield bound_scope.replica_session
+            return
+        with self._router.reader() as engine, Session(engine, expire_on_commit=False) as session:
+            yield session
+
+    @contextmanager
+    def bind(self, session: Optional[Session] = None) -> Iterator[Session]:
+        """
+            Open a scope: every operation in the current context uses the same Session until exit.
+            If no session is given a new one is created and closed on exit; a given session is left open
+            but its transaction is ended, so its connection goes back to the pool.
+        """
+        owned = session is None
+        session = session if session is not None else self.create_session()
+        bound_scope = _BoundScope(session)
+        token = self._bound_scope.set(bound_scope)
+        try:
+            yield session
+        except BaseException:
+            session.rollback()
+            raise
+        else:
+            session.commit()
+        finally:
+            self._bound_scope.reset(token)
+            # Closes the replica Session, if the scope opened one
+            bound_scope.resources.close()
+            if owned:
+                session.close()
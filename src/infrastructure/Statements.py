@@ -0,0 +1,198 @@
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Type
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import ColumnElement, Select, and_, func, literal, or_, tuple_
+from sqlmodel import SQLModel, select
+
+from src.infrastructure.Exceptions.RepositoryExceptions import InvalidCursorError, InvalidQueryError
+from src.infrastructure.Pagination import NEXT, PREVIOUS, KeysetPage, decode_cursor, encode_cursor
+from src.infrastructure.QuerySpec import QuerySpec, build_order_by, build_where, get_column
+
+"""
+SQL statement building shared by the synchronous and the asynchronous repositories.
+Nothing here talks to the database: the repositories execute the statements and map the errors.
+"""
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split an iterable, possibly a generator, into lists of at most size items."""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def to_row(item: SQLModel | Mapping[str, Any], drop_empty_id: bool = False,
+           model: Optional[Type[SQLModel]] = None) -> Dict[str, Any]:
+    """
+        Column values of a model instance or mapping, for bulk statements.
+        With model, the fields missing from a mapping take their default, as a model instance would.
+    """
+    row = item.model_dump() if isinstance(item, SQLModel) else dict(item)
+    if model is not None:
+        for name, field in model.model_fields.items():
+            if name not in row and name != "id" and not field.is_required():
+                row[name] = field.get_default(call_default_factory=True)
+    if drop_empty_id and row.get("id") is None:
+        # Let the database generate the primary key
+        row.pop("id", None)
+    return row
+
+
+def group_by_columns(rows: Sequence[Mapping[str, Any]]) -> List[List[int]]:
+    """
+        The positions of rows grouped by their set of columns, in order of first appearance.
+        An executemany takes its columns from the first row: each group needs its own statement.
+    """
+    groups: Dict[frozenset, List[int]] = {}
+    for position, row in enumerate(rows):
+        groups.setdefault(frozenset(row), []).append(position)
+    return list(groups.values())
+
+
+def column_names(model: Type[SQLModel], spec: Optional[QuerySpec] = None) -> List[str]:
+    """The columns a columnar read returns: those of the spec, or all the model fields."""
+    return list(spec.columns) if spec is not None and spec.columns is not None else list(model.model_fields)
+
+
+def build_column_select(model: Type[SQLModel], spec: Optional[QuerySpec] = None) -> Select:
+    """Compile a QuerySpec into a SELECT of columns (all the model fields by default), for Core execution."""
+    spec = spec or QuerySpec()
+    return build_select(model, replace(spec, columns=tuple(column_names(model, spec))))
+
+
+def build_select(model: Type[SQLModel], spec: QuerySpec) -> Select:
+    """Compile a QuerySpec into a single SELECT. Raises InvalidQueryError for unknown fields."""
+    if spec.columns is None:
+        statement = select(model)
+    else:
+        statement = select(*(get_column(model, column) for column in spec.columns))
+    statement = statement.where(*build_where(model, spec.filters)).order_by(*build_order_by(model, spec.order_by))
+    if spec.skip:
+        statement = statement.offset(spec.skip)
+    if spec.limit is not None:
+        statement = statement.limit(spec.limit)
+    return statement
+
+
+def build_count(model: Type[SQLModel], spec: Optional[QuerySpec] = None) -> Select:
+    """Compile the filters of a QuerySpec into a SELECT count(*). Raises InvalidQueryError for unknown fields."""
+    return select(func.count()).select_from(model).where(*build_where(model, spec.filters if spec else ()))
+
+
+@dataclass(frozen=True)
+class KeysetQuery:
+    """A keyset page request compiled for a model: the statement to run and how to turn its rows into a page."""
+
+    statement: Select
+    order_by: str
+    cursor_key: str
+    direction: str
+    from_cursor: bool
+    limit: int
+    model: Type[SQLModel]
+
+    @classmethod
+    def build(cls, model: Type[SQLModel], cursor: Optional[str], limit: int, order_by: Optional[str] = None,
+              descending: bool = False, spec: Optional[QuerySpec] = None, columnar: bool = False) -> "KeysetQuery":
+        """
+            columnar selects the columns of the model fields instead of the entity, for Core execution.
+
+            Raises:
+                InvalidQueryError: If order_by or the filters reference unknown fields.
+                InvalidCursorError: If the cursor is malformed or was made for another sort.
+        """
+        order_by = order_by or "id"
+        if order_by not in model.model_fields:
+            raise InvalidQueryError(f"Unknown sort field {order_by} for {model.__name__}")
+        # The cursor remembers the sort it was made for, a descending sort is stored as "-field"
+        cursor_key = f"-{order_by}" if descending else order_by
+        column = getattr(model, order_by)
+        nullable = order_by != "id" and may_be_null(model, order_by)
+
+        direction = NEXT
+        selected = (getattr(model, name) for name in model.model_fields) if columnar else (model,)
+        statement = select(*selected).where(*build_where(model, spec.filters if spec else ()))
+        if cursor is not None:
+            cursor_order_by, sort_value, item_id, direction = decode_cursor(cursor)
+            if cursor_order_by != cursor_key:
+                raise InvalidCursorError(f"Cursor sorted by {cursor_order_by} used with order_by={cursor_key} for {model.__name__}")
+        # Walking backwards is walking forwards in the opposite order
+        seek_descending = descending != (direction == PREVIOUS)
+        if cursor is not None:
+            if order_by == "id":
+                statement = statement.where(model.id < item_id if seek_descending else model.id > item_id)
+            else:
+                sort_value = _decode_sort_value(model, order_by, sort_value)
+                statement = statement.where(_seek(column, model.id, sort_value, item_id, seek_descending, nullable))
+        if order_by == "id":
+            statement = statement.order_by(model.id.desc() if seek_descending else model.id)
+        elif seek_descending:
+            sort_column = column.desc().nulls_last() if nullable else column.desc()
+            statement = statement.order_by(sort_column, model.id.desc())
+        else:
+            statement = statement.order_by(column.asc().nulls_first() if nullable else column, model.id)
+        # One extra row is fetched to know whether a further page exists in the direction of travel.
+        statement = statement.limit(limit + 1)
+        return cls(statement, order_by, cursor_key, direction, cursor is not None, limit, model)
+
+    def encode_value(self, value: Any) -> Any:
+        """The sort value of a row as stored in a cursor: the JSON form of the field type."""
+        return _field_adapter(self.model, self.order_by).dump_python(value, mode="json")
+
+    def to_page(self, rows: Sequence[Any]) -> KeysetPage:
+        """Build the page and the cursors of the adjacent pages from the rows (entities or Core rows) returned by the statement."""
+        has_more = len(rows) > self.limit
+        items = list(rows[:self.limit])
+        if self.direction == PREVIOUS:
+            items.reverse()
+        if not items:
+            return KeysetPage(items=items)
+
+        def cursor_for(item: Any, cursor_direction: str) -> str:
+            return encode_cursor(self.cursor_key, self.encode_value(getattr(item, self.order_by)), item.id, cursor_direction)
+
+        if self.direction == NEXT:
+            next_cursor = cursor_for(items[-1], NEXT) if has_more else None
+            previous_cursor = cursor_for(items[0], PREVIOUS) if self.from_cursor else None
+        else:
+            next_cursor = cursor_for(items[-1], NEXT)
+            previous_cursor = cursor_for(items[0], PREVIOUS) if has_more else None
+        return KeysetPage(items=items, next_cursor=next_cursor, previous_cursor=previous_cursor)
+
+
+def may_be_null(model: Type[SQLModel], field: str) -> bool:
+    """Whether the column of a field may hold NULLs: nullable, or declared with a None default."""
+    return model.__table__.c[field].nullable or model.model_fields[field].default is None
+
+
+@lru_cache(maxsize=None)
+def _field_adapter(model: Type[SQLModel], field: str) -> TypeAdapter:
+    return TypeAdapter(model.model_fields[field].annotation)
+
+
+def _decode_sort_value(model: Type[SQLModel], field: str, value: Any) -> Any:
+    # Back to the field type, which the column type binds in the format the database stores:
+    # a datetime compared as its JSON text would not match the text SQLite holds
+    if value is None:
+        return None
+    try:
+        return _field_adapter(model, field).validate_python(value)
+    except ValidationError as e:
+        raise InvalidCursorError(f"Malformed cursor value for {field}: {value!r}") from e
+
+
+def _seek(column: Any, id_column: Any, sort_value: Any, item_id: Any, descending: bool, nullable: bool) -> ColumnElement:
+    """
+        The rows after (sort_value, item_id) in the sort order. NULLs sort before the other values,
+        first when ascending and last when descending, where a row value comparison with NULL is not true.
+    """
+    if sort_value is None:
+        if descending:
+            return and_(column.is_(None), id_column < item_id)
+        return or_(and_(column.is_(None), id_column > item_id), column.is_not(None))
+    position, bound = tuple_(column, id_column), tuple_(literal(sort_value, column.type), item_id)
+    if descending:
+        return or_(position < bound, column.is_(None)) if nullable else position < bound
+    return position > bound
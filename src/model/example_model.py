@@ -7,8 +7,14 @@ Example SQLModel definition for demonstration purposes.
 class ExampleModel(SQLModel, table=True):
     """
         ExampleModel represents a simple entity with an id, name, value, and description.
+        Name and description are indexed for full-text search, name and value for filtering and sorting.
+        Its writes are kept in the change log, so that its CRUD page merges the changed rows.
     """
 
+    __searchable__ = ("name", "description")
+    __indexes__ = ("name", "value")
+    __change_log__ = True
+
     id: int = Field(default=None, primary_key=True)
     name: str
     value: int
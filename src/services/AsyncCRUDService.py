@@ -0,0 +1,183 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, Generic, Iterable, List, Mapping, Optional, Tuple, TypeVar
+from sqlmodel import SQLModel
+from src.infrastructure.Interfaces.IAsyncRepository import IAsyncRepository
+from src.infrastructure.Pagination import KeysetPage
+from src.infrastructure.QuerySpec import QuerySpec
+from src.infrastructure.Exceptions.RepositoryExceptions import RepositoryError
+
+T = TypeVar("T", bound=SQLModel)
+
+class AsyncCRUDService(Generic[T]):
+    """The asyncio counterpart of CRUDService, over an async repository.
+
+    Independent reads can be awaited concurrently (see get_items_with_count), each one
+    running on its own pooled connection when no session is bound to the current task.
+
+    Type Parameters:
+        T: The entity type, must be a SQLModel subclass.
+
+    Attributes:
+        repository (IAsyncRepository[T, int]): The repository instance used for data access.
+    """
+
+    def __init__(self, repository: IAsyncRepository[T, int]):
+        """Initialize the CRUD service with an async repository.
+
+        Args:
+            repository (IAsyncRepository[T, int]): The repository instance for data access operations.
+        Raises:
+            ValueError: If the repository is None.
+        """
+        if repository is None:
+            raise ValueError("Repository cannot be None")
+        self.repository = repository
+
+    async def get_items(self, skip: int = 0, limit: int = 10) -> List[T]:
+        """Retrieve a paginated list of items.
+
+        Raises:
+            ValueError: If skip is negative or limit is not positive.
+            RepositoryError: If there is an error retrieving items from the repository.
+        """
+        if skip < 0:
+            raise ValueError("Skip cannot be negative")
+        if limit < 1:
+            raise ValueError("Limit must be positive")
+        try:
+            return await self.repository.get_page(skip, limit)
+        except RepositoryError as e:
+            raise RepositoryError(f"Error retrieving items: {str(e)}") from e
+
+    async def get_items_with_count(self, skip: int = 0, limit: int = 10,
+                                   spec: Optional[QuerySpec] = None) -> Tuple[List[T], int]:
+        """Retrieve a page of items and the total number of items concurrently.
+
+        Returns:
+            Tuple[List[T], int]: The items of the page and the number of items matching spec.
+
+        Raises:
+            ValueError: If skip is negative or limit is not positive.
+            RepositoryError: If there is an error retrieving items from the repository.
+        """
+        return tuple(await asyncio.gather(self.get_items(skip, limit), self.count_items(spec)))
+
+    async def get_items_by_cursor(self, cursor: Optional[str] = None, limit: int = 10, order_by: Optional[str] = None,
+                                  descending: bool = False, spec: Optional[QuerySpec] = None) -> KeysetPage[T]:
+        """Retrieve a page of items using keyset pagination.
+
+        Raises:
+            ValueError: If limit is not positive.
+            RepositoryError: If there is an error retrieving items from the repository.
+        """
+        if limit < 1:
+            raise ValueError("Limit must be positive")
+        try:
+            return await self.repository.get_page_by_cursor(cursor, limit, order_by, descending, spec)
+        except RepositoryError as e:
+            raise RepositoryError(f"Error retrieving items by cursor: {str(e)}") from e
+
+    async def query_items(self, spec: QuerySpec) -> List[T] | List[Dict[str, Any]]:
+        """Retrieve the items matching a query specification.
+
+        Raises:
+            RepositoryError: If the query is invalid or there is an error retrieving the items.
+        """
+        try:
+            return await self.repository.query(spec)
+        except RepositoryError as e:
+            raise RepositoryError(f"Error querying items: {str(e)}") from e
+
+    async def iter_items(self, spec: Optional[QuerySpec] = None, batch_size: Optional[int] = None) -> AsyncIterator[List[T]]:
+        """Stream the items matching a query in batches, with memory bounded by the batch size.
+
+        Raises:
+            RepositoryError: If the query is invalid or there is an error retrieving the items.
+        """
+        try:
+            async for batch in self.repository.iter_batches(spec, batch_size):
+                yield batch
+        except RepositoryError as e:
+            raise RepositoryError(f"Error streaming items: {str(e)}") from e
+
+    async def count_items(self, spec: Optional[QuerySpec] = None) -> int:
+        """Count the total number of items.
+
+        Raises:
+            RepositoryError: If there is an error counting the items in the repository.
+        """
+        try:
+            return await self.repository.count(spec)
+        except RepositoryError as e:
+            raise RepositoryError(f"Error counting items: {str(e)}") from e
+
+    async def get_item(self, item_id: int) -> Optional[T]:
+        """Retrieve a single item by its ID.
+
+        Raises:
+            RepositoryError: If there is an error retrieving the item from the repository.
+        """
+        try:
+            return await self.repository.get_by_id(item_id)
+        except RepositoryError as e:
+            raise RepositoryError(f"Error retrieving item with ID {item_id}: {str(e)}") from e
+
+    async def create_item(self, item: T) -> T:
+        """Create a new item in the repository.
+
+        Raises:
+            RepositoryError: If there is an error creating the item in the repository.
+        """
+        try:
+            return await self.repository.add(item)
+        except RepositoryError as e:
+            raise RepositoryError(f"Error creating item: {str(e)}") from e
+
+    async def create_items(self, items: Iterable[T | Mapping[str, Any]], return_ids: bool = False) -> int:
+        """Create many items with batched inserts.
+
+        Raises:
+            RepositoryError: If there is an error creating the items in the repository.
+        """
+        try:
+            return await self.repository.add_many(items, return_ids=return_ids)
+        except RepositoryError as e:
+            raise RepositoryError(f"Error creating items: {str(e)}") from e
+
+    async def update_items(self, items: Iterable[T | Mapping[str, Any]]) -> int:
+        """Update many items by ID with batched statements.
+
+        Raises:
+            RepositoryError: If there is an error updating the items in the repository.
+        """
+        try:
+            return await self.repository.update_many(items)
+        except RepositoryError as e:
+            raise RepositoryError(f"Error updating items: {str(e)}") from e
+
+    async def delete_items(self, item_ids: Iterable[int]) -> int:
+        """Delete many items by ID with batched statements.
+
+        Raises:
+            RepositoryError: If there is an error deleting the items from the repository.
+        """
+        try:
+            return await self.repository.delete_many_by_ids(item_ids)
+        except RepositoryError as e:
+            raise RepositoryError(f"Error deleting items: {str(e)}") from e
+
+    async def update_item(self, item_id: int, item_data: dict) -> Optional[T]:
+        """Update an existing item with a single UPDATE ... RETURNING statement.
+
+        Returns:
+            Optional[T]: The updated item if found, None if the item doesn't exist.
+        """
+        return await self.repository.update_by_id(item_id, item_data, returning=True)
+
+    async def delete_item(self, item_id: int) -> Optional[T]:
+        """Delete an item with a single DELETE ... RETURNING statement.
+
+        Returns:
+            Optional[T]: The deleted item if found, None if the item doesn't exist.
+        """
+        return await self.repository.delete_by_id(item_id, returning=True)
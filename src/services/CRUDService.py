@@ -1,9 +1,17 @@
-from typing import Generic, List, Optional, TypeVar
+from typing import Any, Callable, Dict, Generic, Hashable, Iterable, Iterator, List, Mapping, Optional, Sequence, TypeVar
 from sqlmodel import SQLModel
+from src.infrastructure.Aggregation import Aggregate, Summary, summary_aggregates
+from src.infrastructure.Columnar import ColumnarData, RowFormat
+from src.infrastructure.DataVersion import ChangeSet
+from src.infrastructure.IndexAdvisor import IndexAdvice
 from src.infrastructure.Interfaces.IRepository import IRepository
+from src.infrastructure.Pagination import KeysetPage
+from src.infrastructure.QuerySpec import QuerySpec
 from src.infrastructure.Exceptions.RepositoryExceptions import RepositoryError
+from src.services.Interfaces.IQueryCache import IQueryCache
 
 T = TypeVar("T", bound=SQLModel)
+R = TypeVar("R")
 
 class CRUDService(Generic[T]):
     """A generic CRUD service that provides high-level operations for managing entities.
@@ -11,24 +19,39 @@ class CRUDService(Generic[T]):
     This service acts as a facade over the repository layer, providing business logic
     and simplified interfaces for common CRUD operations.
     
+    With a query cache, reads are served from the cache and every write made through the
+    service invalidates the cached reads of its model. Writes made by other processes are
+    only seen once the cached entries expire, unless the service is versioned: every cached
+    read then first reads the data version of the model (one primary key lookup) and the
+    entries cached under an older version are not used any more.
+    
     Type Parameters:
         T: The entity type, must be a SQLModel subclass.
     
     Attributes:
         repository (IRepository[T, int]): The repository instance used for data access.
+        cache (Optional[IQueryCache]): The read-through cache, None to always query the repository.
     """
     
-    def __init__(self, repository: IRepository[T, int]):
+    def __init__(self, repository: IRepository[T, int], cache: Optional[IQueryCache] = None, cache_namespace: Optional[str] = None,
+                 versioned: bool = False):
         """Initialize the CRUD service with a repository.
         
         Args:
             repository (IRepository[T, int]): The repository instance for data access operations.
+            cache (Optional[IQueryCache], optional): Cache for the read operations. Defaults to None (no caching).
+            cache_namespace (Optional[str], optional): Cache namespace invalidated by the writes. Defaults to the model name.
+            versioned (bool, optional): Check the data version before serving a cached read, see DataVersion. Defaults to False.
         Raises:
             ValueError: If the repository is None.
         """
         if repository is None:
             raise ValueError("Repository cannot be None")
         self.repository = repository
+        self.cache = cache
+        self.versioned = versioned
+        model_name = getattr(getattr(repository, "model", None), "__name__", None)
+        self._cache_namespace = cache_namespace or model_name or f"{type(repository).__name__}_{id(repository)}"
     
     def get_items(self, skip: int = 0, limit: int = 10) -> List[T]:
         """Retrieve a paginated list of items.
@@ -41,13 +64,286 @@ class CRUDService(Generic[T]):
             List[T]: A list of items within the specified range.
         
         Raises:
+            ValueError: If skip is negative or limit is not positive.
             RepositoryError: If there is an error retrieving items from the repository.
         """
+        if skip < 0:
+            raise ValueError("Skip cannot be negative")
+        if limit < 1:
+            raise ValueError("Limit must be positive")
         try:
-            items = self.repository.get_all()
+            return self._cached(("get_items", skip, limit), lambda: self.repository.get_page(skip, limit))
         except RepositoryError as e:
             raise RepositoryError(f"Error retrieving items: {str(e)}") from e
-        return items[skip:skip + limit]
+
+    def get_items_by_cursor(self, cursor: Optional[str] = None, limit: int = 10, order_by: Optional[str] = None,
+                            descending: bool = False, spec: Optional[QuerySpec] = None) -> KeysetPage[T]:
+        """Retrieve a page of items using keyset pagination.
+        
+        Each page is a range seek on the sort key, so deep pages cost the same as the first one.
+        
+        Args:
+            cursor (Optional[str], optional): The next_cursor or previous_cursor of a previous page. Defaults to None (first page).
+            limit (int, optional): Maximum number of items to return. Defaults to 10.
+            order_by (Optional[str], optional): Indexed field to sort by. Defaults to the ID.
+            descending (bool, optional): Sort in descending order. Defaults to False.
+            spec (Optional[QuerySpec], optional): Filters to apply. Defaults to None.
+        
+        Returns:
+            KeysetPage[T]: The items of the page and the cursors of the adjacent pages.
+        
+        Raises:
+            ValueError: If limit is not positive.
+            RepositoryError: If there is an error retrieving items from the repository.
+        """
+        if limit < 1:
+            raise ValueError("Limit must be positive")
+        try:
+            return self._cached(("get_items_by_cursor", cursor, limit, order_by, descending, spec),
+                                lambda: self.repository.get_page_by_cursor(cursor, limit, order_by, descending, spec))
+        except RepositoryError as e:
+            raise RepositoryError(f"Error retrieving items by cursor: {str(e)}") from e
+
+    def query_items(self, spec: QuerySpec) -> List[T] | List[Dict[str, Any]]:
+        """Retrieve the items matching a query specification.
+        
+        Filters, sort orders, column projection and slicing are executed by the database,
+        so the cost follows the size of the result rather than the size of the table.
+        
+        Args:
+            spec (QuerySpec): The query to run.
+        
+        Returns:
+            List[T] | List[Dict[str, Any]]: The items, or a dictionary per row when spec.columns is set.
+        
+        Raises:
+            RepositoryError: If the query is invalid or there is an error retrieving the items.
+        """
+        try:
+            return self._cached(("query_items", spec), lambda: self.repository.query(spec))
+        except RepositoryError as e:
+            raise RepositoryError(f"Error querying items: {str(e)}") from e
+
+    def iter_items(self, spec: Optional[QuerySpec] = None, batch_size: Optional[int] = None) -> Iterator[List[T]]:
+        """Stream the items matching a query in batches, with memory bounded by the batch size.
+        
+        Args:
+            spec (Optional[QuerySpec], optional): The query to stream. Defaults to all items.
+            batch_size (Optional[int], optional): Number of items per batch. Defaults to the repository batch size.
+        
+        Yields:
+            List[T]: A batch of items, or of dictionaries when spec.columns is set.
+        
+        Raises:
+            RepositoryError: If the query is invalid or there is an error retrieving the items.
+        """
+        try:
+            yield from self.repository.iter_batches(spec, batch_size)
+        except RepositoryError as e:
+            raise RepositoryError(f"Error streaming items: {str(e)}") from e
+
+    def get_columns_by_cursor(self, cursor: Optional[str] = None, limit: int = 10, order_by: Optional[str] = None,
+                              descending: bool = False, spec: Optional[QuerySpec] = None,
+                              row_format: RowFormat = RowFormat.DATAFRAME) -> KeysetPage[Any]:
+        """Retrieve a page like get_items_by_cursor, for display only.
+        
+        The rows are read with Core and assembled column by column, no model instance is built.
+        Use get_item or get_items_by_cursor for the items that are edited.
+        
+        Args:
+            cursor (Optional[str], optional): The next_cursor or previous_cursor of a previous page. Defaults to None (first page).
+            limit (int, optional): Maximum number of rows to return. Defaults to 10.
+            order_by (Optional[str], optional): Indexed field to sort by. Defaults to the ID.
+            descending (bool, optional): Sort in descending order. Defaults to False.
+            spec (Optional[QuerySpec], optional): Filters to apply. Defaults to None.
+            row_format (RowFormat, optional): Format of the items of the page. Defaults to a DataFrame.
+        
+        Returns:
+            KeysetPage[Any]: The rows of the page in row_format and the cursors of the adjacent pages.
+        
+        Raises:
+            ValueError: If limit is not positive.
+            RepositoryError: If there is an error retrieving the rows from the repository.
+        """
+        if limit < 1:
+            raise ValueError("Limit must be positive")
+        try:
+            return self._cached(("get_columns_by_cursor", cursor, limit, order_by, descending, spec, row_format),
+                                lambda: self.repository.get_columns_by_cursor(cursor, limit, order_by, descending, spec, row_format))
+        except RepositoryError as e:
+            raise RepositoryError(f"Error retrieving columns by cursor: {str(e)}") from e
+
+    def query_columns(self, spec: Optional[QuerySpec] = None, row_format: RowFormat = RowFormat.DATAFRAME) -> ColumnarData:
+        """Retrieve the rows matching a query as tuples, a DataFrame or an Arrow Table, for display only.
+        
+        Args:
+            spec (Optional[QuerySpec], optional): The query to run, all columns by default. Defaults to all rows.
+            row_format (RowFormat, optional): Format of the result. Defaults to a DataFrame.
+        
+        Returns:
+            ColumnarData: The rows in row_format.
+        
+        Raises:
+            RepositoryError: If the query is invalid or there is an error retrieving the rows.
+        """
+        try:
+            return self._cached(("query_columns", spec, row_format), lambda: self.repository.query_columns(spec, row_format))
+        except RepositoryError as e:
+            raise RepositoryError(f"Error querying columns: {str(e)}") from e
+
+    def iter_columns(self, spec: Optional[QuerySpec] = None, batch_size: Optional[int] = None,
+                     row_format: RowFormat = RowFormat.ARROW) -> Iterator[ColumnarData]:
+        """Stream the rows matching a query in batches of tuples, DataFrames or Arrow Tables, e.g. for exports.
+        
+        Args:
+            spec (Optional[QuerySpec], optional): The query to stream, all columns by default. Defaults to all rows.
+            batch_size (Optional[int], optional): Number of rows per batch. Defaults to the repository batch size.
+            row_format (RowFormat, optional): Format of the batches. Defaults to Arrow Tables.
+        
+        Yields:
+            ColumnarData: A batch of rows in row_format.
+        
+        Raises:
+            RepositoryError: If the query is invalid or there is an error retrieving the rows.
+        """
+        try:
+            yield from self.repository.iter_column_batches(spec, batch_size, row_format)
+        except RepositoryError as e:
+            raise RepositoryError(f"Error streaming columns: {str(e)}") from e
+
+    def search_items(self, query: str, limit: int = 20, row_format: Optional[RowFormat] = None) -> List[T] | ColumnarData:
+        """Full-text search over the searchable fields of the model, best matches first.
+        
+        Args:
+            query (str): The words to look for, each one matching the start of a word.
+            limit (int, optional): Maximum number of items to return. Defaults to 20.
+            row_format (Optional[RowFormat], optional): Return the rows in this format, for display. Defaults to model instances.
+        
+        Returns:
+            List[T] | ColumnarData: The best matching items.
+        
+        Raises:
+            RepositoryError: If the model is not searchable, the query has no words or the search fails.
+        """
+        try:
+            return self._cached(("search_items", query, limit, row_format), lambda: self.repository.search(query, limit, row_format))
+        except RepositoryError as e:
+            raise RepositoryError(f"Error searching items: {str(e)}") from e
+
+    def data_version(self) -> Optional[int]:
+        """Read the data version of the model, which grows with every write, e.g. to refresh a view only when it changed.
+        
+        Returns:
+            Optional[int]: The version, None if the model is not versioned.
+        
+        Raises:
+            RepositoryError: If there is an error reading the version.
+        """
+        try:
+            return self.repository.data_version()
+        except RepositoryError as e:
+            raise RepositoryError(f"Error reading the data version: {str(e)}") from e
+
+    def changes_since(self, token: int, limit: Optional[int] = None, row_format: Optional[RowFormat] = None) -> ChangeSet:
+        """Retrieve only the items inserted, updated or deleted since a data version, to refresh a copy. Never cached.
+        
+        Take the first token from data_version before reading the copy; a change made in between is
+        then both in the copy and in the changes, which are applied idempotently. Only for models
+        declaring __change_log__; when the log was compacted past token the changes are expired
+        and the copy is read again.
+        
+        Args:
+            token (int): A data version, or the token of the previous changes.
+            limit (Optional[int], optional): Maximum number of changes, see ChangeSet.has_more. Defaults to all of them.
+            row_format (Optional[RowFormat], optional): Return the changed items in this format. Defaults to model instances.
+        
+        Returns:
+            ChangeSet: The current values of the changed items, the IDs of the deleted ones and the next token, see ChangeSet.expired.
+        
+        Raises:
+            RepositoryError: If there is an error reading the changes.
+        """
+        try:
+            return self.repository.changes_since(token, limit, row_format)
+        except RepositoryError as e:
+            raise RepositoryError(f"Error retrieving changes: {str(e)}") from e
+
+    def count_items(self, spec: Optional[QuerySpec] = None) -> int:
+        """Count the total number of items, e.g. to compute the number of pages.
+        
+        Args:
+            spec (Optional[QuerySpec], optional): Only count the items matching its filters. Defaults to None.
+        
+        Returns:
+            int: The number of matching items in the repository.
+        
+        Raises:
+            RepositoryError: If there is an error counting the items in the repository.
+        """
+        try:
+            return self._cached(("count_items", spec), lambda: self.repository.count(spec))
+        except RepositoryError as e:
+            raise RepositoryError(f"Error counting items: {str(e)}") from e
+
+    def aggregate_items(self, aggregates: Sequence[Aggregate], group_by: Sequence[str] = (), spec: Optional[QuerySpec] = None,
+                        limit: Optional[int] = None, row_format: RowFormat = RowFormat.DATAFRAME) -> ColumnarData:
+        """Compute COUNT, SUM, AVG, MIN or MAX in the database, one row per group.
+        
+        Args:
+            aggregates (Sequence[Aggregate]): The functions and their fields, e.g. Aggregate("avg", "value").
+            group_by (Sequence[str], optional): Fields to group by. Defaults to a single row over all the matching items.
+            spec (Optional[QuerySpec], optional): Only aggregate the items matching its filters. Defaults to None.
+            limit (Optional[int], optional): Maximum number of groups. Defaults to all of them.
+            row_format (RowFormat, optional): Format of the result. Defaults to a DataFrame.
+        
+        Returns:
+            ColumnarData: The group_by fields then one column per aggregate, named by its label.
+        
+        Raises:
+            RepositoryError: If a field is unknown or not numeric, or the aggregation fails.
+        """
+        aggregates, group_by = tuple(aggregates), tuple(group_by)
+        try:
+            return self._cached(("aggregate_items", aggregates, group_by, spec, limit, row_format),
+                                lambda: self.repository.aggregate(aggregates, group_by, spec, limit, row_format))
+        except RepositoryError as e:
+            raise RepositoryError(f"Error aggregating items: {str(e)}") from e
+
+    def summarize_items(self, spec: Optional[QuerySpec] = None) -> Summary:
+        """Count the matching items and compute the count, sum, avg, min and max of every numeric field, in one query.
+        
+        Args:
+            spec (Optional[QuerySpec], optional): Only summarize the items matching its filters. Defaults to None.
+        
+        Returns:
+            Summary: The number of items and the statistics of each numeric field.
+        
+        Raises:
+            RepositoryError: If the aggregation fails.
+        """
+        model = self.repository.model
+        rows = self.aggregate_items(summary_aggregates(model), spec=spec, row_format=RowFormat.TUPLES)
+        return Summary.from_row(model, rows[0])
+
+    def explain_queries(self, spec: Optional[QuerySpec] = None, order_by: Optional[str] = None,
+                        descending: bool = False) -> List[IndexAdvice]:
+        """Explain the queries of a filtered and sorted view and suggest the indexes they miss. Never cached.
+        
+        Args:
+            spec (Optional[QuerySpec], optional): The filters, and the sort of the full query. Defaults to None.
+            order_by (Optional[str], optional): Field the pages are sorted by. Defaults to the ID.
+            descending (bool, optional): Sort the pages in descending order. Defaults to False.
+        
+        Returns:
+            List[IndexAdvice]: The plan of the page, count and full queries, with the index each one misses.
+        
+        Raises:
+            RepositoryError: If there is an error explaining the queries.
+        """
+        try:
+            return self.repository.explain(spec, order_by, descending)
+        except RepositoryError as e:
+            raise RepositoryError(f"Error explaining queries: {str(e)}") from e
 
     def get_item(self, item_id: int) -> Optional[T]:
         """Retrieve a single item by its ID.
@@ -62,7 +358,7 @@ class CRUDService(Generic[T]):
             RepositoryError: If there is an error retrieving the item from the repository.
         """
         try:
-            return self.repository.get_by_id(item_id)
+            return self._cached(("get_item", item_id), lambda: self.repository.get_by_id(item_id))
         except RepositoryError as e:
             raise RepositoryError(f"Error retrieving item with ID {item_id}: {str(e)}") from e
 
@@ -82,10 +378,73 @@ class CRUDService(Generic[T]):
             return self.repository.add(item)
         except RepositoryError as e:
             raise RepositoryError(f"Error creating item: {str(e)}") from e
+        finally:
+            self._invalidate_cache()
+
+    def create_items(self, items: Iterable[T | Mapping[str, Any]], return_ids: bool = False, chunk_size: Optional[int] = None) -> int:
+        """Create many items with batched inserts.
+        
+        Args:
+            items (Iterable[T | Mapping[str, Any]]): The items, or their column values, to create.
+            return_ids (bool, optional): Set the generated IDs on the given items. Defaults to False.
+            chunk_size (Optional[int], optional): Rows per INSERT and commit. Defaults to the repository batch size.
+        
+        Returns:
+            int: The number of created items.
+        
+        Raises:
+            RepositoryError: If there is an error creating the items in the repository.
+        """
+        try:
+            return self.repository.add_many(items, chunk_size=chunk_size, return_ids=return_ids)
+        except RepositoryError as e:
+            raise RepositoryError(f"Error creating items: {str(e)}") from e
+        finally:
+            self._invalidate_cache()
+
+    def update_items(self, items: Iterable[T | Mapping[str, Any]]) -> int:
+        """Update many items by ID with batched statements.
+        
+        Args:
+            items (Iterable[T | Mapping[str, Any]]): The items, or the fields to update including the ID.
+        
+        Returns:
+            int: The number of items sent for update.
+        
+        Raises:
+            RepositoryError: If there is an error updating the items in the repository.
+        """
+        try:
+            return self.repository.update_many(items)
+        except RepositoryError as e:
+            raise RepositoryError(f"Error updating items: {str(e)}") from e
+        finally:
+            self._invalidate_cache()
+
+    def delete_items(self, item_ids: Iterable[int]) -> int:
+        """Delete many items by ID with batched statements.
+        
+        Args:
+            item_ids (Iterable[int]): The unique identifiers of the items to delete.
+        
+        Returns:
+            int: The number of deleted items.
+        
+        Raises:
+            RepositoryError: If there is an error deleting the items from the repository.
+        """
+        try:
+            return self.repository.delete_many_by_ids(item_ids)
+        except RepositoryError as e:
+            raise RepositoryError(f"Error deleting items: {str(e)}") from e
+        finally:
+            self._invalidate_cache()
 
     def update_item(self, item_id: int, item_data: dict) -> Optional[T]:
         """Update an existing item with new data.
         
+        This is a single UPDATE ... RETURNING statement, the item is not loaded beforehand.
+        
         Args:
             item_id (int): The unique identifier of the item to update.
             item_data (dict): A dictionary containing the fields to update and their new values.
@@ -94,21 +453,21 @@ class CRUDService(Generic[T]):
             Optional[T]: The updated item if found, None if the item doesn't exist.
         
         Raises:
+            InvalidQueryError: If item_data contains unknown fields.
             DatabaseConnectionError: If there is a database connection issue.
             QueryExecutionError: If the query fails to execute.
             CommitError: If the commit operation fails.
         """
-        item = self.repository.get_by_id(item_id)
-        if item:
-            for key, value in item_data.items():
-                setattr(item, key, value)
-            self.repository.update(item)
-            return item
-        return None
+        try:
+            return self.repository.update_by_id(item_id, item_data, returning=True)
+        finally:
+            self._invalidate_cache()
 
     def delete_item(self, item_id: int) -> Optional[T]:
         """Delete an item from the repository.
         
+        This is a single DELETE ... RETURNING statement, the item is not loaded beforehand.
+        
         Args:
             item_id (int): The unique identifier of the item to delete.
         
@@ -120,8 +479,20 @@ class CRUDService(Generic[T]):
             QueryExecutionError: If the query fails to execute.
             CommitError: If the commit operation fails.
         """
-        item = self.repository.get_by_id(item_id)
-        if item:
-            self.repository.delete(item)
-            return item
-        return None
\ No newline at end of file
+        try:
+            return self.repository.delete_by_id(item_id, returning=True)
+        finally:
+            self._invalidate_cache()
+
+    def _cached(self, key: Hashable, loader: Callable[[], R]) -> R:
+        if self.cache is None:
+            return loader()
+        if self.versioned:
+            # Versions only grow, the entries cached before a write are never read again after it
+            key = (self.repository.data_version(), key)
+        return self.cache.get_or_load(self._cache_namespace, key, loader)
+
+    def _invalidate_cache(self) -> None:
+        # Also called when a write fails, a bulk write may have committed some chunks
+        if self.cache is not None:
+            self.cache.invalidate(self._cache_namespace)
@@ -0,0 +1,133 @@
+from dataclasses import replace
+from typing import Any, BinaryIO, Generic, Iterator, List, Optional, Type, TypeVar
+import pyarrow as pa
+from sqlmodel import SQLModel
+from src.infrastructure.ArrowIO import FileFormat, arrow_schema, open_writer
+from src.infrastructure.Columnar import RowFormat
+from src.infrastructure.DownloadServer import DownloadServer
+from src.infrastructure.QuerySpec import QuerySpec
+from src.services.CRUDService import CRUDService
+
+T = TypeVar("T", bound=SQLModel)
+
+class ExportService(Generic[T]):
+    """Streams the result of a query to CSV, Parquet or Arrow IPC.
+
+    The query runs once and its rows are fetched in batches with Core and assembled straight into
+    Arrow (no ORM objects, see CRUDService.iter_columns); each batch is written right away, so
+    memory is bounded by the batch size whatever the size of the export.
+
+    Type Parameters:
+        T: The entity type, must be a SQLModel subclass.
+    """
+
+    def __init__(self, crud_service: CRUDService[T], model: Type[T],
+                 download_server: Optional[DownloadServer] = None, batch_size: int = 10000):
+        """Initialize the export service.
+
+        Args:
+            crud_service (CRUDService[T]): The service used to read the rows.
+            model (Type[T]): The model of the exported rows.
+            download_server (Optional[DownloadServer], optional): Serves the streamed downloads of create_download. Defaults to None.
+            batch_size (int, optional): Rows per fetch and per written batch. Defaults to 10000.
+        Raises:
+            ValueError: If the service or the model is None, or the batch size is not positive.
+        """
+        if crud_service is None:
+            raise ValueError("CRUDService cannot be None")
+        if model is None:
+            raise ValueError("Model cannot be None")
+        if batch_size < 1:
+            raise ValueError("Batch size must be positive")
+        self._crud_service = crud_service
+        self._model = model
+        self._download_server = download_server
+        self._batch_size = batch_size
+        self._columns = tuple(model.model_fields)
+        self._schema = arrow_schema(model)
+
+    @property
+    def model(self) -> Type[T]:
+        return self._model
+
+    @property
+    def streamable(self) -> bool:
+        """Whether create_download can serve streamed downloads."""
+        return self._download_server is not None
+
+    def export(self, sink: str | BinaryIO, file_format: FileFormat | str, spec: Optional[QuerySpec] = None) -> int:
+        """Write the rows matching spec (all rows if None) to a path or binary file.
+
+        Returns:
+            int: The number of rows written.
+
+        Raises:
+            RepositoryError: If the query is invalid or fails.
+        """
+        rows = 0
+        with open_writer(sink, FileFormat(file_format), self._schema) as writer:
+            for batch in self.iter_record_batches(spec):
+                writer.write_batch(batch)
+                rows += batch.num_rows
+        return rows
+
+    def stream(self, file_format: FileFormat | str, spec: Optional[QuerySpec] = None) -> Iterator[bytes]:
+        """The export as chunks of bytes, one or more per batch, produced as the query is read."""
+        buffer = _ChunkBuffer()
+        with open_writer(buffer, FileFormat(file_format), self._schema) as writer:
+            for batch in self.iter_record_batches(spec):
+                writer.write_batch(batch)
+                yield buffer.take()
+        # Footers (Parquet, Arrow) are written when the writer is closed
+        yield buffer.take()
+
+    def create_download(self, file_format: FileFormat | str, spec: Optional[QuerySpec] = None) -> str:
+        """Register a streamed download of the export and return its one-shot URL.
+
+        Raises:
+            ValueError: If the service has no download server.
+        """
+        if self._download_server is None:
+            raise ValueError("Streamed downloads need a download server")
+        file_format = FileFormat(file_format)
+        return self._download_server.register(lambda: self.stream(file_format, spec),
+                                              f"{self._model.__name__}.{file_format.extension}", file_format.mime_type)
+
+    def iter_record_batches(self, spec: Optional[QuerySpec] = None) -> Iterator[pa.RecordBatch]:
+        """The rows matching spec as Arrow record batches of the model schema."""
+        spec = replace(spec or QuerySpec(), columns=self._columns)
+        for table in self._crud_service.iter_columns(spec, self._batch_size, RowFormat.ARROW):
+            yield from table.to_batches()
+
+
+class _ChunkBuffer:
+    """Write-only file object collecting what the Arrow writers write, handed out with take()."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def writable(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
@@ -0,0 +1,215 @@
+import csv
+import time
+from dataclasses import dataclass
+from typing import Annotated, Any, BinaryIO, Callable, Dict, Generic, List, Optional, Tuple, Type, TypeVar
+from typing_extensions import NotRequired, TypedDict
+from pydantic import TypeAdapter, ValidationError
+from sqlmodel import SQLModel
+from src.infrastructure.ArrowIO import FileFormat, count_rows, read_batches, read_columns
+from src.infrastructure.Exceptions.RepositoryExceptions import QueryExecutionError, RepositoryError
+from src.services.CRUDService import CRUDService
+
+T = TypeVar("T", bound=SQLModel)
+
+@dataclass(frozen=True)
+class ImportProgress:
+    """Progress of an import, reported after every batch.
+
+    Attributes:
+        rows_read (int): Rows read from the file so far.
+        rows_imported (int): Rows inserted so far.
+        rows_rejected (int): Rows that failed validation so far.
+        total_rows (Optional[int]): Rows in the file, when known beforehand (Parquet).
+        elapsed (float): Seconds since the start of the import.
+    """
+
+    rows_read: int
+    rows_imported: int
+    rows_rejected: int
+    total_rows: Optional[int]
+    elapsed: float
+
+    @property
+    def fraction(self) -> Optional[float]:
+        """Share of the file processed, None when the number of rows is unknown."""
+        if not self.total_rows:
+            return None
+        return min(self.rows_read / self.total_rows, 1.0)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.elapsed if self.elapsed > 0 else 0.0
+
+
+@dataclass(frozen=True)
+class ImportReport:
+    """Outcome of an import.
+
+    Attributes:
+        rows_read (int): Rows read from the file.
+        rows_imported (int): Rows inserted.
+        rows_rejected (int): Rows written to the reject file instead.
+        seconds (float): Duration of the import.
+        reject_path (Optional[str]): The reject file, None if no rows were rejected or no path was given.
+    """
+
+    rows_read: int
+    rows_imported: int
+    rows_rejected: int
+    seconds: float
+    reject_path: Optional[str]
+
+
+class ImportService(Generic[T]):
+    """Streams CSV or Parquet files into a model with batched inserts.
+
+    The file is read in batches with pyarrow. Each batch is validated against the model fields in
+    one pass of the pydantic validator and the valid rows are inserted with CRUDService.create_items
+    (one multi-row INSERT and one commit per batch). Invalid rows go to a CSV reject file, with the
+    line number and the validation error. A batch refused by the database (e.g. a constraint violation)
+    is inserted again row by row, so that only the offending rows are rejected. Memory is bounded by
+    the batch size.
+
+    Type Parameters:
+        T: The entity type, must be a SQLModel subclass.
+    """
+
+    def __init__(self, crud_service: CRUDService[T], model: Type[T], batch_size: int = 10000):
+        """Initialize the import service.
+
+        Args:
+            crud_service (CRUDService[T]): The service used to insert the rows.
+            model (Type[T]): The model of the imported rows.
+            batch_size (int, optional): Rows per batch, i.e. per validation pass, INSERT and commit. Defaults to 10000.
+        Raises:
+            ValueError: If the service or the model is None, or the batch size is not positive.
+        """
+        if crud_service is None:
+            raise ValueError("CRUDService cannot be None")
+        if model is None:
+            raise ValueError("Model cannot be None")
+        if batch_size < 1:
+            raise ValueError("Batch size must be positive")
+        self._crud_service = crud_service
+        self._model = model
+        self._batch_size = batch_size
+        fields = model.model_fields
+        # Rows are validated as dictionaries with the model fields (types, constraints and defaults):
+        # table models skip validation on construction, and building instances would only slow the import down
+        row_type = TypedDict(f"{model.__name__}ImportRow", {
+            name: Annotated[field.annotation, field] if field.is_required() else NotRequired[Annotated[field.annotation, field]]
+            for name, field in fields.items()
+        })
+        self._batch_validator = TypeAdapter(List[row_type])
+        self._fields = list(fields)
+        self._required = [name for name, field in fields.items() if field.is_required()]
+        # A null in a column with a default means "use the default", e.g. an empty id lets the database generate it
+        self._defaulted = {name: field for name, field in fields.items() if not field.is_required()}
+
+    @property
+    def model(self) -> Type[T]:
+        return self._model
+
+    def import_file(self, source: str | BinaryIO, file_format: Optional[FileFormat | str] = None,
+                    reject_path: Optional[str] = None,
+                    progress: Optional[Callable[[ImportProgress], None]] = None) -> ImportReport:
+        """Import a CSV or Parquet file.
+
+        Args:
+            source (str | BinaryIO): Path or seekable binary file.
+            file_format (Optional[FileFormat | str], optional): csv or parquet. Defaults to the extension of the path or file name.
+            reject_path (Optional[str], optional): CSV file receiving the invalid rows. Defaults to None (rejects are only counted).
+            progress (Optional[Callable[[ImportProgress], None]], optional): Called after every batch. Defaults to None.
+
+        Returns:
+            ImportReport: The number of rows read, imported and rejected.
+
+        Raises:
+            ValueError: If the format is unknown or the file lacks a required column.
+            RepositoryError: If the database cannot be reached; the batches committed before stay imported.
+        """
+        file_format = FileFormat(file_format) if file_format is not None else FileFormat.from_name(getattr(source, "name", source))
+        columns = read_columns(source, file_format)
+        missing = [name for name in self._required if name not in columns]
+        if missing:
+            raise ValueError(f"Missing required columns for {self._model.__name__}: {', '.join(missing)}")
+        columns = [name for name in self._fields if name in columns]
+        if hasattr(source, "seek"):
+            source.seek(0)
+        total_rows = count_rows(source, file_format)
+
+        start = time.perf_counter()
+        rows_read = rows_imported = rows_rejected = 0
+        reject_file = reject_writer = None
+        try:
+            for batch in read_batches(source, file_format, columns, self._batch_size):
+                rows = [{name: value for name, value in row.items() if value is not None or name not in self._defaulted}
+                        for row in batch.to_pylist()]
+                valid, rejected = self._validate(rows)
+                # Every row of a batch gets every column, the defaulted ones included: the batch is one INSERT
+                valid = [(index, self._with_defaults(row)) for index, row in valid]
+                if valid:
+                    imported, refused = self._insert(valid)
+                    rows_imported += imported
+                    rejected = sorted(rejected + refused)
+                if rejected:
+                    if reject_path is not None:
+                        if reject_writer is None:
+                            reject_file = open(reject_path, "w", newline="", encoding="utf-8")
+                            reject_writer = csv.DictWriter(reject_file, fieldnames=["_row", "_error", *columns], extrasaction="ignore")
+                            reject_writer.writeheader()
+                        reject_writer.writerows({"_row": rows_read + index + 1, "_error": error, **rows[index]} for index, error in rejected)
+                    rows_rejected += len(rejected)
+                rows_read += len(rows)
+                if progress is not None:
+                    progress(ImportProgress(rows_read, rows_imported, rows_rejected, total_rows, time.perf_counter() - start))
+        finally:
+            if reject_file is not None:
+                reject_file.close()
+        return ImportReport(rows_read, rows_imported, rows_rejected, time.perf_counter() - start,
+                            reject_path if rows_rejected and reject_path is not None else None)
+
+    def _with_defaults(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """The validated row with the defaults of the fields it lacks."""
+        return {**{name: field.get_default(call_default_factory=True) for name, field in self._defaulted.items() if name not in row}, **row}
+
+    def _insert(self, rows: List[Dict[str, Any]]) -> Tuple[int, List[Tuple[int, str]]]:
+        """
+            Insert the valid rows of a batch, returning the number inserted and (index, error) of the refused ones.
+            Only a batch refused for its data is retried row by row: other errors, such as a locked or
+            unreachable database, are raised.
+        """
+        try:
+            return self._crud_service.create_items([row for _, row in rows], chunk_size=self._batch_size), []
+        except RepositoryError as e:
+            if not _is_refused(e):
+                raise
+        inserted, refused = 0, []
+        for index, row in rows:
+            try:
+                inserted += self._crud_service.create_items([row])
+            except RepositoryError as e:
+                if not _is_refused(e):
+                    raise
+                # The first line of the driver error, without the statement and parameters
+                refused.append((index, f"database: {str(e.__cause__ or e).splitlines()[0]}"))
+        return inserted, refused
+
+    def _validate(self, rows: List[Dict[str, Any]]) -> Tuple[List[Tuple[int, Dict[str, Any]]], List[Tuple[int, str]]]:
+        """Validate a batch in one pass, returning (index, converted row) of the valid rows and (index, error) of the invalid ones."""
+        try:
+            return list(enumerate(self._batch_validator.validate_python(rows))), []
+        except ValidationError as e:
+            errors: Dict[int, List[str]] = {}
+            for error in e.errors():
+                index, *location = error["loc"]
+                errors.setdefault(index, []).append(f"{'.'.join(map(str, location)) or 'row'}: {error['msg']}")
+        # Second pass on the valid rows only, which cannot fail
+        indexes = [index for index in range(len(rows)) if index not in errors]
+        valid_rows = self._batch_validator.validate_python([rows[index] for index in indexes])
+        return list(zip(indexes, valid_rows)), [(index, "; ".join(messages)) for index, messages in sorted(errors.items())]
+
+
+def _is_refused(error: RepositoryError) -> bool:
+    # A statement refused by the database (constraint, data type), possibly wrapped by CRUDService
+    return isinstance(error, QueryExecutionError) or isinstance(error.__cause__, QueryExecutionError)
@@ -0,0 +1,95 @@
+import time
+from types import GeneratorType
+from typing import Any, Callable, Generic, Iterator, Optional, TypeVar
+import pandas as pd
+import pyarrow as pa
+from sqlmodel import SQLModel
+from src.infrastructure.Metrics import ROW_BUCKETS, MetricsRegistry
+from src.infrastructure.Pagination import KeysetPage
+from src.services.CRUDService import CRUDService
+
+T = TypeVar("T", bound=SQLModel)
+
+class InstrumentedCRUDService(Generic[T]):
+    """Wraps a CRUD service and records the latency, rows returned and errors of its public methods.
+
+    Every public method of the wrapped service is available unchanged, with the metrics
+    service_call_seconds, service_rows_returned and service_errors_total labelled by model and
+    operation (the method name). Streaming methods are timed until their iterator is exhausted.
+
+    Attributes:
+        service (CRUDService[T]): The wrapped service.
+        registry (MetricsRegistry): Where the metrics are recorded.
+    """
+
+    def __init__(self, service: CRUDService[T], registry: MetricsRegistry, model_name: Optional[str] = None):
+        """Initialize the wrapper.
+
+        Args:
+            service (CRUDService[T]): The service to instrument.
+            registry (MetricsRegistry): Where the metrics are recorded.
+            model_name (Optional[str], optional): Value of the model label. Defaults to the repository model name.
+        Raises:
+            ValueError: If the service or the registry is None.
+        """
+        if service is None:
+            raise ValueError("Service cannot be None")
+        if registry is None:
+            raise ValueError("Registry cannot be None")
+        self.service = service
+        self.registry = registry
+        model = getattr(getattr(service, "repository", None), "model", None)
+        self.model_name = model_name or getattr(model, "__name__", type(service).__name__)
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.service, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+        wrapper = self._instrument(name, attribute)
+        # Cached on the instance, __getattr__ is only called for the first lookup
+        self.__dict__[name] = wrapper
+        return wrapper
+
+    def _instrument(self, operation: str, method: Callable[..., Any]) -> Callable[..., Any]:
+        def instrumented(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            except Exception:
+                self._record(operation, start, None, failed=True)
+                raise
+            if isinstance(result, GeneratorType):
+                return self._instrument_iterator(operation, start, result)
+            self._record(operation, start, _row_count(result))
+            return result
+        instrumented.__name__ = operation
+        instrumented.__doc__ = method.__doc__
+        return instrumented
+
+    def _instrument_iterator(self, operation: str, start: float, batches: Iterator[Any]) -> Iterator[Any]:
+        rows = 0
+        try:
+            for batch in batches:
+                rows += _row_count(batch) or 0
+                yield batch
+        except Exception:
+            self._record(operation, start, rows, failed=True)
+            raise
+        self._record(operation, start, rows)
+
+    def _record(self, operation: str, start: float, rows: Optional[int], failed: bool = False) -> None:
+        labels = {"model": self.model_name, "operation": operation}
+        self.registry.observe("service_call_seconds", time.perf_counter() - start, **labels)
+        if rows is not None:
+            self.registry.observe("service_rows_returned", rows, buckets=ROW_BUCKETS, **labels)
+        if failed:
+            self.registry.increment("service_errors_total", **labels)
+
+
+def _row_count(result: Any) -> Optional[int]:
+    # Only results that are collections of rows have a row count
+    if isinstance(result, KeysetPage):
+        return len(result.items)
+    if isinstance(result, (list, pd.DataFrame, pa.Table)):
+        return len(result)
+    return None
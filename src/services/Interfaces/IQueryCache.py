@@ -0,0 +1,49 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Hashable, TypeVar
+
+R = TypeVar("R")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Counters to size a query cache."""
+
+    hits: int
+    misses: int
+    invalidations: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class IQueryCache(ABC):
+    """
+        Interface: read-through cache for service queries.
+        Entries are grouped in namespaces (one per model), a write invalidates the whole namespace.
+        Cached values are shared between callers and must be treated as read-only.
+    """
+
+    @abstractmethod
+    def get_or_load(self, namespace: str, key: Hashable, loader: Callable[[], R]) -> R:
+        """Return the cached value for key in namespace, calling loader and caching its result on a miss."""
+        pass
+
+    @abstractmethod
+    def invalidate(self, namespace: str) -> None:
+        """Invalidate every entry of a namespace."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every entry."""
+        pass
+
+    @abstractmethod
+    def stats(self) -> CacheStats:
+        """Return hit, miss and size counters."""
+        pass
@@ -0,0 +1,73 @@
+import threading
+from typing import Callable, Dict, Generic, Iterator, Mapping, Optional, Sequence, Type, TypeVar
+from sqlmodel import SQLModel
+from src.infrastructure.DownloadServer import DownloadServer
+from src.infrastructure.ModelRegistry import ModelRegistry
+from src.services.CRUDService import CRUDService
+from src.services.ExportService import ExportService
+from src.services.ImportService import ImportService
+
+V = TypeVar("V")
+
+
+class LazyMapping(Mapping[str, V], Generic[V]):
+    """A mapping with fixed keys whose values are built by factory on first access, then cached."""
+
+    def __init__(self, keys: Sequence[str], factory: Callable[[str], V]):
+        self._keys = list(keys)
+        self._key_set = frozenset(self._keys)
+        self._factory = factory
+        self._values: Dict[str, V] = {}
+        # Sessions run in their own threads, a value must be built only once
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key: str) -> V:
+        try:
+            return self._values[key]
+        except KeyError:
+            if key not in self._key_set:
+                raise
+        with self._lock:
+            if key not in self._values:
+                self._values[key] = self._factory(key)
+            return self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def built(self) -> int:
+        """Number of values built so far."""
+        return len(self._values)
+
+
+class ServiceRegistry:
+    """The services of the registered models, built the first time they are used.
+
+    Startup only discovers the model names; the repository and the services of a model are created
+    when a page or a tool first asks for them, so their cost follows the models actually used.
+    """
+
+    def __init__(self, models: ModelRegistry, crud_service_factory: Callable[[Type[SQLModel]], CRUDService],
+                 download_server: Optional[DownloadServer] = None, export_batch_size: int = 10000):
+        """
+            crud_service_factory builds the CRUD service of a model (repository, cache, instrumentation).
+            download_server serves the streamed exports, see ExportService.
+        """
+        if models is None:
+            raise ValueError("Model registry cannot be None")
+        if crud_service_factory is None:
+            raise ValueError("CRUD service factory cannot be None")
+        self._models = models
+        names = models.names()
+        self.crud_services: LazyMapping[CRUDService] = LazyMapping(names, lambda name: crud_service_factory(models.get(name)))
+        self.export_services: LazyMapping[ExportService] = LazyMapping(
+            names, lambda name: ExportService(self.crud_services[name], models.get(name), download_server, batch_size=export_batch_size))
+        self.import_services: LazyMapping[ImportService] = LazyMapping(
+            names, lambda name: ImportService(self.crud_services[name], models.get(name)))
+
+    @property
+    def models(self) -> ModelRegistry:
+        return self._models
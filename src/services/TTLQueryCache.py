@@ -0,0 +1,71 @@
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Hashable, TypeVar
+from cachetools import TTLCache
+
+from src.services.Interfaces.IQueryCache import CacheStats, IQueryCache
+
+R = TypeVar("R")
+
+
+class TTLQueryCache(IQueryCache):
+    """
+        In-process query cache: entries expire after ttl seconds and the least recently used ones
+        are evicted once maxsize entries are stored.
+
+        Invalidation is O(1): every namespace has a generation that is part of the keys, bumping it
+        makes the old entries unreachable and they age out through TTL/LRU eviction.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0, timer: Callable[[], float] = time.monotonic):
+        if maxsize < 1:
+            raise ValueError("Maxsize must be positive")
+        if ttl <= 0:
+            raise ValueError("TTL must be positive")
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl, timer=timer)
+        self._generations: Dict[str, int] = defaultdict(int)
+        # cachetools caches are not thread safe and Streamlit sessions run on different threads
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get_or_load(self, namespace: str, key: Hashable, loader: Callable[[], R]) -> R:
+        with self._lock:
+            generation = self._generations[namespace]
+            cache_key = (namespace, generation, key)
+            try:
+                value = self._cache[cache_key]
+            except KeyError:
+                self._misses += 1
+            else:
+                self._hits += 1
+                return value
+
+        # Load outside of the lock so a slow query does not block the other sessions
+        value = loader()
+        with self._lock:
+            # A write that happened while loading may have made the value stale already
+            if self._generations[namespace] == generation:
+                self._cache[cache_key] = value
+        return value
+
+    def invalidate(self, namespace: str) -> None:
+        with self._lock:
+            self._generations[namespace] += 1
+            self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                invalidations=self._invalidations,
+                size=len(self._cache),
+                maxsize=int(self._cache.maxsize),
+            )
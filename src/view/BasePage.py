@@ -7,14 +7,16 @@ class BasePage(IStreamLitPage):
         if sections is None:
             raise ValueError("Sections cannot be None")
         self._sections = sections
-        self._current_section_key = list(self._sections.keys())[0]
+        # Built once: the menu is the same for every rerun
+        self._menu_options = list(sections.keys())
 
     def render(self, *args, **kwargs) -> None: 
-        self._current_section_key = st.sidebar.selectbox("Sections", self.__get_menu_options())
-        self.__get_current_section().render(*args, **kwargs)
+        # The page is shared between sessions, so the selection is kept local to this rerun.
+        current_section_key = st.sidebar.selectbox("Sections", self.__get_menu_options())
+        self.__get_section(current_section_key).render(*args, **kwargs)
 
     def __get_menu_options(self):
-        return list(self._sections.keys())
+        return self._menu_options
     
-    def __get_current_section(self) -> IStreamLitPage:
-        return self._sections[self._current_section_key]
\ No newline at end of file
+    def __get_section(self, section_key: str) -> IStreamLitPage:
+        return self._sections[section_key]
\ No newline at end of file
@@ -0,0 +1,49 @@
+from datetime import datetime
+from typing import override
+import pandas as pd
+import streamlit as st
+from src.infrastructure.Metrics import MetricsRegistry
+from src.view.Interfaces.IStreamLitPage import IStreamLitPage
+
+class DiagnosticsPage(IStreamLitPage):
+    """Shows the metrics of the process: latency histograms, counters and the slow query log."""
+
+    def __init__(self, registry: MetricsRegistry):
+        if registry is None:
+            raise ValueError("Registry cannot be None")
+        self._registry = registry
+
+    @override
+    def render(self, *args, **kwargs) -> None:
+        st.title("Diagnostics")
+
+        for name, series in sorted(self._registry.histograms().items()):
+            st.subheader(name)
+            rows = [{**dict(labels), **{key: value for key, value in summary.items() if key != "buckets"}}
+                    for labels, summary in series.items()]
+            st.dataframe(pd.DataFrame.from_records(rows), hide_index=True)
+
+        counters = [{"counter": name, **dict(labels), "value": value}
+                    for name, series in sorted(self._registry.counters().items()) for labels, value in series.items()]
+        if counters:
+            st.subheader("Counters")
+            st.dataframe(pd.DataFrame.from_records(counters), hide_index=True)
+
+        st.subheader("Slow queries")
+        slow_queries = self._registry.slow_queries()
+        if slow_queries:
+            st.dataframe(pd.DataFrame.from_records([{
+                "time": datetime.fromtimestamp(slow_query.timestamp),
+                "engine": slow_query.engine,
+                "ms": round(slow_query.seconds * 1000, 1),
+                "statement": slow_query.statement,
+            } for slow_query in reversed(slow_queries)]), hide_index=True)
+        else:
+            st.write("No slow queries.")
+
+        left, right, reset = st.columns(3)
+        left.download_button("Prometheus metrics", self._registry.to_prometheus(), "metrics.txt", "text/plain")
+        right.download_button("JSON metrics", self._registry.to_json(), "metrics.json", "application/json")
+        if reset.button("Reset"):
+            self._registry.reset()
+            st.rerun()
@@ -1,8 +1,19 @@
-from typing import Any, Type, TypeVar, override
+import io
+from typing import Any, Optional, Tuple, Type, TypeVar, override
 from sqlmodel import SQLModel
 import streamlit as st
 
+from src.infrastructure.Exceptions.RepositoryExceptions import InvalidQueryError, RepositoryError
+from src.infrastructure.Aggregation import Aggregate, AggregateFunction, numeric_fields
+from src.infrastructure.ArrowIO import FileFormat
+from src.infrastructure.Columnar import RowFormat
+from src.infrastructure.DataVersion import has_change_log
+from src.infrastructure.FullTextSearch import searchable_fields
+from src.infrastructure.Pagination import KeysetPage
+from src.infrastructure.QuerySpec import FilterOperator, QuerySpec, SortOrder, parse_filter
 from src.services.CRUDService import CRUDService
+from src.services.ExportService import ExportService
+from src.view.GenericCRUDPage.PageDelta import merge_changes
 from src.view.Interfaces.IStreamLitPage import IStreamLitPage
 from src.view.Interfaces.IStreamLitFormStrategy import IStreamLitForm
 
@@ -12,7 +23,11 @@ class BaseCRUDPage(IStreamLitPage):
 
     def __init__(self, 
                  CRUDService: CRUDService[Any], type : Type[Any],
-                 form_strategy: IStreamLitForm[Any]):
+                 form_strategy: IStreamLitForm[Any],
+                 page_size: int = 10,
+                 export_service: Optional[ExportService[Any]] = None,
+                 search_limit: int = 50,
+                 group_limit: int = 100):
         if CRUDService is None:
             raise ValueError("CRUDService cannot be None")
         self._CrudService = CRUDService
@@ -22,6 +37,16 @@ class BaseCRUDPage(IStreamLitPage):
         if form_strategy is None:
             raise ValueError("Form strategy cannot be None")
         self._form_strategy = form_strategy
+        if page_size < 1:
+            raise ValueError("Page size must be positive")
+        self._page_size = page_size
+        self._export_service = export_service
+        if search_limit < 1:
+            raise ValueError("Search limit must be positive")
+        self._search_limit = search_limit
+        if group_limit < 1:
+            raise ValueError("Group limit must be positive")
+        self._group_limit = group_limit
 
     @override
     def render(self, *args, **kwargs) -> None:
@@ -39,10 +64,184 @@ class BaseCRUDPage(IStreamLitPage):
 
         # View
         st.subheader(self._get_view_subtitle())
-        data = self._CrudService.get_items()
-        for entry in data:
-            st.write(f"Name: {entry.name}, Value: {entry.value}, Description: {entry.description}")
+        if self._render_search():
+            # The best matches replace the paged table while a search is entered
+            return
+        spec, order_by, descending = self._render_query_controls()
 
+        # A different filter or sort invalidates the cursor, start again from the first page
+        cursor_key = f"{self._type.__name__}_cursor"
+        query_key = f"{self._type.__name__}_query"
+        if st.session_state.get(query_key) != (spec, order_by, descending):
+            st.session_state[query_key] = (spec, order_by, descending)
+            st.session_state[cursor_key] = None
+
+        page_size = st.session_state.get(f"{self._type.__name__}_page_size", self._page_size)
+        page = self._read_page(spec, order_by, descending, st.session_state.get(cursor_key), page_size)
+        # One element for the whole page instead of one element per row
+        st.dataframe(page.items, hide_index=True)
+
+        previous_column, size_column, next_column = st.columns(3)
+        page_size_options = sorted({self._page_size, 10, 50, 100, 500})
+        size_column.selectbox("Rows per page", page_size_options, index=page_size_options.index(self._page_size),
+                              key=f"{self._type.__name__}_page_size", label_visibility="collapsed")
+        if previous_column.button("Previous", key=f"{cursor_key}_previous", disabled=page.previous_cursor is None):
+            st.session_state[cursor_key] = page.previous_cursor
+            st.rerun()
+        if next_column.button("Next", key=f"{cursor_key}_next", disabled=page.next_cursor is None):
+            st.session_state[cursor_key] = page.next_cursor
+            st.rerun()
+
+        self._render_summary(spec)
+
+        # Export
+        if self._export_service is not None:
+            self._render_export(spec, order_by, descending)
+        self._render_query_plan(spec, order_by, descending)
+
+    def _read_page(self, spec: Optional[QuerySpec], order_by: str, descending: bool, cursor: Optional[str],
+                   page_size: int) -> KeysetPage[Any]:
+        """
+            The page to display, kept in the session with the data version it was read at. On the next
+            reruns of models with a change log only the rows changed since then are read and merged into it,
+            see PageDelta; the others read the page again, from the query cache while the data is unchanged.
+        """
+        view_key = f"{self._type.__name__}_view"
+        request = (spec, order_by, descending, cursor, page_size)
+        view = st.session_state.get(view_key)
+        page = None
+        if view is not None and view[0] == request and view[1] is not None and has_change_log(self._type):
+            changes = self._CrudService.changes_since(view[1], limit=page_size, row_format=RowFormat.DATAFRAME)
+            filter_fields = [field_filter.field for field_filter in spec.filters] if spec else []
+            # Expired: the log was compacted since the page was read, which is read again
+            if not changes.expired:
+                page = view[2] if not len(changes) else merge_changes(view[2], changes, order_by, descending, filter_fields)
+            token = changes.token
+        if page is None:
+            # Read before the page: a write in between is in the page and in the next changes, merged idempotently
+            token = self._CrudService.data_version()
+            # Display only: the page is read as a DataFrame straight from the database, without model instances
+            page = self._CrudService.get_columns_by_cursor(cursor, limit=page_size, order_by=order_by,
+                                                           descending=descending, spec=spec, row_format=RowFormat.DATAFRAME)
+        st.session_state[view_key] = (request, token, page)
+        return page
+
+    def _render_search(self) -> bool:
+        """Render the search box of searchable models and the best matches, returning whether a search was shown."""
+        if not searchable_fields(self._type):
+            return False
+        key = f"{self._type.__name__}_search"
+        search_query = st.text_input("Search", key=key, placeholder=f"Search {', '.join(searchable_fields(self._type))}")
+        if not search_query.strip():
+            return False
+        try:
+            results = self._CrudService.search_items(search_query, limit=self._search_limit, row_format=RowFormat.DATAFRAME)
+        except RepositoryError as e:
+            st.warning(f"Search failed: {e}")
+            return True
+        st.caption(f"{len(results)} best matches" if len(results) else "No matches")
+        st.dataframe(results, hide_index=True)
+        return True
+
+    def _render_query_controls(self) -> Tuple[Optional[QuerySpec], str, bool]:
+        """Render the filter and sort controls, returning the filters, the sort field and the direction."""
+        fields = list(self._type.model_fields)
+        key = f"{self._type.__name__}_query"
+        with st.expander("Filter and sort"):
+            field_column, operator_column, value_column = st.columns(3)
+            filter_field = field_column.selectbox("Filter by", ["", *fields], key=f"{key}_filter_field")
+            operator = operator_column.selectbox("Operator", [operator.value for operator in FilterOperator], key=f"{key}_operator")
+            raw_value = value_column.text_input("Value", key=f"{key}_value",
+                                                help="Comma separated values for 'in' and 'between', a pattern such as %term% for 'like'.")
+            sort_column, direction_column = st.columns(2)
+            order_by = sort_column.selectbox("Sort by", fields, key=f"{key}_order_by")
+            descending = direction_column.checkbox("Descending", key=f"{key}_descending")
+
+        spec = None
+        if filter_field and raw_value:
+            try:
+                spec = QuerySpec(filters=[parse_filter(self._type, filter_field, operator, raw_value)])
+            except InvalidQueryError as e:
+                st.warning(f"Invalid filter on {filter_field}: {e}")
+        return spec, order_by, descending
+
+    def _render_export(self, spec: Optional[QuerySpec], order_by: str, descending: bool) -> None:
+        """Render the export of the filtered and sorted rows, all pages included."""
+        key = f"{self._type.__name__}_export"
+        with st.expander("Export"):
+            file_format = FileFormat(st.selectbox("Format", [file_format.value for file_format in FileFormat], key=f"{key}_format"))
+            export_spec = QuerySpec(filters=spec.filters if spec else (), order_by=(SortOrder(order_by, descending),))
+            if st.button("Prepare download", key=f"{key}_prepare"):
+                if not self._export_service.streamable:
+                    self._render_memory_download(file_format, export_spec)
+                else:
+                    try:
+                        # The file is produced while it is downloaded, from a one-shot link
+                        url = self._export_service.create_download(file_format, export_spec)
+                        st.session_state[f"{key}_link"] = (file_format, export_spec, url)
+                    except OSError as e:
+                        # The download server could not start, e.g. its port is taken by another instance
+                        st.warning(f"Download server unavailable ({e}), the file is prepared in memory")
+                        self._render_memory_download(file_format, export_spec)
+            # A link prepared for another format or query is not shown
+            link = st.session_state.get(f"{key}_link")
+            if link is not None and link[:2] == (file_format, export_spec):
+                st.link_button(f"Download {self._type.__name__}.{file_format.extension}", link[2])
+
+    def _render_memory_download(self, file_format: FileFormat, export_spec: QuerySpec) -> None:
+        """Render a download button of the whole export, built in memory."""
+        # Without a download server Streamlit holds the whole file in memory
+        buffer = io.BytesIO()
+        try:
+            self._export_service.export(buffer, file_format, export_spec)
+        except RepositoryError as e:
+            st.error(f"Export failed: {e}")
+            return
+        st.download_button(f"Download {self._type.__name__}.{file_format.extension}", buffer.getvalue(),
+                           f"{self._type.__name__}.{file_format.extension}", file_format.mime_type,
+                           key=f"{self._type.__name__}_export_download")
+
+    def _render_summary(self, spec: Optional[QuerySpec]) -> None:
+        """Render the statistics of the numeric fields and the groups of a field for the current filter, on demand."""
+        key = f"{self._type.__name__}_summary"
+        with st.expander("Summary"):
+            # Aggregating reads every matching row, only do it when asked
+            if not st.toggle("Compute statistics", key=key):
+                return
+            group_by = st.selectbox("Group by", ["", *self._type.model_fields], key=f"{key}_group_by")
+            try:
+                summary = self._CrudService.summarize_items(spec)
+                st.caption(f"{summary.count} matching rows")
+                if summary.fields:
+                    st.dataframe(summary.fields, hide_index=True)
+                if group_by:
+                    aggregates = [Aggregate(AggregateFunction.COUNT)] + [Aggregate(AggregateFunction.AVG, field)
+                                                                         for field in numeric_fields(self._type) if field != group_by]
+                    groups = self._CrudService.aggregate_items(aggregates, (group_by,), spec, limit=self._group_limit,
+                                                               row_format=RowFormat.DATAFRAME)
+                    st.dataframe(groups, hide_index=True)
+                    if len(groups) == self._group_limit:
+                        st.caption(f"First {self._group_limit} groups")
+            except RepositoryError as e:
+                st.warning(f"Summary failed: {e}")
+
+    def _render_query_plan(self, spec: Optional[QuerySpec], order_by: str, descending: bool) -> None:
+        """Render the query plans of the current filter and sort, with the indexes they miss, on demand."""
+        key = f"{self._type.__name__}_query_plan"
+        with st.expander("Query plan"):
+            if not st.button("Explain", key=key):
+                return
+            explain_spec = QuerySpec(filters=spec.filters if spec else (), order_by=(SortOrder(order_by, descending),))
+            try:
+                advices = self._CrudService.explain_queries(explain_spec, order_by, descending)
+            except RepositoryError as e:
+                st.warning(f"Explain failed: {e}")
+                return
+            for advice in advices:
+                st.code(f"{advice.statement}\n\n" + "\n".join(advice.plan), language="sql")
+                if advice.needs_index:
+                    st.warning(f"Scans or sorts every row ({'; '.join(advice.full_scans)}). Add {advice.columns} to "
+                               f"__indexes__ of {self._type.__name__}, or run: {advice.create_statement}")
 
     """
         Template methods.
@@ -1,5 +1,4 @@
 from typing import Generic, Optional, Type, TypeVar, override
-from pydantic_core import PydanticUndefined
 from sqlmodel import SQLModel
 import streamlit as st
 
@@ -7,6 +6,7 @@ import streamlit as st
 from dependency_injector.wiring import Provide, inject
 from src.containers.GenericCRUDPageContainer import GenericCRUDPageContainer
 
+from src.view.GenericCRUDPage.FormSchema import FormSchema, form_schema
 from src.view.GenericCRUDPage.StreamLitFieldDispatcher import IStreamLitField
 from src.view.Interfaces.IStreamLitFormStrategy import IStreamLitForm
 
@@ -24,6 +24,11 @@ class BaseStreamLitForm(IStreamLitForm[T], Generic[T]):
         self._field_renderers = field_renderers
 
 
+    @property
+    def schema(self) -> FormSchema:
+        """The compiled form schema of the model, built once and shared by every rerun."""
+        return form_schema(self._model_class, self._field_renderers)
+
     @override
     def render_form(self, model: Optional[T] = None, form_key: str = "form") -> None:
         with st.form(key=form_key):
@@ -31,28 +36,20 @@ class BaseStreamLitForm(IStreamLitForm[T], Generic[T]):
             
             form_data = {}
             
-            for field_name, field_info in self._model_class.model_fields.items():
-                
+            for field in self.schema.fields:
+                if field.renderer is None:
+                    st.warning(field.error)
+                    continue  # Salta campi non supportati
+
                 # Ottieni il valore di default dal modello esistente o dai metadati del field
-                default_value = None
-                if model:
-                    default_value = getattr(model, field_name, None)  
-                elif field_info.default is not None and field_info.default != PydanticUndefined:
-                    default_value = field_info.default
-                elif field_info.default_factory is not None and field_info.default_factory != PydanticUndefined:
-                    default_value = field_info.default_factory()
-                
-                # Genera label dal nome del field
-                label = field_name.replace("_", " ").title()
-                widget_key = f"{form_key}_{field_name}"
-        
-                # Auto-detect tipi base
+                default_value = getattr(model, field.name, None) if model else field.default()
+
                 try:
-                    field_renderer =  self._field_renderers.render_field(label, field_info, default_value, widget_key)
+                    value = field.renderer.render_field(field.label, field.field_info, default_value, field.widget_key(form_key))
                 except ValueError as e:
                     st.warning(str(e))
                     continue  # Salta campi non supportati
-                form_data[field_name] = field_renderer
+                form_data[field.name] = field.to_value(value)
             
             submitted = st.form_submit_button("Submit")
             
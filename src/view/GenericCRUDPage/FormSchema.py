@@ -0,0 +1,148 @@
+import enum
+import types
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Annotated, Any, Dict, Hashable, Mapping, Optional, Tuple, Type, TypeVar, Union, get_args, get_origin
+from pydantic.fields import FieldInfo
+from pydantic_core import PydanticUndefined
+from sqlmodel import SQLModel
+
+if TYPE_CHECKING:
+    from src.view.GenericCRUDPage.StreamLitFieldDispatcher import IStreamLitField
+
+"""
+Compiled form schemas.
+
+Everything a form needs to know about the fields of a model (label, normalized type, renderer,
+default) only depends on the model class, so it is worked out once per model and renderer set
+instead of on every Streamlit rerun. A rerun then only renders the widgets.
+"""
+
+R = TypeVar("R")
+
+
+def normalize_annotation(annotation: Any) -> Tuple[Any, bool]:
+    """
+        The type a field is rendered as, and whether it accepts None.
+        Annotated is unwrapped and Optional[X] (or X | None) becomes (X, True).
+    """
+    optional = False
+    while True:
+        origin = get_origin(annotation)
+        if origin is Annotated:
+            annotation = get_args(annotation)[0]
+        elif origin in (Union, types.UnionType):
+            arguments = [argument for argument in get_args(annotation) if argument is not type(None)]
+            optional = optional or len(arguments) < len(get_args(annotation))
+            if len(arguments) != 1:
+                # A real union, e.g. int | str, has no single renderer
+                return Union[tuple(arguments)], optional
+            annotation = arguments[0]
+        else:
+            return annotation, optional
+
+
+def find_renderer(renderers: Mapping[Any, R], annotation: Any) -> Optional[R]:
+    """
+        The renderer of an annotation: the one of its normalized type, else the one of enum.Enum for
+        an enum, else the one of its nearest registered base class, None if there is none.
+    """
+    field_type, _ = normalize_annotation(annotation)
+    renderer = renderers.get(field_type)
+    if renderer is None and isinstance(field_type, type):
+        # Before the other bases: IntEnum and StrEnum also derive from int and str
+        if issubclass(field_type, enum.Enum) and enum.Enum in renderers:
+            return renderers[enum.Enum]
+        renderer = next((renderers[base] for base in field_type.__mro__[1:] if base in renderers), None)
+    return renderer
+
+
+@dataclass(frozen=True)
+class FormField:
+    """A model field ready to be rendered.
+
+    Attributes:
+        name (str): The field name, also the suffix of the widget key.
+        label (str): The widget label.
+        field_info (FieldInfo): The pydantic field, passed on to the renderer.
+        field_type (Any): The annotation without Optional and Annotated.
+        optional (bool): Whether the field accepts None; an empty text is then submitted as None.
+        renderer (Optional[IStreamLitField]): The renderer of the field, None when no renderer handles its type.
+        error (Optional[str]): Why the field cannot be rendered, when renderer is None.
+    """
+
+    name: str
+    label: str
+    field_info: FieldInfo
+    field_type: Any
+    optional: bool
+    renderer: Optional["IStreamLitField"]
+    error: Optional[str] = None
+
+    def default(self) -> Any:
+        """The default value of the field, calling its default factory if it has one."""
+        if self.field_info.default is not PydanticUndefined and self.field_info.default is not None:
+            return self.field_info.default
+        if self.field_info.default_factory is not None:
+            return self.field_info.default_factory()
+        return None
+
+    def widget_key(self, form_key: str) -> str:
+        return f"{form_key}_{self.name}"
+
+    def to_value(self, widget_value: Any) -> Any:
+        """The submitted value of the field from the value of its widget."""
+        if self.optional and widget_value == "":
+            return None
+        return widget_value
+
+
+@dataclass(frozen=True)
+class FormSchema:
+    """The fields of a model form, in declaration order."""
+
+    model: Type[SQLModel]
+    fields: Tuple[FormField, ...]
+
+    @classmethod
+    def compile(cls, model: Type[SQLModel], field_renderers: "IStreamLitField") -> "FormSchema":
+        """
+            Build the schema of model, resolving a renderer per field when field_renderers is a dispatcher
+            (it has a resolve method); any other renderer renders every field. Prefer form_schema, which caches it.
+        """
+        resolve = getattr(field_renderers, "resolve", None)
+        fields = []
+        for name, field_info in model.model_fields.items():
+            field_type, optional = normalize_annotation(field_info.annotation)
+            renderer, error = field_renderers, None
+            if resolve is not None:
+                try:
+                    renderer = resolve(field_info.annotation)
+                except ValueError as e:
+                    renderer, error = None, str(e)
+            fields.append(FormField(name, field_info.title or name.replace("_", " ").title(), field_info,
+                                    field_type, optional, renderer, error))
+        return cls(model, tuple(fields))
+
+
+def renderer_set_key(field_renderers: "IStreamLitField") -> Hashable:
+    """
+        What a compiled schema depends on in a renderer set: the renderer class registered for each
+        type of a dispatcher (it has a renderers mapping), the class of any other renderer.
+    """
+    renderers = getattr(field_renderers, "renderers", None)
+    if renderers is None:
+        return type(field_renderers)
+    return frozenset((annotation, type(renderer)) for annotation, renderer in renderers.items())
+
+
+# Keyed by model and renderer set, not by renderer instance: the container builds a dispatcher per form
+_schemas: Dict[Tuple[Type[SQLModel], Hashable], FormSchema] = {}
+
+
+def form_schema(model: Type[SQLModel], field_renderers: "IStreamLitField") -> FormSchema:
+    """The compiled schema of model with these renderers, built on the first call for the model and renderer set."""
+    key = (model, renderer_set_key(field_renderers))
+    schema = _schemas.get(key)
+    if schema is None:
+        schema = _schemas[key] = FormSchema.compile(model, field_renderers)
+    return schema
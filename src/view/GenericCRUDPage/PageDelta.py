@@ -0,0 +1,67 @@
+from dataclasses import replace
+from typing import Optional, Sequence
+import pandas as pd
+from src.infrastructure.DataVersion import ChangeSet
+from src.infrastructure.Pagination import KeysetPage
+
+"""
+Refresh of a displayed keyset page from the changes of its table (see DataVersion).
+
+The changes of the rows shown are applied in place, the deleted ones are removed and the changes
+of the other rows are ignored. When a change may make a row enter the page or move in it, or a
+deletion would pull up the first row of the next page, the page cannot be patched: merge_changes
+returns None and the page has to be read again.
+"""
+
+
+def _sort_key(value, item_id) -> tuple:
+    # NULLs sort before every value, i.e. first ascending and last descending, like the keyset queries
+    return (0, 0, item_id) if pd.isna(value) else (1, value, item_id)
+
+
+def merge_changes(page: KeysetPage[pd.DataFrame], changes: ChangeSet[pd.DataFrame], order_by: str, descending: bool,
+                  filter_fields: Sequence[str] = ()) -> Optional[KeysetPage[pd.DataFrame]]:
+    """
+        The page, a DataFrame of every field read with get_columns_by_cursor, with changes applied,
+        or None if it must be read again.
+        order_by and descending are the sort of the page, filter_fields the fields its filters test.
+    """
+    if changes.has_more:
+        return None
+    if page.next_cursor is not None and page.items["id"].isin(changes.deleted_ids).any():
+        # The rows after the deleted ones move up, the first ones of the next page into this one
+        return None
+    frame = page.items.set_index("id", drop=False)
+    changed = changes.items.set_index("id", drop=False)
+    on_page = changed.index.isin(frame.index)
+
+    # A row of the page whose sort value changed may move, one whose filtered fields changed may leave
+    watched = list(dict.fromkeys([order_by, *filter_fields]))
+    before = frame.loc[changed.index[on_page], watched].astype(object)
+    after = changed.loc[on_page, watched].astype(object)
+    if not before.equals(after):
+        return None
+
+    # Another row may enter the page if it sorts between the first and the last row shown. Whether it
+    # matches the filters would take evaluating them here, so any change of another row of a filtered
+    # view reloads the page.
+    outside = changed[~on_page]
+    if len(outside):
+        if filter_fields or frame.empty:
+            return None
+        keys = list(map(_sort_key, frame[order_by], frame["id"]))
+        try:
+            for key in map(_sort_key, outside[order_by], outside["id"]):
+                after_first = page.previous_cursor is None or (key < keys[0] if descending else key > keys[0])
+                before_last = page.next_cursor is None or (key > keys[-1] if descending else key < keys[-1])
+                if after_first and before_last:
+                    return None
+        except TypeError:
+            # Values that do not compare, e.g. of mixed types
+            return None
+
+    merged = frame.drop(index=[item_id for item_id in changes.deleted_ids if item_id in frame.index])
+    updated = changed.index[on_page]
+    if len(updated):
+        merged.loc[updated, changed.columns] = changed.loc[updated, changed.columns]
+    return replace(page, items=merged.reset_index(drop=True))
@@ -1,6 +1,9 @@
+import datetime
+import enum
 from typing import Any, Optional, override
 from pydantic.fields import FieldInfo
 import streamlit as st
+from src.view.GenericCRUDPage.FormSchema import find_renderer, normalize_annotation
 
 """
    This could be done better, but it's only for the base CRUD Page.
@@ -20,19 +23,41 @@ class IStreamLitField(ABC):
 
 
 class StreamLitFieldDispatcher(IStreamLitField):
-    """Dispatcher for StreamLit form fields."""
+    """Dispatcher for StreamLit form fields.
+
+    Renderers are looked up with find_renderer: by the annotation without Optional and Annotated,
+    then by enum.Enum for enums (IntEnum and StrEnum included), then by its base classes.
+    Lookups are cached per annotation.
+    """
 
     def __init__(self, dispatcher: dict[type, IStreamLitField]):
         if dispatcher is None:
             raise ValueError("Dispatcher cannot be None")
         self._dispatcher = dispatcher
+        self._resolved: dict[Any, Optional[IStreamLitField]] = {}
+
+    @property
+    def renderers(self) -> dict[type, IStreamLitField]:
+        """The renderers by type."""
+        return self._dispatcher
+
+    def resolve(self, annotation: Any) -> IStreamLitField:
+        """The renderer of a field annotation. Raises ValueError when no renderer handles it."""
+        try:
+            field_renderer = self._resolved[annotation]
+        except (KeyError, TypeError):
+            field_renderer = find_renderer(self._dispatcher, annotation)
+            try:
+                self._resolved[annotation] = field_renderer
+            except TypeError:
+                pass  # unhashable annotation, resolved again next time
+        if field_renderer is None:
+            raise ValueError(f"No field renderer found for type: {annotation}")
+        return field_renderer
 
     @override
     def render_field(self, label: str, field_info: FieldInfo, default_value: Optional[Any], widget_key: str) -> str:
-        field_renderer = self._dispatcher.get(field_info.annotation)
-        if not field_renderer:
-            raise ValueError(f"No field renderer found for type: {field_info.annotation}") if not field_renderer else None
-        return field_renderer.render_field(label, field_info, default_value, widget_key)
+        return self.resolve(field_info.annotation).render_field(label, field_info, default_value, widget_key)
 
 
 class TextFieldRenderer(IStreamLitField):
@@ -60,3 +85,37 @@ class BooleanFieldRenderer(IStreamLitField):
     @override
     def render_field(self, label: str, field_info: FieldInfo, default_value: Optional[Any], widget_key: str) -> bool:
         return st.checkbox(label, value=default_value if default_value is not None else False, key=widget_key, help=field_info.description)
+
+
+class EnumFieldRenderer(IStreamLitField):
+
+    @override
+    def render_field(self, label: str, field_info: FieldInfo, default_value: Optional[Any], widget_key: str) -> enum.Enum:
+        options = list(normalize_annotation(field_info.annotation)[0])
+        index = options.index(default_value) if default_value in options else 0
+        return st.selectbox(label, options, index=index, format_func=lambda member: str(member.value), key=widget_key, help=field_info.description)
+
+
+class DateFieldRenderer(IStreamLitField):
+
+    @override
+    def render_field(self, label: str, field_info: FieldInfo, default_value: Optional[Any], widget_key: str) -> datetime.date:
+        return st.date_input(label, value=default_value if default_value is not None else "today", key=widget_key, help=field_info.description)
+
+
+class TimeFieldRenderer(IStreamLitField):
+
+    @override
+    def render_field(self, label: str, field_info: FieldInfo, default_value: Optional[Any], widget_key: str) -> datetime.time:
+        return st.time_input(label, value=default_value if default_value is not None else "now", key=widget_key, help=field_info.description)
+
+
+class DateTimeFieldRenderer(IStreamLitField):
+
+    @override
+    def render_field(self, label: str, field_info: FieldInfo, default_value: Optional[Any], widget_key: str) -> datetime.datetime:
+        default_value = default_value if default_value is not None else datetime.datetime.now().replace(second=0, microsecond=0)
+        date_column, time_column = st.columns(2)
+        date = date_column.date_input(label, value=default_value.date(), key=f"{widget_key}_date", help=field_info.description)
+        time = time_column.time_input(f"{label} time", value=default_value.timetz(), key=f"{widget_key}_time", label_visibility="hidden")
+        return datetime.datetime.combine(date, time)
@@ -0,0 +1,51 @@
+import os
+import tempfile
+from typing import Mapping, override
+import streamlit as st
+from src.infrastructure.Exceptions.RepositoryExceptions import RepositoryError
+from src.services.ImportService import ImportProgress, ImportService
+from src.view.Interfaces.IStreamLitPage import IStreamLitPage
+
+class ImportPage(IStreamLitPage):
+    """Upload a CSV or Parquet file and import it into one of the models."""
+
+    def __init__(self, import_services: Mapping[str, ImportService]):
+        if not import_services:
+            raise ValueError("Import services cannot be empty")
+        self._import_services = import_services
+
+    @override
+    def render(self, *args, **kwargs) -> None:
+        st.title("Import")
+        model_name = st.selectbox("Model", list(self._import_services), key="import_model")
+        service = self._import_services[model_name]
+        st.caption(f"Columns: {', '.join(service.model.model_fields)}")
+        # Streamlit keeps the uploaded file in memory, the import itself reads it batch by batch
+        uploaded_file = st.file_uploader("CSV, Parquet or Arrow file", type=["csv", "parquet", "arrow", "feather"], key="import_file")
+        if uploaded_file is None or not st.button("Import", key="import_start"):
+            return
+
+        progress_bar = st.progress(0.0, text="Importing...")
+
+        def show_progress(progress: ImportProgress) -> None:
+            text = f"{progress.rows_read:,} rows read, {progress.rows_imported:,} imported, {progress.rows_rejected:,} rejected"
+            # The number of rows of a CSV file is unknown, the bar then shows the bytes read
+            fraction = progress.fraction if progress.fraction is not None else min(uploaded_file.tell() / max(uploaded_file.size, 1), 1.0)
+            progress_bar.progress(fraction, text=text)
+
+        reject_handle, reject_path = tempfile.mkstemp(suffix=".csv", prefix="rejects_")
+        os.close(reject_handle)
+        try:
+            report = service.import_file(uploaded_file, reject_path=reject_path, progress=show_progress)
+        except (ValueError, RepositoryError) as e:
+            st.error(f"Import failed: {e}")
+            return
+        else:
+            progress_bar.progress(1.0, text=f"{report.rows_read:,} rows read in {report.seconds:.1f} s")
+            st.success(f"{report.rows_imported:,} rows imported into {model_name}.")
+            if report.rows_rejected:
+                st.warning(f"{report.rows_rejected:,} rows rejected.")
+                with open(reject_path, "rb") as reject_file:
+                    st.download_button("Download rejected rows", reject_file.read(), "rejects.csv", "text/csv")
+        finally:
+            os.remove(reject_path)
@@ -0,0 +1,30 @@
+import time
+from typing import override
+from src.infrastructure.Metrics import MetricsRegistry
+from src.view.Interfaces.IStreamLitPage import IStreamLitPage
+
+class InstrumentedPage(IStreamLitPage):
+    """Wraps a page and records its render time in page_render_seconds{page}.
+
+    Wrapping the entry page measures a whole rerun; wrapping a section measures that section only.
+    """
+
+    def __init__(self, page: IStreamLitPage, registry: MetricsRegistry, name: str):
+        if page is None:
+            raise ValueError("Page cannot be None")
+        self._page = page
+        self._registry = registry
+        self._name = name
+
+    @property
+    def page(self) -> IStreamLitPage:
+        return self._page
+
+    @override
+    def render(self, *args, **kwargs) -> None:
+        start = time.perf_counter()
+        try:
+            self._page.render(*args, **kwargs)
+        finally:
+            # Also recorded when st.rerun or st.stop end the run early
+            self._registry.observe("page_render_seconds", time.perf_counter() - start, page=self._name)
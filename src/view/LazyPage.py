@@ -0,0 +1,29 @@
+import threading
+from typing import Callable, Optional, override
+from src.view.Interfaces.IStreamLitPage import IStreamLitPage
+
+class LazyPage(IStreamLitPage):
+    """A page built the first time it is rendered, then reused by every session and rerun."""
+
+    def __init__(self, factory: Callable[[], IStreamLitPage]):
+        if factory is None:
+            raise ValueError("Factory cannot be None")
+        self._factory = factory
+        self._page: Optional[IStreamLitPage] = None
+        self._lock = threading.Lock()
+
+    @property
+    def page(self) -> IStreamLitPage:
+        if self._page is None:
+            with self._lock:
+                if self._page is None:
+                    self._page = self._factory()
+        return self._page
+
+    @property
+    def built(self) -> bool:
+        return self._page is not None
+
+    @override
+    def render(self, *args, **kwargs) -> None:
+        self.page.render(*args, **kwargs)
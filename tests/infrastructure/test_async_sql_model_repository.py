@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, Field
+
+from src.infrastructure.AsyncSessionManager import AsyncSessionManager
+from src.infrastructure.AsyncSQLModelRepository import AsyncSQLModelRepository
+from src.infrastructure.QuerySpec import FieldFilter, FilterOperator, QuerySpec
+from src.services.AsyncCRUDService import AsyncCRUDService
+
+
+# Test model backed by a SQLite file opened through aiosqlite
+class AsyncTestModel(SQLModel, table=True):
+    id: int = Field(default=None, primary_key=True)
+    name: str
+    value: int = Field(index=True)
+
+
+class TestAsyncSQLModelRepository(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        """Create a database file with a few rows"""
+        handle, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{self.path}")
+        async with self.engine.begin() as connection:
+            await connection.run_sync(SQLModel.metadata.create_all)
+        self.manager = AsyncSessionManager(self.engine)
+        self.repository = AsyncSQLModelRepository(AsyncTestModel, session_manager=self.manager, batch_size=4)
+        await self.repository.add_many([{"name": f"Item {i}", "value": i % 4} for i in range(1, 11)])
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+        os.remove(self.path)
+
+    async def test_page_count_and_get(self):
+        """Test the read methods run on the async engine"""
+        self.assertEqual([item.id for item in await self.repository.get_page(skip=2, limit=3)], [3, 4, 5])
+        self.assertEqual(await self.repository.count(), 10)
+        self.assertEqual((await self.repository.get_by_id(7)).name, "Item 7")
+        self.assertIsNone(await self.repository.get_by_id(99))
+
+    async def test_cursor_walk(self):
+        """Test keyset pagination visits every row exactly once"""
+        ids, cursor = [], None
+        while True:
+            page = await self.repository.get_page_by_cursor(cursor, 3, "value")
+            ids.extend(item.id for item in page.items)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+        self.assertEqual(sorted(ids), list(range(1, 11)))
+
+    async def test_iter_batches(self):
+        """Test streaming yields batches of the configured size"""
+        spec = QuerySpec(filters=(FieldFilter("value", FilterOperator.GE, 2),))
+        batches = [batch async for batch in self.repository.iter_batches(spec)]
+        self.assertEqual([len(batch) for batch in batches], [4, 1])
+
+    async def test_writes(self):
+        """Test single and bulk writes"""
+        updated = await self.repository.update_by_id(1, {"name": "Renamed"}, returning=True)
+        self.assertEqual(updated.name, "Renamed")
+        deleted = await self.repository.delete_by_id(2, returning=True)
+        self.assertEqual(deleted.id, 2)
+        self.assertEqual(await self.repository.delete_many_by_ids([3, 4, 99]), 2)
+        self.assertEqual(await self.repository.count(), 7)
+        await self.repository.update_many([{"id": 5, "value": 50}, {"id": 6, "value": 60}])
+        rows = await self.repository.query(QuerySpec(filters=(FieldFilter("value", FilterOperator.GE, 50),), columns=("id", "value")))
+        self.assertEqual(rows, [{"id": 5, "value": 50}, {"id": 6, "value": 60}])
+
+    async def test_bound_scope_shares_session(self):
+        """Test operations inside a bound scope use the bound session"""
+        async with self.manager.bind() as bound:
+            async with self.manager.session() as session:
+                self.assertIs(session, bound)
+            self.assertEqual(await self.repository.delete_many_by_ids([1, 2, 3]), 3)
+        async with self.manager.session() as session:
+            self.assertIsNot(session, bound)
+        self.assertEqual(await self.repository.count(), 7)
+
+    async def test_service_page_with_count(self):
+        """Test the service awaits the page and the count concurrently"""
+        service = AsyncCRUDService[AsyncTestModel](self.repository)
+        items, total = await service.get_items_with_count(skip=0, limit=2)
+        self.assertEqual([item.id for item in items], [1, 2])
+        self.assertEqual(total, 10)
+        with self.assertRaises(ValueError):
+            await service.get_items(limit=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import os
+import tempfile
+import unittest
+from typing import Optional
+from sqlalchemy import text
+from sqlmodel import SQLModel, Field, Session, create_engine
+
+from src.infrastructure.Columnar import RowFormat
+from src.infrastructure.DataVersion import compact_change_log, install_data_versions
+from src.infrastructure.Exceptions.RepositoryExceptions import InvalidQueryError
+from src.infrastructure.SQLModelRepository import SQLModelRepository
+
+
+class VersionedTestModel(SQLModel, table=True):
+    __change_log__ = True
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+
+
+class OtherVersionedTestModel(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+
+
+class TestDataVersion(unittest.TestCase):
+
+    def setUp(self):
+        """Create a file database, so that a second engine stands for another process"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.url = f"sqlite:///{os.path.join(self.directory.name, 'versions.db')}"
+        self.engine = create_engine(self.url)
+        SQLModel.metadata.create_all(self.engine)
+        install_data_versions(self.engine, [VersionedTestModel, OtherVersionedTestModel])
+        self.session = Session(self.engine)
+        self.repository = SQLModelRepository(VersionedTestModel, self.session)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def test_every_write_increments_the_version(self):
+        """Test inserts, updates and deletes each bump the version of their table only"""
+        other = SQLModelRepository(OtherVersionedTestModel, self.session)
+        self.assertEqual(self.repository.data_version(), 0)
+
+        item = self.repository.add(VersionedTestModel(name="a"))
+        self.repository.update_by_id(item.id, {"name": "b"})
+        self.repository.delete_by_id(item.id)
+
+        self.assertEqual(self.repository.data_version(), 3)
+        self.assertEqual(other.data_version(), 0)
+
+    def test_writes_of_another_process_are_seen(self):
+        """Test a raw SQL write through another engine changes the version"""
+        other_engine = create_engine(self.url)
+        with other_engine.begin() as connection:
+            connection.execute(text("INSERT INTO versionedtestmodel (name) VALUES ('x'), ('y')"))
+        other_engine.dispose()
+
+        self.assertEqual(self.repository.data_version(), 2)
+
+    def test_install_is_idempotent(self):
+        """Test installing again keeps the versions and does not add triggers"""
+        self.repository.add(VersionedTestModel(name="a"))
+
+        install_data_versions(self.engine, [VersionedTestModel, OtherVersionedTestModel])
+
+        self.assertEqual(self.repository.data_version(), 1)
+        with self.engine.connect() as connection:
+            triggers = connection.execute(text("SELECT count(*) FROM sqlite_master WHERE type = 'trigger'")).scalar_one()
+        self.assertEqual(triggers, 6)
+
+
+    def test_changes_since(self):
+        """Test only the rows changed after the token are returned, deleted ones as tombstones"""
+        first = self.repository.add(VersionedTestModel(name="a"))
+        second = self.repository.add(VersionedTestModel(name="b"))
+        token = self.repository.data_version()
+
+        self.repository.update_by_id(first.id, {"name": "a2"})
+        third = self.repository.add(VersionedTestModel(name="c"))
+        self.repository.delete_by_id(second.id)
+        changes = self.repository.changes_since(token)
+
+        self.assertEqual(sorted((item.id, item.name) for item in changes.items), [(first.id, "a2"), (third.id, "c")])
+        self.assertEqual(changes.deleted_ids, [second.id])
+        self.assertEqual(changes.token, self.repository.data_version())
+        self.assertEqual(len(self.repository.changes_since(changes.token)), 0)
+
+    def test_changes_since_in_pages(self):
+        """Test a limit cuts the changes, the next ones are read from the returned token"""
+        self.repository.add_many([{"name": f"item {i}"} for i in range(5)])
+
+        changes = self.repository.changes_since(0, limit=3, row_format=RowFormat.DATAFRAME)
+        rest = self.repository.changes_since(changes.token, limit=3, row_format=RowFormat.DATAFRAME)
+
+        self.assertTrue(changes.has_more)
+        self.assertEqual(changes.items["name"].tolist(), ["item 0", "item 1", "item 2"])
+        self.assertEqual(rest.items["name"].tolist(), ["item 3", "item 4"])
+        self.assertFalse(rest.has_more)
+    def test_change_log_is_opt_in(self):
+        """Test the writes of a model without __change_log__ bump its version but are not logged"""
+        other = SQLModelRepository(OtherVersionedTestModel, self.session)
+        other.add(OtherVersionedTestModel(name="a"))
+
+        self.assertEqual(other.data_version(), 1)
+        with self.engine.connect() as connection:
+            self.assertEqual(connection.execute(text("SELECT count(*) FROM change_log")).scalar_one(), 0)
+        with self.assertRaises(InvalidQueryError):
+            other.changes_since(0)
+
+    def test_unversioned_install_keeps_only_change_logs(self):
+        """Test installing without versions drops the triggers of the models without a change log"""
+        other = SQLModelRepository(OtherVersionedTestModel, self.session)
+
+        install_data_versions(self.engine, [VersionedTestModel, OtherVersionedTestModel], versioned=False)
+        other.add(OtherVersionedTestModel(name="a"))
+        self.repository.add(VersionedTestModel(name="a"))
+
+        self.assertIsNone(other.data_version())
+        self.assertEqual(self.repository.data_version(), 1)
+        with self.engine.connect() as connection:
+            triggers = connection.execute(text("SELECT count(*) FROM sqlite_master WHERE type = 'trigger'")).scalar_one()
+        self.assertEqual(triggers, 3)
+
+    def test_compaction_expires_older_tokens(self):
+        """Test compacting keeps the entries of the last versions, older tokens get an expired change set"""
+        self.repository.add_many([{"name": f"item {i}"} for i in range(5)])
+
+        self.assertEqual(compact_change_log(self.engine, 2, [VersionedTestModel, OtherVersionedTestModel]), 3)
+
+        expired = self.repository.changes_since(0, row_format=RowFormat.DATAFRAME)
+        self.assertTrue(expired.expired)
+        self.assertEqual((len(expired), expired.token), (0, 5))
+        self.assertEqual(self.repository.changes_since(3, row_format=RowFormat.DATAFRAME).items["name"].tolist(), ["item 3", "item 4"])
+        self.assertEqual(compact_change_log(self.engine, 2, [VersionedTestModel]), 0)
+
+    def test_install_upgrades_older_version_tables(self):
+        """Test a version table created before compaction gets its horizon column"""
+        engine = create_engine(f"sqlite:///{os.path.join(self.directory.name, 'older.db')}")
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE data_version (table_name TEXT PRIMARY KEY, version INTEGER NOT NULL) WITHOUT ROWID"))
+            connection.execute(text("INSERT INTO data_version VALUES ('versionedtestmodel', 4)"))
+        SQLModel.metadata.create_all(engine)
+
+        install_data_versions(engine, [VersionedTestModel])
+
+        with engine.connect() as connection:
+            self.assertEqual(connection.execute(text("SELECT version, compacted FROM data_version")).one(), (4, 0))
+        engine.dispose()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from sqlmodel import SQLModel, Field, Session, create_engine
+
+from src.infrastructure.DataVersion import install_data_versions
+from src.infrastructure.EngineRouter import EngineRouter, ReadStrategy
+from src.infrastructure.SessionManager import SessionManager
+from src.infrastructure.SQLModelRepository import SQLModelRepository
+from src.services.CRUDService import CRUDService
+from src.services.TTLQueryCache import TTLQueryCache
+
+
+# Test model stored on a primary and copied to a replica
+class RoutedTestModel(SQLModel, table=True):
+    id: int = Field(default=None, primary_key=True)
+    name: str
+
+
+class TestEngineRouter(unittest.TestCase):
+
+    def setUp(self):
+        self.primary = create_engine("sqlite://")
+        self.replicas = {name: create_engine("sqlite://") for name in ("a", "b", "c")}
+
+    def _pick(self, router):
+        with router.reader() as engine:
+            return next(name for name, replica in self.replicas.items() if replica is engine)
+
+    def test_without_replicas_reads_use_primary(self):
+        """Test reads fall back to the primary"""
+        router = EngineRouter(self.primary)
+        with router.reader() as engine:
+            self.assertIs(engine, self.primary)
+
+    def test_round_robin(self):
+        """Test replicas are picked in turn"""
+        router = EngineRouter(self.primary, self.replicas, "round_robin")
+        self.assertEqual([self._pick(router) for _ in range(4)], ["a", "b", "c", "a"])
+
+    def test_least_busy(self):
+        """Test the replica with the fewest reads in flight is picked"""
+        router = EngineRouter(self.primary, self.replicas, ReadStrategy.LEAST_BUSY)
+        with router.reader(), router.reader():
+            self.assertEqual(router.in_flight(), {"a": 1, "b": 1, "c": 0})
+            self.assertEqual(self._pick(router), "c")
+        self.assertEqual(router.in_flight(), {"a": 0, "b": 0, "c": 0})
+
+    def test_unknown_strategy(self):
+        """Test an unknown strategy is rejected"""
+        with self.assertRaises(ValueError):
+            EngineRouter(self.primary, self.replicas, "random")
+
+
+class TestReadReplicaRouting(unittest.TestCase):
+
+    def setUp(self):
+        """Create a primary database and a replica copied from it"""
+        self.directory = tempfile.TemporaryDirectory()
+        primary_path = os.path.join(self.directory.name, "primary.db")
+        replica_path = os.path.join(self.directory.name, "replica.db")
+        self.primary = create_engine(f"sqlite:///{primary_path}")
+        SQLModel.metadata.create_all(self.primary)
+        with Session(self.primary) as session:
+            session.add(RoutedTestModel(name="replicated"))
+            session.commit()
+        shutil.copyfile(primary_path, replica_path)
+        self.replica = create_engine(f"sqlite:///file:{replica_path}?mode=ro&uri=true")
+        self.manager = SessionManager(self.primary, replicas={"replica": self.replica})
+        self.repository = SQLModelRepository(RoutedTestModel, session_manager=self.manager)
+
+    def tearDown(self):
+        self.primary.dispose()
+        self.replica.dispose()
+        self.directory.cleanup()
+
+    def test_reads_go_to_replica_and_writes_to_primary(self):
+        """Test a write is not visible through the (unsynchronized) replica outside of a scope"""
+        self.repository.add(RoutedTestModel(name="fresh"))
+        self.assertEqual([item.name for item in self.repository.get_all()], ["replicated"])
+        self.assertEqual(self.repository.count(), 1)
+
+    def test_scope_reads_its_own_writes(self):
+        """Test a scope reads from the replica until it writes, then from the primary"""
+        with self.manager.bind():
+            self.assertEqual(self.repository.count(), 1)
+            self.repository.add(RoutedTestModel(name="fresh"))
+            self.assertEqual([item.name for item in self.repository.get_all()], ["replicated", "fresh"])
+        self.assertEqual(self.manager.router.in_flight(), {"replica": 0})
+        self.assertEqual(self.replica.pool.checkedout(), 0)
+
+    def test_versioned_cache_reads_replica_in_scope(self):
+        """Test reading the data version on the primary does not route the reads of the scope to the primary"""
+        install_data_versions(self.primary, [RoutedTestModel])
+        self.repository.add(RoutedTestModel(name="fresh"))
+        service = CRUDService(self.repository, cache=TTLQueryCache(), versioned=True)
+
+        with self.manager.bind():
+            self.assertEqual(service.data_version(), 1)
+            self.assertEqual([item.name for item in service.get_items()], ["replicated"])
+            self.assertEqual([item.name for item in service.get_items(limit=5)], ["replicated"])
+
+    def test_scopes_are_independent(self):
+        """Test a write in one thread's scope does not route another thread's reads to the primary"""
+        counts = []
+        with self.manager.bind():
+            self.repository.add(RoutedTestModel(name="fresh"))
+            thread = threading.Thread(target=lambda: counts.append(self.repository.count()))
+            thread.start()
+            thread.join()
+        self.assertEqual(counts, [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+from typing import Optional
+from unittest.mock import patch
+from sqlalchemy import text
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Field, Session, create_engine
+
+from src.infrastructure.Columnar import RowFormat
+from src.infrastructure.Exceptions.RepositoryExceptions import InvalidQueryError
+from src.infrastructure.FullTextSearch import install_full_text_search, searchable_models, to_match_query
+from src.infrastructure.SQLModelRepository import SQLModelRepository
+
+
+class SearchTestModel(SQLModel, table=True):
+    __searchable__ = ("title", "body")
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    title: str
+    body: Optional[str] = None
+    views: int = 0
+
+
+class UnsearchableTestModel(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    title: str
+
+
+class TestFullTextSearch(unittest.TestCase):
+
+    def setUp(self):
+        """Create the tables with rows already in them, then the full-text index"""
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        SQLModel.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        self.session.add_all([
+            SearchTestModel(id=1, title="Streamlit caching", body="cache_resource keeps objects across reruns"),
+            SearchTestModel(id=2, title="SQLite tuning", body="WAL mode and the page cache"),
+            SearchTestModel(id=3, title="Café au lait", body=None),
+        ])
+        self.session.commit()
+        install_full_text_search(self.engine, [SearchTestModel])
+        self.repository = SQLModelRepository(SearchTestModel, self.session)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def _ids(self, query):
+        return [item.id for item in self.repository.search(query)]
+
+    def test_existing_rows_are_indexed(self):
+        """Test the rows inserted before the index was created are found, accents ignored"""
+        self.assertEqual(self._ids("tuning"), [2])
+        self.assertEqual(self._ids("cafe"), [3])
+
+    def test_prefix_words_and_ranking(self):
+        """Test every word must match as a prefix, best matches first"""
+        self.repository.add(SearchTestModel(title="Cache cache cache", body="cache"))
+
+        self.assertEqual(self._ids("cach")[0], 4)
+        self.assertEqual(set(self._ids("cach")), {1, 2, 4})
+        self.assertEqual(self._ids("cache wal"), [2])
+
+    def test_broad_queries_are_not_ranked(self):
+        """Test queries with more matches than RANKED_MATCHES return their first matches in table order"""
+        self.repository.add(SearchTestModel(title="Cache cache cache", body="cache"))
+
+        with patch("src.infrastructure.SQLModelRepository.RANKED_MATCHES", 2):
+            self.assertEqual(self._ids("cach"), [1, 2, 4])
+            self.assertEqual(self._ids("cache wal"), [2])
+
+    def test_triggers_follow_updates_and_deletes(self):
+        """Test the index follows the writes made to the table"""
+        self.repository.update_by_id(2, {"title": "PostgreSQL tuning"})
+        self.repository.delete_by_id(1)
+
+        self.assertEqual(self._ids("postgresql"), [2])
+        self.assertEqual(self._ids("sqlite"), [])
+        self.assertEqual(self._ids("streamlit"), [])
+
+    def test_install_is_idempotent(self):
+        """Test installing again keeps a single index and does not index the rows twice"""
+        install_full_text_search(self.engine, [SearchTestModel])
+
+        self.assertEqual(self._ids("tuning"), [2])
+        with self.engine.connect() as connection:
+            triggers = connection.execute(text("SELECT count(*) FROM sqlite_master WHERE type = 'trigger'")).scalar_one()
+        self.assertEqual(triggers, 3)
+
+    def test_changed_fields_rebuild_the_index(self):
+        """Test an index on other fields than the declared ones is recreated, rebuilt and kept in sync"""
+        with patch.object(SearchTestModel, "__searchable__", ("title",)):
+            install_full_text_search(self.engine, [SearchTestModel])
+            self.repository.add(SearchTestModel(title="Index rebuild", body="wal"))
+
+            self.assertEqual(self._ids("wal"), [])
+            self.assertEqual(self._ids("tuning"), [2])
+            self.assertEqual(self._ids("rebuild"), [4])
+            with self.engine.connect() as connection:
+                columns = [row[1] for row in connection.exec_driver_sql("PRAGMA table_info(searchtestmodel_fts)")]
+            self.assertEqual(columns, ["title"])
+
+    def test_search_as_dataframe(self):
+        """Test the columnar search returns every field of the matches"""
+        frame = self.repository.search("tuning", row_format=RowFormat.DATAFRAME)
+
+        self.assertEqual(list(frame.columns), ["id", "title", "body", "views"])
+        self.assertEqual(frame["title"].tolist(), ["SQLite tuning"])
+
+    def test_user_input_cannot_break_the_query(self):
+        """Test FTS5 syntax in the input is searched as text, and empty input is refused"""
+        self.assertEqual(to_match_query('wal "mode'), '"wal"* """mode"*')
+        self.assertEqual(self._ids('NOT AND ( "'), [])
+        with self.assertRaises(InvalidQueryError):
+            self.repository.search("   ")
+
+    def test_models_without_searchable_fields(self):
+        """Test only the models declaring searchable fields get an index"""
+        self.assertEqual(searchable_models([SearchTestModel, UnsearchableTestModel]), [SearchTestModel])
+        with self.assertRaises(InvalidQueryError):
+            SQLModelRepository(UnsearchableTestModel, self.session).search("title")
+
+
+if __name__ == '__main__':
+    unittest.main()
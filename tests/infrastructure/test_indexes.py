@@ -0,0 +1,104 @@
+import unittest
+from typing import Optional
+from unittest.mock import patch
+from sqlalchemy import inspect
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Field, Session, create_engine
+
+from src.infrastructure.Exceptions.RepositoryExceptions import InvalidQueryError
+from src.infrastructure.IndexAdvisor import advise, suggest_index
+from src.infrastructure.Indexes import declared_indexes, install_indexes
+from src.infrastructure.QuerySpec import FieldFilter, FilterOperator, QuerySpec, SortOrder
+from src.infrastructure.SQLModelRepository import SQLModelRepository
+from src.infrastructure.Statements import KeysetQuery, build_count
+
+
+class IndexTestModel(SQLModel, table=True):
+    __indexes__ = ("status", ("owner", "priority"))
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    status: str
+    owner: str
+    priority: int = 0
+    note: Optional[str] = None
+
+
+class TestIndexes(unittest.TestCase):
+
+    def setUp(self):
+        """Create the table without its declared indexes, as create_all leaves an existing table"""
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql("CREATE TABLE indextestmodel (id INTEGER PRIMARY KEY, status VARCHAR NOT NULL, "
+                                       "owner VARCHAR NOT NULL, priority INTEGER NOT NULL, note VARCHAR)")
+        self.session = Session(self.engine)
+        self.repository = SQLModelRepository(IndexTestModel, self.session)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def _indexes(self):
+        return {index["name"]: tuple(index["column_names"]) for index in inspect(self.engine).get_indexes("indextestmodel")}
+
+    def test_missing_indexes_are_created_once(self):
+        """Test the declared indexes are added to an existing table, and installing again changes nothing"""
+        created = install_indexes(self.engine, [IndexTestModel])
+
+        self.assertEqual(set(created), {"ix_indextestmodel_status", "ix_indextestmodel_owner_priority"})
+        self.assertEqual(self._indexes(), {"ix_indextestmodel_status": ("status",),
+                                           "ix_indextestmodel_owner_priority": ("owner", "priority")})
+        self.assertEqual(install_indexes(self.engine, [IndexTestModel]), [])
+        self.assertEqual(len(declared_indexes(IndexTestModel)), 2)
+
+    def test_changed_index_is_recreated(self):
+        """Test an index whose columns differ from the declaration is built again"""
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql("CREATE INDEX ix_indextestmodel_status ON indextestmodel (note)")
+
+        self.assertIn("ix_indextestmodel_status", install_indexes(self.engine, [IndexTestModel]))
+        self.assertEqual(self._indexes()["ix_indextestmodel_status"], ("status",))
+
+    def test_unknown_field(self):
+        """Test an index on a field the model does not have is refused"""
+        with patch.object(IndexTestModel, "__indexes__", ("status", "missing")), self.assertRaises(InvalidQueryError):
+            declared_indexes(IndexTestModel)
+
+    def test_suggested_columns(self):
+        """Test equality filters come first, then the sort, or the range filter without sort"""
+        spec = QuerySpec(filters=(FieldFilter("owner", FilterOperator.EQ, "ann"), FieldFilter("note", FilterOperator.GT, "b")))
+
+        self.assertEqual(suggest_index(IndexTestModel, KeysetQuery.build(IndexTestModel, None, 10, "priority", spec=spec).statement,
+                                       ("priority",)),
+                         ("owner", "priority"))
+        self.assertEqual(suggest_index(IndexTestModel, build_count(IndexTestModel, spec)), ("owner", "note"))
+        self.assertEqual(suggest_index(IndexTestModel, KeysetQuery.build(IndexTestModel, None, 10).statement, ("id",)), ())
+
+    def test_full_scan_is_reported_until_indexed(self):
+        """Test a sort on an unindexed field is reported with its index, and not once the index exists"""
+        with self.engine.connect() as connection:
+            advice = advise(connection, IndexTestModel, KeysetQuery.build(IndexTestModel, None, 10, "status").statement, ("status",))
+        self.assertTrue(advice.needs_index)
+        self.assertIn("SCAN indextestmodel", advice.full_scans)
+        self.assertEqual(advice.create_statement, "CREATE INDEX ix_indextestmodel_status ON indextestmodel (status)")
+
+        install_indexes(self.engine, [IndexTestModel])
+        with self.engine.connect() as connection:
+            advice = advise(connection, IndexTestModel, KeysetQuery.build(IndexTestModel, None, 10, "status").statement, ("status",))
+        self.assertFalse(advice.needs_index)
+        self.assertTrue(any("ix_indextestmodel_status" in line for line in advice.plan))
+
+    def test_repository_explain(self):
+        """Test the repository explains its page, count and full query"""
+        install_indexes(self.engine, [IndexTestModel])
+        spec = QuerySpec(filters=(FieldFilter("owner", FilterOperator.IN, ["ann", "bob"]),), order_by=(SortOrder("note"),))
+
+        advices = self.repository.explain(spec, "note")
+
+        self.assertEqual(len(advices), 3)
+        self.assertEqual([advice.needs_index for advice in advices], [True, False, True])
+        self.assertEqual(advices[0].columns, ("owner", "note"))
+
+
+if __name__ == '__main__':
+    unittest.main()
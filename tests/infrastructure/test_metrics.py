@@ -0,0 +1,82 @@
+import json
+import unittest
+from sqlalchemy import text
+from sqlmodel import create_engine
+
+from src.infrastructure.Instrumentation import instrument_engine, statement_labels
+from src.infrastructure.Metrics import ROW_BUCKETS, MetricsRegistry
+
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_histogram_summary(self):
+        """Test counts, sum and interpolated quantiles"""
+        for value in (0, 5, 5, 50):
+            self.registry.observe("rows", value, buckets=ROW_BUCKETS, model="Item")
+        summary = self.registry.histograms()["rows"][(("model", "Item"),)]
+
+        self.assertEqual(summary["count"], 4)
+        self.assertEqual(summary["sum"], 60)
+        self.assertEqual(summary["buckets"][:3], [[0, 1], [1, 1], [10, 3]])
+        self.assertAlmostEqual(summary["p50"], 5.5)
+
+    def test_prometheus_export(self):
+        """Test the text exposition format of counters and histograms"""
+        self.registry.increment("errors_total", operation='say "hi"')
+        self.registry.observe("latency_seconds", 0.003, operation="get")
+        exported = self.registry.to_prometheus()
+
+        self.assertIn('errors_total{operation="say \\"hi\\""} 1', exported)
+        self.assertIn('latency_seconds_bucket{operation="get",le="0.005"} 1', exported)
+        self.assertIn('latency_seconds_bucket{operation="get",le="+Inf"} 1', exported)
+        self.assertIn('latency_seconds_count{operation="get"} 1', exported)
+
+    def test_json_export_and_reset(self):
+        """Test the JSON export can be parsed and reset clears everything"""
+        self.registry.increment("errors_total")
+        self.assertEqual(json.loads(self.registry.to_json())["counters"]["errors_total"], [{"labels": {}, "value": 1}])
+        self.registry.reset()
+        self.assertEqual(self.registry.counters(), {})
+
+
+class TestEngineInstrumentation(unittest.TestCase):
+
+    def test_statement_labels(self):
+        """Test the operation and table are read from the statement"""
+        self.assertEqual(statement_labels('SELECT a.id FROM "item" AS a'), ("SELECT", "item"))
+        self.assertEqual(statement_labels("insert into item (id) values (?)"), ("INSERT", "item"))
+        self.assertEqual(statement_labels("PRAGMA journal_mode"), ("PRAGMA", ""))
+
+    def test_queries_and_checkouts_are_recorded(self):
+        """Test statements, slow queries, errors and pool checkouts are recorded"""
+        registry = MetricsRegistry()
+        engine = instrument_engine(create_engine("sqlite://"), registry, "test", slow_query_ms=0)
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            with self.assertRaises(Exception):
+                connection.execute(text("SELECT * FROM missing"))
+
+        histograms = registry.histograms()
+        self.assertEqual(histograms["db_query_seconds"][(("engine", "test"), ("operation", "SELECT"), ("table", ""))]["count"], 1)
+        self.assertEqual(histograms["db_pool_checkout_seconds"][(("engine", "test"),)]["count"], 1)
+        self.assertEqual(registry.counters()["db_query_errors_total"], {(("engine", "test"),): 1})
+        self.assertEqual([slow_query.statement for slow_query in registry.slow_queries()], ["SELECT 1"])
+        engine.dispose()
+
+    def test_checkouts_are_recorded_after_dispose(self):
+        """Test the pool recreated by dispose still times its checkouts"""
+        registry = MetricsRegistry()
+        engine = instrument_engine(create_engine("sqlite://"), registry, "test")
+        engine.dispose()
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+        self.assertEqual(registry.histograms()["db_pool_checkout_seconds"][(("engine", "test"),)]["count"], 1)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    unittest.main()
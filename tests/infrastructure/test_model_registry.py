@@ -0,0 +1,69 @@
+import os
+import sys
+import tempfile
+import textwrap
+import unittest
+
+from src.infrastructure.ModelRegistry import ModelRegistry, discover_models
+from src.model.example_model import ExampleModel
+
+
+class TestModelRegistry(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a throwaway model package on the import path, once: tables can only be declared once per metadata"""
+        cls.directory = tempfile.TemporaryDirectory()
+        package = os.path.join(cls.directory.name, "registry_test_models")
+        os.makedirs(os.path.join(package, "nested"))
+        files = {
+            "__init__.py": "",
+            "orders.py": """
+                from typing import Optional
+                from sqlmodel import SQLModel, Field
+
+                class RegistryOrder(SQLModel, table=True):
+                    id: Optional[int] = Field(default=None, primary_key=True)
+
+                class RegistryOrderForm(SQLModel):
+                    quantity: int
+            """,
+            # Re-exports must not be found twice
+            "reexport.py": "from registry_test_models.orders import RegistryOrder\n",
+            "nested/__init__.py": "",
+            "nested/customers.py": """
+                from typing import Optional
+                from sqlmodel import SQLModel, Field
+
+                class RegistryCustomer(SQLModel, table=True):
+                    id: Optional[int] = Field(default=None, primary_key=True)
+            """,
+        }
+        for name, content in files.items():
+            with open(os.path.join(package, name), "w") as module_file:
+                module_file.write(textwrap.dedent(content))
+        sys.path.insert(0, cls.directory.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        sys.path.remove(cls.directory.name)
+        cls.directory.cleanup()
+
+    def test_discover_models(self):
+        """Test only the table models declared in the package and its subpackages are found"""
+        models = discover_models("registry_test_models")
+
+        self.assertEqual(sorted(models), ["RegistryCustomer", "RegistryOrder"])
+
+    def test_registry_of_several_packages(self):
+        """Test the registry merges its packages and reports unknown names"""
+        registry = ModelRegistry(["src.model", "registry_test_models"])
+
+        self.assertIs(registry.get("ExampleModel"), ExampleModel)
+        self.assertIn("RegistryCustomer", registry.names())
+        with self.assertRaises(ValueError):
+            registry.get("Missing")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import threading
+import unittest
+from sqlmodel import SQLModel, Field, create_engine
+
+from src.infrastructure.SessionManager import SessionManager, SessionScope
+from src.infrastructure.SQLModelRepository import SQLModelRepository
+
+
+# Test model for the session manager
+class ScopedTestModel(SQLModel, table=True):
+    id: int = Field(default=None, primary_key=True)
+    name: str
+
+
+class TestSessionManager(unittest.TestCase):
+
+    def setUp(self):
+        """Use a database file so the engine has a real connection pool to inspect"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.directory.name, 'test.db')}")
+        SQLModel.metadata.create_all(self.engine)
+        self.manager = SessionManager(self.engine)
+        self.repository = SQLModelRepository(ScopedTestModel, session_manager=self.manager)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def test_default_scope(self):
+        """Test the scope defaults to one session per call"""
+        self.assertEqual(self.manager.scope, SessionScope.CALL)
+        self.assertEqual(SessionManager(self.engine, "rerun").scope, SessionScope.RERUN)
+
+    def test_per_call_sessions_release_connections(self):
+        """Test every operation releases its connection and leaves loaded objects readable"""
+        created = self.repository.add(ScopedTestModel(name="first"))
+        items = self.repository.get_all()
+
+        self.assertEqual(self.engine.pool.checkedout(), 0)
+        self.assertEqual(created.name, "first")
+        self.assertEqual([item.name for item in items], ["first"])
+
+    def test_bind_shares_one_session(self):
+        """Test operations inside a scope share the bound session, which is closed on exit"""
+        with self.manager.bind() as bound_session:
+            with self.manager.session() as first, self.manager.session() as second:
+                self.assertIs(first, bound_session)
+                self.assertIs(second, bound_session)
+            self.repository.add(ScopedTestModel(name="scoped"))
+        self.assertIsNone(self.manager.current_session())
+        self.assertEqual(self.engine.pool.checkedout(), 0)
+
+    def test_bind_is_local_to_thread(self):
+        """Test a scope opened in one thread is not visible in another"""
+        seen = []
+        with self.manager.bind():
+            thread = threading.Thread(target=lambda: seen.append(self.manager.current_session()))
+            thread.start()
+            thread.join()
+        self.assertEqual(seen, [None])
@@ -66,6 +66,61 @@ class TestSQLModelRepository(unittest.TestCase):
         
         self.assertIn("Query execution error in get_all", str(context.exception))
     
+    # Tests for get_page
+    def test_get_page_success(self):
+        """Test get_page returns the page produced by the database"""
+        # Arrange
+        expected_items = [TestModel(id=3, name="Item 3")]
+        mock_result = Mock()
+        mock_result.all.return_value = expected_items
+        self.mock_session.exec.return_value = mock_result
+        
+        # Act
+        result = self.repository.get_page(skip=2, limit=1)
+        
+        # Assert
+        self.assertEqual(result, expected_items)
+        statement = self.mock_session.exec.call_args.args[0]
+        self.assertEqual(statement._offset, 2)
+        self.assertEqual(statement._limit, 1)
+    
+    def test_get_page_operational_error_on_execution(self):
+        """Test get_page raises DatabaseConnectionError on OperationalError during execution"""
+        # Arrange
+        self.mock_session.exec.side_effect = OperationalError("statement", "params", "orig")
+        
+        # Act & Assert
+        with self.assertRaises(DatabaseConnectionError) as context:
+            self.repository.get_page()
+        
+        self.assertIn("Database connection error executing get_page", str(context.exception))
+    
+    # Tests for count
+    def test_count_success(self):
+        """Test count returns the value of the COUNT query"""
+        # Arrange
+        mock_result = Mock()
+        mock_result.one.return_value = 42
+        self.mock_session.exec.return_value = mock_result
+        
+        # Act
+        result = self.repository.count()
+        
+        # Assert
+        self.assertEqual(result, 42)
+        self.assertIn("count(*)", str(self.mock_session.exec.call_args.args[0]))
+    
+    def test_count_sqlalchemy_error(self):
+        """Test count raises QueryExecutionError on SQLAlchemyError"""
+        # Arrange
+        self.mock_session.exec.side_effect = SQLAlchemyError("Query error")
+        
+        # Act & Assert
+        with self.assertRaises(QueryExecutionError) as context:
+            self.repository.count()
+        
+        self.assertIn("Query execution error in count", str(context.exception))
+    
     # Tests for get_by_id
     def test_get_by_id_success(self):
         """Test get_by_id returns item when found"""
@@ -0,0 +1,375 @@
+import unittest
+from datetime import datetime, timedelta
+from typing import Optional
+import pandas as pd
+import pyarrow as pa
+from sqlmodel import SQLModel, Field, Session, create_engine
+from sqlalchemy.pool import StaticPool
+
+from src.infrastructure.Aggregation import Aggregate, AggregateFunction
+from src.infrastructure.Columnar import RowFormat
+from src.infrastructure.Exceptions.RepositoryExceptions import InvalidCursorError, InvalidQueryError
+from src.infrastructure.QuerySpec import FieldFilter, FilterOperator, QuerySpec, SortOrder
+from src.infrastructure.SQLModelRepository import SQLModelRepository
+
+
+# Test model backed by a real in-memory SQLite database
+class SQLiteTestModel(SQLModel, table=True):
+    id: int = Field(default=None, primary_key=True)
+    name: str
+    value: int = Field(index=True)
+
+
+class SQLiteSortTestModel(SQLModel, table=True):
+    id: int = Field(default=None, primary_key=True)
+    note: Optional[str] = None
+    created: datetime
+
+
+class TestSQLModelRepositoryOnSQLite(unittest.TestCase):
+
+    def setUp(self):
+        """Create an in-memory database with a few rows"""
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        SQLModel.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        # Values repeat so that sorting by value needs the id as tie breaker
+        self.session.add_all([SQLiteTestModel(id=i, name=f"Item {i}", value=i % 4) for i in range(1, 26)])
+        self.session.commit()
+        self.repository = SQLModelRepository(SQLiteTestModel, self.session)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def _walk_forward(self, limit, order_by=None):
+        pages, cursor = [], None
+        while True:
+            page = self.repository.get_page_by_cursor(cursor, limit, order_by)
+            pages.append(page)
+            if page.next_cursor is None:
+                return pages
+            cursor = page.next_cursor
+
+    # Tests for get_page and count
+    def test_get_page_and_count(self):
+        """Test offset pagination and count are computed by the database"""
+        self.assertEqual([item.id for item in self.repository.get_page(skip=10, limit=3)], [11, 12, 13])
+        self.assertEqual(self.repository.count(), 25)
+
+    # Tests for get_page_by_cursor
+    def test_cursor_walk_by_id(self):
+        """Test walking forward by id visits every row exactly once"""
+        pages = self._walk_forward(limit=10)
+
+        self.assertEqual([len(page.items) for page in pages], [10, 10, 5])
+        self.assertEqual([item.id for page in pages for item in page.items], list(range(1, 26)))
+        self.assertIsNone(pages[0].previous_cursor)
+
+    def test_cursor_walk_by_sort_column(self):
+        """Test walking by a non unique column uses the id as tie breaker"""
+        pages = self._walk_forward(limit=4, order_by="value")
+
+        visited = [(item.value, item.id) for page in pages for item in page.items]
+        self.assertEqual(visited, sorted(visited))
+        self.assertEqual(len(visited), 25)
+
+    def test_cursor_walk_backward(self):
+        """Test the previous cursor returns the same page that was shown before"""
+        pages = self._walk_forward(limit=4, order_by="value")
+
+        previous = self.repository.get_page_by_cursor(pages[2].previous_cursor, 4, "value")
+
+        self.assertEqual([item.id for item in previous.items], [item.id for item in pages[1].items])
+        first = self.repository.get_page_by_cursor(pages[1].previous_cursor, 4, "value")
+        self.assertEqual([item.id for item in first.items], [item.id for item in pages[0].items])
+        self.assertIsNone(first.previous_cursor)
+        self.assertIsNotNone(first.next_cursor)
+
+    def test_cursor_for_other_sort_field(self):
+        """Test a cursor cannot be reused with a different sort field"""
+        page = self.repository.get_page_by_cursor(None, 5, "value")
+
+        with self.assertRaises(InvalidCursorError):
+            self.repository.get_page_by_cursor(page.next_cursor, 5, "name")
+
+    def test_malformed_cursor(self):
+        """Test a malformed cursor raises InvalidCursorError"""
+        with self.assertRaises(InvalidCursorError):
+            self.repository.get_page_by_cursor("not-a-cursor", 5)
+
+    def test_unknown_sort_field(self):
+        """Test sorting by an unknown field raises InvalidQueryError"""
+        with self.assertRaises(InvalidQueryError):
+            self.repository.get_page_by_cursor(None, 5, "missing")
+
+    def test_cursor_walk_descending_with_filter(self):
+        """Test a descending, filtered walk visits the matching rows in order and can go back"""
+        spec = QuerySpec(filters=[FieldFilter("value", FilterOperator.IN, [1, 2])])
+        pages, cursor = [], None
+        while True:
+            page = self.repository.get_page_by_cursor(cursor, 4, "value", descending=True, spec=spec)
+            pages.append(page)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+
+        visited = [(item.value, item.id) for page in pages for item in page.items]
+        self.assertEqual(visited, sorted(visited, reverse=True))
+        self.assertEqual(len(visited), 13)
+        back = self.repository.get_page_by_cursor(pages[1].previous_cursor, 4, "value", descending=True, spec=spec)
+        self.assertEqual([item.id for item in back.items], [item.id for item in pages[0].items])
+        with self.assertRaises(InvalidCursorError):
+            self.repository.get_page_by_cursor(pages[0].next_cursor, 4, "value", spec=spec)
+
+    # Tests for query
+    def test_query_filters_order_and_slice(self):
+        """Test filters, multi column ordering and slicing are applied by the query"""
+        spec = QuerySpec(
+            filters=[FieldFilter("value", FilterOperator.BETWEEN, (1, 2)), FieldFilter("name", FilterOperator.LIKE, "Item 1%")],
+            order_by=[SortOrder("value", descending=True), SortOrder("name")],
+            skip=1,
+            limit=3,
+        )
+
+        items = self.repository.query(spec)
+
+        self.assertEqual([(item.value, item.name) for item in items], [(2, "Item 14"), (2, "Item 18"), (1, "Item 1")])
+        self.assertEqual(self.repository.count(spec), 6)
+
+    def test_query_projection(self):
+        """Test selecting a subset of columns returns dictionaries"""
+        rows = self.repository.query(QuerySpec(filters=[FieldFilter("id", FilterOperator.LE, 2)], columns=["id", "name"]))
+
+        self.assertEqual(rows, [{"id": 1, "name": "Item 1"}, {"id": 2, "name": "Item 2"}])
+
+    def test_query_unknown_field(self):
+        """Test unknown fields in filters, sort orders or columns raise InvalidQueryError"""
+        for spec in (QuerySpec(filters=[FieldFilter("missing", "eq", 1)]),
+                     QuerySpec(order_by=[SortOrder("missing")]),
+                     QuerySpec(columns=["missing"])):
+            with self.assertRaises(InvalidQueryError):
+                self.repository.query(spec)
+
+    def test_invalid_filter_values(self):
+        """Test IN and BETWEEN filters validate their values"""
+        with self.assertRaises(InvalidQueryError):
+            FieldFilter("value", FilterOperator.IN, 3)
+        with self.assertRaises(InvalidQueryError):
+            FieldFilter("value", FilterOperator.BETWEEN, (1, 2, 3))
+
+    # Tests for streaming reads
+    def test_iter_batches(self):
+        """Test iter_batches yields batches of at most batch_size items"""
+        batches = list(self.repository.iter_batches(batch_size=10))
+
+        self.assertEqual([len(batch) for batch in batches], [10, 10, 5])
+        self.assertEqual([item.id for batch in batches for item in batch], list(range(1, 26)))
+
+    def test_iter_all_with_spec(self):
+        """Test iter_all streams the rows of a query one by one"""
+        spec = QuerySpec(filters=[FieldFilter("value", FilterOperator.EQ, 0)], columns=["id"])
+
+        rows = list(self.repository.iter_all(spec, batch_size=2))
+
+        self.assertEqual(rows, [{"id": i} for i in range(4, 25, 4)])
+
+    # Tests for update_by_id and delete_by_id
+    def test_update_by_id_returning(self):
+        """Test update_by_id updates in one statement and returns the stored row"""
+        updated = self.repository.update_by_id(3, {"name": "Renamed"}, returning=True)
+
+        self.assertEqual((updated.id, updated.name, updated.value), (3, "Renamed", 3))
+
+    def test_update_by_id_not_found(self):
+        """Test update_by_id reports a missing row through the row count"""
+        self.assertFalse(self.repository.update_by_id(999, {"name": "Missing"}))
+        self.assertIsNone(self.repository.update_by_id(999, {"name": "Missing"}, returning=True))
+        self.assertTrue(self.repository.update_by_id(3, {"value": 7}))
+
+    def test_update_by_id_without_values(self):
+        """Test an empty update runs no statement and returns the row as it is"""
+        self.assertEqual(self.repository.update_by_id(3, {}, returning=True).name, "Item 3")
+        self.assertTrue(self.repository.update_by_id(3, {}))
+        self.assertIsNone(self.repository.update_by_id(999, {}, returning=True))
+
+    def test_update_by_id_unknown_field(self):
+        """Test update_by_id rejects fields the model does not have"""
+        with self.assertRaises(InvalidQueryError):
+            self.repository.update_by_id(3, {"missing": 1})
+
+    def test_delete_by_id(self):
+        """Test delete_by_id deletes in one statement and can return the deleted row"""
+        deleted = self.repository.delete_by_id(4, returning=True)
+
+        self.assertEqual(deleted.name, "Item 4")
+        self.assertIsNone(self.repository.delete_by_id(4, returning=True))
+        self.assertTrue(self.repository.delete_by_id(5))
+        self.assertFalse(self.repository.delete_by_id(5))
+        self.assertEqual(self.repository.count(), 23)
+
+    # Tests for bulk operations
+    def test_add_many_with_returned_ids(self):
+        """Test add_many inserts in chunks and sets the generated ids"""
+        items = [SQLiteTestModel(name=f"Bulk {i}", value=i) for i in range(7)]
+
+        inserted = self.repository.add_many(items, chunk_size=3, return_ids=True)
+
+        self.assertEqual(inserted, 7)
+        self.assertEqual([item.id for item in items], list(range(26, 33)))
+        self.assertEqual(self.repository.count(), 32)
+
+    def test_add_many_from_generator_of_mappings(self):
+        """Test add_many accepts a generator of column mappings"""
+        inserted = self.repository.add_many(({"name": f"Row {i}", "value": i} for i in range(5)), chunk_size=2)
+
+        self.assertEqual(inserted, 5)
+        self.assertEqual(self.repository.count(), 30)
+
+    def test_add_many_with_mixed_columns(self):
+        """Test mappings missing different fields are inserted with the defaults of the missing ones"""
+        repository = SQLModelRepository(SQLiteSortTestModel, self.session)
+        created = datetime(2024, 1, 1)
+
+        inserted = repository.add_many([{"created": created}, {"created": created, "note": "n"}, {"id": 50, "created": created}])
+
+        self.assertEqual(inserted, 3)
+        self.assertEqual(sorted((item.id, item.note) for item in repository.get_all()), [(1, None), (2, "n"), (50, None)])
+
+    def test_add_many_with_explicit_and_generated_ids(self):
+        """Test a chunk mixing explicit and generated ids keeps the explicit ones and returns every id"""
+        items = [SQLiteTestModel(name="a", value=1), SQLiteTestModel(id=40, name="b", value=2), SQLiteTestModel(name="c", value=3)]
+
+        self.repository.add_many(items, chunk_size=3, return_ids=True)
+
+        self.assertEqual([item.id for item in items], [26, 40, 27])
+        self.assertEqual([self.repository.get_by_id(item_id).name for item_id in (26, 40, 27)], ["a", "b", "c"])
+
+    def test_update_many_partial(self):
+        """Test update_many only touches the given columns"""
+        updated = self.repository.update_many([{"id": 1, "value": 100}, {"id": 2, "value": 200}])
+
+        self.assertEqual(updated, 2)
+        self.session.expire_all()
+        first, second = self.repository.get_by_id(1), self.repository.get_by_id(2)
+        self.assertEqual((first.name, first.value), ("Item 1", 100))
+        self.assertEqual((second.name, second.value), ("Item 2", 200))
+
+    def test_delete_many_by_ids(self):
+        """Test delete_many_by_ids reports only the rows that existed"""
+        deleted = self.repository.delete_many_by_ids([1, 2, 3, 999], chunk_size=2)
+
+        self.assertEqual(deleted, 3)
+        self.assertEqual(self.repository.count(), 22)
+
+    # Tests for the columnar reads
+    def test_query_columns_formats(self):
+        """Test the same query assembled as tuples, a DataFrame and an Arrow Table"""
+        spec = QuerySpec(filters=[FieldFilter("value", FilterOperator.EQ, 0)], columns=("id", "name"), limit=3)
+
+        self.assertEqual(self.repository.query_columns(spec), [(4, "Item 4"), (8, "Item 8"), (12, "Item 12")])
+        frame = self.repository.query_columns(spec, RowFormat.DATAFRAME)
+        self.assertIsInstance(frame, pd.DataFrame)
+        self.assertEqual(list(frame.columns), ["id", "name"])
+        self.assertEqual(frame["id"].tolist(), [4, 8, 12])
+        table = self.repository.query_columns(spec, RowFormat.ARROW)
+        self.assertEqual(table.schema, pa.schema([("id", pa.int64()), ("name", pa.string())]))
+        self.assertEqual(table.column("name").to_pylist(), ["Item 4", "Item 8", "Item 12"])
+
+    def test_query_columns_empty_result(self):
+        """Test an empty result keeps its columns"""
+        spec = QuerySpec(filters=[FieldFilter("value", FilterOperator.GT, 10)])
+
+        self.assertEqual(list(self.repository.query_columns(spec, RowFormat.DATAFRAME).columns), ["id", "name", "value"])
+        self.assertEqual(self.repository.query_columns(spec, RowFormat.ARROW).num_rows, 0)
+
+    def test_columns_by_cursor_matches_items_by_cursor(self):
+        """Test the columnar pages hold the same rows and cursors as the entity pages"""
+        cursor = None
+        while True:
+            page = self.repository.get_page_by_cursor(cursor, 4, "value", descending=True)
+            columns_page = self.repository.get_columns_by_cursor(cursor, 4, "value", descending=True, row_format=RowFormat.DATAFRAME)
+            self.assertEqual(columns_page.items["id"].tolist(), [item.id for item in page.items])
+            self.assertEqual((columns_page.next_cursor, columns_page.previous_cursor), (page.next_cursor, page.previous_cursor))
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+
+    def test_iter_column_batches(self):
+        """Test the columnar stream is fetched in batches of at most batch_size rows"""
+        batches = list(self.repository.iter_column_batches(QuerySpec(columns=("id",)), batch_size=10, row_format=RowFormat.ARROW))
+
+        self.assertEqual([batch.num_rows for batch in batches], [10, 10, 5])
+        self.assertEqual(pa.concat_tables(batches).column("id").to_pylist(), list(range(1, 26)))
+
+    def test_aggregate_by_group(self):
+        """Test the aggregates are computed per group, in the order of the group field"""
+        aggregates = [Aggregate(AggregateFunction.COUNT), Aggregate(AggregateFunction.SUM, "id"), Aggregate(AggregateFunction.MAX, "name")]
+
+        rows = self.repository.aggregate(aggregates, group_by=("value",))
+
+        self.assertEqual([row[:3] for row in rows], [(0, 6, 84), (1, 7, 91), (2, 6, 72), (3, 6, 78)])
+        self.assertEqual(rows[0][3], "Item 8")
+
+    def test_aggregate_filtered_as_arrow(self):
+        """Test the filters of the listings apply and the result columns are typed"""
+        spec = QuerySpec(filters=(FieldFilter("value", FilterOperator.GE, 2),))
+        aggregates = [Aggregate(AggregateFunction.COUNT), Aggregate(AggregateFunction.AVG, "value"), Aggregate(AggregateFunction.MIN, "value")]
+
+        table = self.repository.aggregate(aggregates, spec=spec, row_format=RowFormat.ARROW)
+
+        self.assertEqual(table.column_names, ["count", "avg_value", "min_value"])
+        self.assertEqual(table.schema.field("avg_value").type, pa.float64())
+        self.assertEqual(table.to_pylist(), [{"count": 12, "avg_value": 2.5, "min_value": 2}])
+
+    def test_aggregate_refuses_sum_of_text(self):
+        """Test SUM and AVG need numeric fields"""
+        with self.assertRaises(InvalidQueryError):
+            self.repository.aggregate([Aggregate(AggregateFunction.SUM, "name")])
+
+
+class TestKeysetSortsOnSQLite(unittest.TestCase):
+
+    def setUp(self):
+        """Create rows with NULL notes and datetimes, some of them equal"""
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        SQLModel.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        start = datetime(2024, 1, 1, 12, 30)
+        self.session.add_all([SQLiteSortTestModel(id=i, note=None if i % 3 == 0 else f"note {i % 4}",
+                                                  created=start + timedelta(minutes=i // 2)) for i in range(1, 13)])
+        self.session.commit()
+        self.repository = SQLModelRepository(SQLiteSortTestModel, self.session)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def _walk(self, order_by, descending=False):
+        pages, cursor = [], None
+        while True:
+            page = self.repository.get_page_by_cursor(cursor, 3, order_by, descending)
+            pages.append(page)
+            if page.next_cursor is None:
+                return pages
+            cursor = page.next_cursor
+
+    def test_cursor_walk_by_nullable_column(self):
+        """Test walking by a column holding NULLs visits every row once, NULLs first, or last when descending"""
+        for descending in (False, True):
+            with self.subTest(descending=descending):
+                pages = self._walk("note", descending)
+
+                visited = [(item.note is not None, item.note or "", item.id) for page in pages for item in page.items]
+                self.assertEqual(visited, sorted(visited, reverse=descending))
+                self.assertEqual(len(visited), 12)
+                back = self.repository.get_page_by_cursor(pages[2].previous_cursor, 3, "note", descending)
+                self.assertEqual([item.id for item in back.items], [item.id for item in pages[1].items])
+
+    def test_cursor_walk_by_datetime(self):
+        """Test walking by a datetime column does not repeat the rows sharing a value across pages"""
+        pages = self._walk("created")
+
+        self.assertEqual([item.id for page in pages for item in page.items], list(range(1, 13)))
+        back = self.repository.get_page_by_cursor(pages[3].previous_cursor, 3, "created")
+        self.assertEqual([item.id for item in back.items], [7, 8, 9])
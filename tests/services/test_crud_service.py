@@ -0,0 +1,192 @@
+import unittest
+from unittest.mock import Mock
+
+from src.infrastructure.Columnar import RowFormat
+from src.infrastructure.Exceptions.RepositoryExceptions import QueryExecutionError, RepositoryError
+from src.infrastructure.Pagination import KeysetPage
+from src.model.example_model import ExampleModel
+from src.services.CRUDService import CRUDService
+from src.services.TTLQueryCache import TTLQueryCache
+
+
+class TestCRUDService(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test fixtures before each test method"""
+        self.mock_repository = Mock()
+        self.service = CRUDService(self.mock_repository)
+
+    def test_init_without_repository(self):
+        """Test the service refuses a missing repository"""
+        with self.assertRaises(ValueError):
+            CRUDService(None)
+
+    # Tests for get_items
+    def test_get_items_uses_paginated_read(self):
+        """Test get_items delegates pagination to the repository instead of slicing get_all"""
+        # Arrange
+        self.mock_repository.get_page.return_value = ["item"]
+
+        # Act
+        result = self.service.get_items(skip=20, limit=10)
+
+        # Assert
+        self.assertEqual(result, ["item"])
+        self.mock_repository.get_page.assert_called_once_with(20, 10)
+        self.mock_repository.get_all.assert_not_called()
+
+    def test_get_items_invalid_bounds(self):
+        """Test get_items rejects negative skip and non positive limit"""
+        with self.assertRaises(ValueError):
+            self.service.get_items(skip=-1)
+        with self.assertRaises(ValueError):
+            self.service.get_items(limit=0)
+
+    def test_get_items_repository_error(self):
+        """Test get_items wraps repository errors"""
+        # Arrange
+        self.mock_repository.get_page.side_effect = QueryExecutionError("boom")
+
+        # Act & Assert
+        with self.assertRaises(RepositoryError) as context:
+            self.service.get_items()
+
+        self.assertIn("Error retrieving items", str(context.exception))
+
+    # Tests for get_items_by_cursor
+    def test_get_items_by_cursor(self):
+        """Test get_items_by_cursor delegates to the keyset read of the repository"""
+        # Arrange
+        expected_page = KeysetPage(items=["item"], next_cursor="next")
+        self.mock_repository.get_page_by_cursor.return_value = expected_page
+
+        # Act
+        result = self.service.get_items_by_cursor("cursor", limit=5, order_by="value")
+
+        # Assert
+        self.assertIs(result, expected_page)
+        self.mock_repository.get_page_by_cursor.assert_called_once_with("cursor", 5, "value", False, None)
+
+    # Tests for the columnar reads
+    def test_get_columns_by_cursor_defaults_to_dataframe(self):
+        """Test get_columns_by_cursor delegates to the columnar keyset read of the repository"""
+        # Arrange
+        expected_page = KeysetPage(items="frame")
+        self.mock_repository.get_columns_by_cursor.return_value = expected_page
+
+        # Act
+        result = self.service.get_columns_by_cursor(limit=5)
+
+        # Assert
+        self.assertIs(result, expected_page)
+        self.mock_repository.get_columns_by_cursor.assert_called_once_with(None, 5, None, False, None, RowFormat.DATAFRAME)
+        self.mock_repository.get_page_by_cursor.assert_not_called()
+
+    def test_iter_columns_wraps_repository_errors(self):
+        """Test iter_columns wraps the errors raised while streaming"""
+        # Arrange
+        self.mock_repository.iter_column_batches.side_effect = QueryExecutionError("boom")
+
+        # Act & Assert
+        with self.assertRaises(RepositoryError) as context:
+            list(self.service.iter_columns())
+
+        self.assertIn("Error streaming columns", str(context.exception))
+
+    # Tests for update_item and delete_item
+    def test_update_item_single_statement(self):
+        """Test update_item does not load the item before updating it"""
+        # Arrange
+        self.mock_repository.update_by_id.return_value = "updated"
+
+        # Act
+        result = self.service.update_item(1, {"name": "New"})
+
+        # Assert
+        self.assertEqual(result, "updated")
+        self.mock_repository.update_by_id.assert_called_once_with(1, {"name": "New"}, returning=True)
+        self.mock_repository.get_by_id.assert_not_called()
+
+    def test_delete_item_single_statement(self):
+        """Test delete_item does not load the item before deleting it"""
+        # Arrange
+        self.mock_repository.delete_by_id.return_value = None
+
+        # Act & Assert
+        self.assertIsNone(self.service.delete_item(1))
+        self.mock_repository.delete_by_id.assert_called_once_with(1, returning=True)
+        self.mock_repository.get_by_id.assert_not_called()
+
+    # Tests for count_items
+    def test_count_items(self):
+        """Test count_items delegates to the repository count"""
+        # Arrange
+        self.mock_repository.count.return_value = 1_000_000
+
+        # Act & Assert
+        self.assertEqual(self.service.count_items(), 1_000_000)
+
+    def test_summarize_items(self):
+        """Test the summary is computed by a single aggregate query and reshaped per numeric field"""
+        # Arrange
+        self.mock_repository.model = ExampleModel
+        self.mock_repository.aggregate.return_value = [(4, 3, 30, 10.0, 5, 15)]
+
+        # Act
+        summary = self.service.summarize_items()
+
+        # Assert
+        self.assertEqual(summary.count, 4)
+        self.assertEqual(summary.fields, [{"field": "value", "count": 3, "sum": 30, "avg": 10.0, "min": 5, "max": 15}])
+        self.mock_repository.aggregate.assert_called_once()
+
+    # Tests for the query cache
+    def test_reads_are_cached(self):
+        """Test repeated reads are served from the cache"""
+        # Arrange
+        service = CRUDService(self.mock_repository, TTLQueryCache(), cache_namespace="Model")
+        self.mock_repository.get_page.return_value = ["item"]
+        self.mock_repository.count.return_value = 1
+
+        # Act
+        for _ in range(3):
+            service.get_items()
+            service.count_items()
+
+        # Assert
+        self.mock_repository.get_page.assert_called_once()
+        self.mock_repository.count.assert_called_once()
+        self.assertEqual(service.cache.stats().hits, 4)
+
+    def test_versioned_reads_are_cached_until_the_version_changes(self):
+        """Test a versioned service reuses its cached reads while the data version stays the same"""
+        # Arrange
+        service = CRUDService(self.mock_repository, TTLQueryCache(), cache_namespace="Model", versioned=True)
+        self.mock_repository.count.return_value = 1
+        self.mock_repository.data_version.side_effect = [7, 7, 8, 8]
+
+        # Act
+        for _ in range(4):
+            service.count_items()
+
+        # Assert
+        self.assertEqual(self.mock_repository.count.call_count, 2)
+        self.assertEqual(self.mock_repository.data_version.call_count, 4)
+
+    def test_writes_invalidate_the_cache(self):
+        """Test a write through the service invalidates the cached reads, even when it fails"""
+        # Arrange
+        service = CRUDService(self.mock_repository, TTLQueryCache(), cache_namespace="Model")
+        self.mock_repository.get_page.return_value = ["item"]
+        self.mock_repository.delete_many_by_ids.side_effect = QueryExecutionError("boom")
+
+        # Act
+        service.get_items()
+        service.update_item(1, {"name": "New"})
+        service.get_items()
+        with self.assertRaises(RepositoryError):
+            service.delete_items([1, 2])
+        service.get_items()
+
+        # Assert
+        self.assertEqual(self.mock_repository.get_page.call_count, 3)
@@ -0,0 +1,111 @@
+import enum
+import io
+import unittest
+import urllib.error
+import urllib.request
+from typing import Optional
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.ipc as pa_ipc
+import pyarrow.parquet as pq
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Field, Session, create_engine
+
+from src.infrastructure.ArrowIO import FileFormat
+from src.infrastructure.DownloadServer import DownloadServer
+from src.infrastructure.QuerySpec import FieldFilter, FilterOperator, QuerySpec, SortOrder
+from src.infrastructure.SessionManager import SessionManager
+from src.infrastructure.SQLModelRepository import SQLModelRepository
+from src.services.CRUDService import CRUDService
+from src.services.ExportService import ExportService
+
+
+class ExportColor(str, enum.Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class ExportTestModel(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    code: str
+    quantity: int
+    color: ExportColor = ExportColor.RED
+    note: Optional[str] = None
+
+
+class TestExportService(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        SQLModel.metadata.create_all(self.engine)
+        with Session(self.engine) as session:
+            session.add_all(ExportTestModel(code=f"c{index}", quantity=index, color=ExportColor.BLUE if index % 2 else ExportColor.RED,
+                                            note=None if index % 3 else f"note {index}") for index in range(5))
+            session.commit()
+        repository = SQLModelRepository(ExportTestModel, session_manager=SessionManager(self.engine))
+        self.download_server = DownloadServer(ttl=60)
+        self.service = ExportService(CRUDService[ExportTestModel](repository), ExportTestModel, self.download_server, batch_size=2)
+
+    def tearDown(self):
+        self.download_server.shutdown()
+        self.engine.dispose()
+
+    def test_export_round_trips(self):
+        """Test every format holds the rows with the model types, enums as their values"""
+        readers = {
+            # Nulls are written as empty CSV fields
+            FileFormat.CSV: lambda data: pa_csv.read_csv(io.BytesIO(data), convert_options=pa_csv.ConvertOptions(strings_can_be_null=True)),
+            FileFormat.PARQUET: lambda data: pq.read_table(io.BytesIO(data)),
+            FileFormat.ARROW: lambda data: pa_ipc.open_file(pa.BufferReader(data)).read_all(),
+        }
+        for file_format, read in readers.items():
+            with self.subTest(file_format=file_format):
+                sink = io.BytesIO()
+                self.assertEqual(self.service.export(sink, file_format), 5)
+                table = read(sink.getvalue())
+                self.assertEqual(table.column_names, ["id", "code", "quantity", "color", "note"])
+                self.assertEqual(table.column("quantity").to_pylist(), [0, 1, 2, 3, 4])
+                self.assertEqual(table.column("color").to_pylist(), ["red", "blue", "red", "blue", "red"])
+                self.assertEqual(table.column("note").to_pylist(), ["note 0", None, None, "note 3", None])
+
+    def test_export_applies_the_query(self):
+        """Test only the filtered rows are exported, in the requested order"""
+        sink = io.BytesIO()
+        spec = QuerySpec(filters=(FieldFilter("quantity", FilterOperator.GE, 2),), order_by=(SortOrder("quantity", True),))
+
+        self.assertEqual(self.service.export(sink, FileFormat.PARQUET, spec), 3)
+        self.assertEqual(pq.read_table(io.BytesIO(sink.getvalue())).column("code").to_pylist(), ["c4", "c3", "c2"])
+
+    def test_stream_yields_a_chunk_per_batch(self):
+        """Test the stream is produced batch by batch and forms a complete file"""
+        chunks = list(self.service.stream(FileFormat.ARROW))
+
+        # Three batches of at most two rows, then the footer
+        self.assertEqual(len(chunks), 4)
+        table = pa_ipc.open_file(pa.BufferReader(b"".join(chunks))).read_all()
+        self.assertEqual(table.num_rows, 5)
+
+    def test_create_download_is_served_once(self):
+        """Test the download link streams the export and cannot be reused"""
+        url = self.service.create_download(FileFormat.CSV, QuerySpec(filters=(FieldFilter("code", FilterOperator.EQ, "c1"),)))
+
+        with urllib.request.urlopen(url, timeout=5) as response:
+            self.assertEqual(response.headers["Content-Type"], "text/csv")
+            self.assertIn("ExportTestModel.csv", response.headers["Content-Disposition"])
+            table = pa_csv.read_csv(io.BytesIO(response.read()))
+        self.assertEqual(table.column("code").to_pylist(), ["c1"])
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            urllib.request.urlopen(url, timeout=5)
+        self.assertEqual(context.exception.code, 404)
+
+    def test_create_download_needs_a_server(self):
+        """Test downloads cannot be created without a download server"""
+        service = ExportService(self.service._crud_service, ExportTestModel)
+
+        self.assertFalse(service.streamable)
+        with self.assertRaises(ValueError):
+            service.create_download(FileFormat.CSV)
+
+
+if __name__ == '__main__':
+    unittest.main()
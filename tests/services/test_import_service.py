@@ -0,0 +1,135 @@
+import csv
+import os
+import tempfile
+import unittest
+from typing import Optional
+from unittest.mock import patch
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Field, Session, create_engine, select
+
+from src.infrastructure.Exceptions.RepositoryExceptions import DatabaseConnectionError, RepositoryError
+from src.infrastructure.SessionManager import SessionManager
+from src.infrastructure.SQLModelRepository import SQLModelRepository
+from src.services.CRUDService import CRUDService
+from src.services.ImportService import ImportService
+
+
+# Test model with a unique column, to have rows refused by the database
+class ImportTestModel(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    code: str = Field(unique=True)
+    quantity: int = Field(ge=0)
+    note: Optional[str] = None
+
+
+class TestImportService(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        SQLModel.metadata.create_all(self.engine)
+        repository = SQLModelRepository(ImportTestModel, session_manager=SessionManager(self.engine))
+        self.crud_service = CRUDService[ImportTestModel](repository)
+        self.service = ImportService(self.crud_service, ImportTestModel, batch_size=2)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def _write_csv(self, rows, header=("code", "quantity", "note")):
+        path = self._path("input.csv")
+        with open(path, "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(header)
+            writer.writerows(rows)
+        return path
+
+    def _stored(self):
+        with Session(self.engine) as session:
+            return [(item.code, item.quantity, item.note) for item in session.exec(select(ImportTestModel).order_by(ImportTestModel.id))]
+
+    def test_csv_import_with_rejects(self):
+        """Test valid rows are converted and inserted, invalid ones written to the reject file"""
+        path = self._write_csv([("a", "1", "first"), ("b", "-1", ""), ("c", "x", ""), ("d", "4", "")])
+        progress = []
+
+        report = self.service.import_file(path, reject_path=self._path("rejects.csv"), progress=progress.append)
+
+        self.assertEqual((report.rows_read, report.rows_imported, report.rows_rejected), (4, 2, 2))
+        self.assertEqual(self._stored(), [("a", 1, "first"), ("d", 4, None)])
+        with open(report.reject_path, newline="") as reject_file:
+            rejects = list(csv.DictReader(reject_file))
+        self.assertEqual([(row["_row"], row["code"]) for row in rejects], [("2", "b"), ("3", "c")])
+        self.assertIn("quantity", rejects[0]["_error"])
+        self.assertEqual([p.rows_read for p in progress], [2, 4])
+        self.assertIsNone(progress[-1].fraction)
+
+    def test_rows_refused_by_database_are_rejected(self):
+        """Test a constraint violation rejects the offending row only"""
+        path = self._write_csv([("a", "1", ""), ("a", "2", ""), ("b", "3", "")])
+
+        report = self.service.import_file(path, reject_path=self._path("rejects.csv"))
+
+        self.assertEqual((report.rows_imported, report.rows_rejected), (2, 1))
+        self.assertEqual([code for code, _, _ in self._stored()], ["a", "b"])
+        with open(report.reject_path, newline="") as reject_file:
+            self.assertTrue(next(csv.DictReader(reject_file))["_error"].startswith("database:"))
+
+    def test_unreachable_database_is_raised(self):
+        """Test a connection error stops the import instead of rejecting the rows one by one"""
+        path = self._write_csv([("a", "1", ""), ("b", "2", "")])
+        error = RepositoryError("Error creating items: database is locked")
+        error.__cause__ = DatabaseConnectionError("database is locked")
+
+        with patch.object(self.crud_service, "create_items", side_effect=error) as create_items:
+            with self.assertRaises(RepositoryError):
+                self.service.import_file(path, reject_path=self._path("rejects.csv"))
+
+        self.assertEqual(create_items.call_count, 1)
+        self.assertFalse(os.path.exists(self._path("rejects.csv")))
+
+    def test_batch_mixing_empty_and_explicit_ids(self):
+        """Test a batch with generated and explicit ids and missing optional values keeps every given value"""
+        path = self._write_csv([("", "a", "1", ""), ("100", "b", "2", "x"), ("", "c", "3", "")], header=("id", "code", "quantity", "note"))
+
+        report = self.service.import_file(path)
+
+        self.assertEqual(report.rows_imported, 3)
+        with Session(self.engine) as session:
+            stored = [(item.id, item.code, item.note) for item in session.exec(select(ImportTestModel).order_by(ImportTestModel.code))]
+        self.assertEqual(stored, [(1, "a", None), (100, "b", "x"), (101, "c", None)])
+
+    def test_parquet_import_from_file_object(self):
+        """Test Parquet files are read from a binary file, with a known number of rows"""
+        path = self._path("input.parquet")
+        pq.write_table(pa.table({"code": ["a", "b", "c"], "quantity": [1, 2, 3], "ignored": [0, 0, 0]}), path)
+        progress = []
+
+        with open(path, "rb") as parquet_file:
+            report = self.service.import_file(parquet_file, progress=progress.append)
+
+        self.assertEqual(report.rows_imported, 3)
+        self.assertIsNone(report.reject_path)
+        self.assertEqual(progress[-1].fraction, 1.0)
+        self.assertEqual(self._stored(), [("a", 1, None), ("b", 2, None), ("c", 3, None)])
+
+    def test_missing_required_column(self):
+        """Test a file without a required column is refused before importing anything"""
+        path = self._write_csv([("a", "")], header=("code", "note"))
+        with self.assertRaises(ValueError):
+            self.service.import_file(path)
+        self.assertEqual(self._stored(), [])
+
+    def test_unknown_format(self):
+        """Test the format is taken from the extension"""
+        with self.assertRaises(ValueError):
+            self.service.import_file(self._path("input.json"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from unittest.mock import Mock
+
+from src.infrastructure.Exceptions.RepositoryExceptions import RepositoryError
+from src.infrastructure.Metrics import MetricsRegistry
+from src.services.InstrumentedCRUDService import InstrumentedCRUDService
+
+
+class TestInstrumentedCRUDService(unittest.TestCase):
+
+    def setUp(self):
+        self.service = Mock()
+        self.registry = MetricsRegistry()
+        self.instrumented = InstrumentedCRUDService(self.service, self.registry, model_name="Item")
+
+    def _summary(self, name, operation):
+        return self.registry.histograms()[name][(("model", "Item"), ("operation", operation))]
+
+    def test_call_is_timed_and_rows_counted(self):
+        """Test the result is passed through and latency and rows are recorded"""
+        self.service.get_items.return_value = [1, 2, 3]
+
+        self.assertEqual(self.instrumented.get_items(0, 3), [1, 2, 3])
+        self.service.get_items.assert_called_once_with(0, 3)
+        self.assertEqual(self._summary("service_call_seconds", "get_items")["count"], 1)
+        self.assertEqual(self._summary("service_rows_returned", "get_items")["sum"], 3)
+
+    def test_errors_are_counted(self):
+        """Test a failing call is counted and re-raised"""
+        self.service.count_items.side_effect = RepositoryError("boom")
+
+        with self.assertRaises(RepositoryError):
+            self.instrumented.count_items()
+        self.assertEqual(self.registry.counters()["service_errors_total"], {(("model", "Item"), ("operation", "count_items")): 1})
+
+    def test_generators_are_timed_until_exhausted(self):
+        """Test streamed batches are counted once the iterator is exhausted"""
+        self.service.iter_items.return_value = (batch for batch in ([1, 2], [3]))
+
+        batches = self.instrumented.iter_items()
+        self.assertNotIn("service_call_seconds", self.registry.histograms())
+        self.assertEqual(list(batches), [[1, 2], [3]])
+        self.assertEqual(self._summary("service_rows_returned", "iter_items")["sum"], 3)
+
+    def test_attributes_are_passed_through(self):
+        """Test non callable attributes come from the wrapped service"""
+        self.service.repository = "repository"
+        self.assertEqual(self.instrumented.repository, "repository")
+
+
+if __name__ == "__main__":
+    unittest.main()
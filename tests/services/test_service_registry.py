@@ -0,0 +1,39 @@
+import unittest
+from unittest.mock import Mock
+
+from src.infrastructure.ModelRegistry import ModelRegistry
+from src.model.example_model import ExampleModel
+from src.services.ServiceRegistry import LazyMapping, ServiceRegistry
+
+
+class TestServiceRegistry(unittest.TestCase):
+
+    def test_lazy_mapping_builds_values_once(self):
+        """Test values are built on first access only, and unknown keys are refused"""
+        factory = Mock(side_effect=lambda key: key.upper())
+        mapping = LazyMapping(["a", "b"], factory)
+
+        self.assertEqual(list(mapping), ["a", "b"])
+        self.assertEqual(mapping.built(), 0)
+        self.assertEqual(mapping["a"], "A")
+        self.assertEqual(mapping["a"], "A")
+        factory.assert_called_once_with("a")
+        with self.assertRaises(KeyError):
+            mapping["c"]
+
+    def test_services_are_built_on_demand(self):
+        """Test the registry creates the CRUD service of a model only when a service of the model is used"""
+        crud_service_factory = Mock()
+        registry = ServiceRegistry(ModelRegistry(["src.model"]), crud_service_factory)
+
+        crud_service_factory.assert_not_called()
+        import_service = registry.import_services["ExampleModel"]
+
+        self.assertIs(import_service.model, ExampleModel)
+        crud_service_factory.assert_called_once_with(ExampleModel)
+        self.assertIs(registry.export_services["ExampleModel"].model, ExampleModel)
+        self.assertEqual(crud_service_factory.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
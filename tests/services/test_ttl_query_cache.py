@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import Mock
+
+from src.services.TTLQueryCache import TTLQueryCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLQueryCache(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a small cache with a controllable clock"""
+        self.timer = FakeTimer()
+        self.cache = TTLQueryCache(maxsize=2, ttl=10, timer=self.timer)
+
+    def test_read_through(self):
+        """Test the loader only runs on a miss"""
+        loader = Mock(return_value="rows")
+
+        self.assertEqual(self.cache.get_or_load("Model", "key", loader), "rows")
+        self.assertEqual(self.cache.get_or_load("Model", "key", loader), "rows")
+
+        loader.assert_called_once()
+        stats = self.cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.size), (1, 1, 1))
+        self.assertEqual(stats.hit_ratio, 0.5)
+
+    def test_ttl_expiration(self):
+        """Test entries are reloaded once expired"""
+        loader = Mock(side_effect=["old", "new"])
+        self.cache.get_or_load("Model", "key", loader)
+
+        self.timer.now = 11
+
+        self.assertEqual(self.cache.get_or_load("Model", "key", loader), "new")
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted when the cache is full"""
+        self.cache.get_or_load("Model", "a", lambda: 1)
+        self.cache.get_or_load("Model", "b", lambda: 2)
+        self.cache.get_or_load("Model", "a", lambda: 1)
+        self.cache.get_or_load("Model", "c", lambda: 3)
+
+        loader = Mock(return_value=2)
+        self.cache.get_or_load("Model", "b", loader)
+        loader.assert_called_once()
+        self.assertEqual(self.cache.stats().size, 2)
+
+    def test_invalidate_namespace(self):
+        """Test invalidation only affects the given namespace"""
+        self.cache.get_or_load("Model", "key", lambda: "model rows")
+        self.cache.get_or_load("Other", "key", lambda: "other rows")
+
+        self.cache.invalidate("Model")
+
+        self.assertEqual(self.cache.get_or_load("Model", "key", lambda: "fresh rows"), "fresh rows")
+        self.assertEqual(self.cache.get_or_load("Other", "key", lambda: "fresh rows"), "other rows")
+        self.assertEqual(self.cache.stats().invalidations, 1)
+
+    def test_value_loaded_during_invalidation_is_not_cached(self):
+        """Test a value read while a write invalidated the namespace is not stored"""
+        def loader():
+            self.cache.invalidate("Model")
+            return "stale"
+
+        self.cache.get_or_load("Model", "key", loader)
+
+        self.assertEqual(self.cache.get_or_load("Model", "key", lambda: "fresh"), "fresh")
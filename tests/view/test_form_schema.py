@@ -0,0 +1,95 @@
+import datetime
+import enum
+import unittest
+from typing import Annotated, Optional
+from unittest.mock import Mock
+from sqlmodel import SQLModel, Field
+
+from src.view.GenericCRUDPage.FormSchema import FormSchema, find_renderer, form_schema, normalize_annotation
+
+
+class FormColor(enum.Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class FormPriority(enum.IntEnum):
+    LOW = 1
+    HIGH = 2
+
+
+class FormTestModel(SQLModel):
+    quantity: int
+    unit_price: Annotated[Optional[float], "metadata"] = None
+    color: FormColor = FormColor.RED
+    due_date: datetime.date | None = Field(default_factory=datetime.date.today)
+    tags: list[str] = Field(default_factory=list)
+
+
+class TestFormSchema(unittest.TestCase):
+
+    def setUp(self):
+        self.renderers = {annotation: Mock(name=str(annotation)) for annotation in (int, str, float, enum.Enum, datetime.date)}
+        self.dispatcher = self._dispatcher(self.renderers)
+
+    def _dispatcher(self, renderers):
+        # Stands for StreamLitFieldDispatcher, whose widgets need a Streamlit script run
+        dispatcher = Mock(spec=["resolve", "renderers"], renderers=renderers)
+        dispatcher.resolve.side_effect = self._resolve
+        return dispatcher
+
+    def _resolve(self, annotation):
+        renderer = find_renderer(self.renderers, annotation)
+        if renderer is None:
+            raise ValueError(f"No field renderer found for type: {annotation}")
+        return renderer
+
+    def test_normalize_annotation(self):
+        """Test Optional and Annotated are unwrapped, real unions are kept"""
+        self.assertEqual(normalize_annotation(int), (int, False))
+        self.assertEqual(normalize_annotation(Optional[int]), (int, True))
+        self.assertEqual(normalize_annotation(Annotated[Optional[float], "metadata"]), (float, True))
+        self.assertEqual(normalize_annotation(datetime.date | None), (datetime.date, True))
+        self.assertEqual(normalize_annotation(int | str | None), (int | str, True))
+
+    def test_find_renderer_of_normalized_types(self):
+        """Test Optional fields use the renderer of their type and enums the renderer of enum.Enum"""
+        self.assertIs(find_renderer(self.renderers, Optional[float]), self.renderers[float])
+        self.assertIs(find_renderer(self.renderers, FormColor), self.renderers[enum.Enum])
+        self.assertIs(find_renderer(self.renderers, Optional[FormPriority]), self.renderers[enum.Enum])
+        self.assertIs(find_renderer(self.renderers, enum.StrEnum("FormSize", ["SMALL", "LARGE"])), self.renderers[enum.Enum])
+        self.assertIsNone(find_renderer(self.renderers, list[str]))
+
+    def test_compile(self):
+        """Test the schema holds labels, normalized types, renderers and defaults"""
+        schema = FormSchema.compile(FormTestModel, self.dispatcher)
+        fields = {field.name: field for field in schema.fields}
+
+        self.assertEqual([field.name for field in schema.fields], ["quantity", "unit_price", "color", "due_date", "tags"])
+        self.assertEqual(fields["unit_price"].label, "Unit Price")
+        self.assertEqual((fields["unit_price"].field_type, fields["unit_price"].optional), (float, True))
+        self.assertIs(fields["color"].renderer, self.renderers[enum.Enum])
+        self.assertEqual(fields["color"].default(), FormColor.RED)
+        self.assertEqual(fields["due_date"].default(), datetime.date.today())
+        self.assertIsNone(fields["tags"].renderer)
+        self.assertIn("No field renderer", fields["tags"].error)
+        self.assertEqual(fields["quantity"].widget_key("create"), "create_quantity")
+
+    def test_empty_text_of_optional_field_is_none(self):
+        """Test an empty widget value is submitted as None only for optional fields"""
+        fields = {field.name: field for field in FormSchema.compile(FormTestModel, self.dispatcher).fields}
+
+        self.assertIsNone(fields["unit_price"].to_value(""))
+        self.assertEqual(fields["quantity"].to_value(""), "")
+
+    def test_form_schema_is_cached(self):
+        """Test the schema is compiled once per model and renderer set, whatever the dispatcher instance"""
+        schema = form_schema(FormTestModel, self.dispatcher)
+
+        self.assertIs(form_schema(FormTestModel, self._dispatcher(dict(self.renderers))), schema)
+        other_renderers = {**self.renderers, list: Mock()}
+        self.assertIsNot(form_schema(FormTestModel, self._dispatcher(other_renderers)), schema)
+
+
+if __name__ == '__main__':
+    unittest.main()
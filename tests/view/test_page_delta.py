@@ -0,0 +1,71 @@
+import unittest
+import pandas as pd
+
+from src.infrastructure.DataVersion import ChangeSet
+from src.infrastructure.Pagination import KeysetPage
+from src.view.GenericCRUDPage.PageDelta import merge_changes
+
+
+def frame(*rows):
+    return pd.DataFrame(rows, columns=["id", "name", "value"])
+
+
+class TestMergeChanges(unittest.TestCase):
+
+    def setUp(self):
+        """A middle page sorted by value: rows 3 to 5 of the table"""
+        self.page = KeysetPage(items=frame((3, "c", 30), (4, "d", 40), (5, "e", 50)), next_cursor="next", previous_cursor="previous")
+
+    def test_changes_of_rows_shown_are_applied(self):
+        """Test updated rows are replaced in place, and deleted rows removed from the last page"""
+        last_page = KeysetPage(items=self.page.items, previous_cursor="previous")
+        changes = ChangeSet(frame((4, "d2", 40)), deleted_ids=[5, 99], token=7)
+
+        merged = merge_changes(last_page, changes, "value", False)
+
+        self.assertEqual(merged.items.values.tolist(), [[3, "c", 30], [4, "d2", 40]])
+        self.assertEqual(merged.previous_cursor, "previous")
+        self.assertEqual(merge_changes(self.page, ChangeSet(frame((4, "d2", 40)), token=7), "value", False).next_cursor, "next")
+
+    def test_deletion_before_a_next_page_reloads_the_page(self):
+        """Test a deleted row of a page followed by another one reloads it, its first row moves up"""
+        self.assertIsNone(merge_changes(self.page, ChangeSet(frame(), deleted_ids=[4], token=7), "value", False))
+        self.assertEqual(len(merge_changes(self.page, ChangeSet(frame(), deleted_ids=[99], token=7), "value", False).items), 3)
+
+    def test_rows_outside_the_page_are_ignored(self):
+        """Test rows sorting before the first or after the last row shown do not reload the page"""
+        changes = ChangeSet(frame((1, "a", 10), (9, "z", 90)), token=7)
+
+        self.assertIs(merge_changes(self.page, changes, "value", False).items.equals(self.page.items), True)
+
+    def test_changes_that_move_rows_reload_the_page(self):
+        """Test a sort value change, a row entering the page or a cut change set need a new read"""
+        self.assertIsNone(merge_changes(self.page, ChangeSet(frame((4, "d", 99)), token=7), "value", False))
+        self.assertIsNone(merge_changes(self.page, ChangeSet(frame((8, "h", 45)), token=7), "value", False))
+        self.assertIsNone(merge_changes(self.page, ChangeSet(frame((4, "d2", 40)), token=7, has_more=True), "value", False))
+
+    def test_filtered_page(self):
+        """Test a change of a filtered field or of another row reloads a filtered page"""
+        self.assertIsNone(merge_changes(self.page, ChangeSet(frame((4, "x", 40)), token=7), "value", False, ["name"]))
+        self.assertIsNone(merge_changes(self.page, ChangeSet(frame((9, "z", 90)), token=7), "value", False, ["name"]))
+
+    def test_last_page_takes_the_rows_after_it(self):
+        """Test without a next page, a row sorting after the last one shown enters the page"""
+        last_page = KeysetPage(items=self.page.items, previous_cursor="previous")
+
+        self.assertIsNone(merge_changes(last_page, ChangeSet(frame((9, "z", 90)), token=7), "value", False))
+
+    def test_null_sort_values(self):
+        """Test NULLs sort first ascending and last descending: they enter the first page, or the last descending"""
+        first_page = KeysetPage(items=self.page.items, next_cursor="next")
+        last_page = KeysetPage(items=self.page.items, previous_cursor="previous")
+        null_row = ChangeSet(frame((8, "h", float("nan"))), token=7)
+
+        self.assertIsNone(merge_changes(first_page, null_row, "value", False))
+        self.assertIsNotNone(merge_changes(self.page, null_row, "value", False))
+        self.assertIsNotNone(merge_changes(self.page, null_row, "value", True))
+        self.assertIsNone(merge_changes(last_page, null_row, "value", True))
+
+
+if __name__ == '__main__':
+    unittest.main()